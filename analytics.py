@@ -0,0 +1,158 @@
+import pandas as pd
+
+from trafficCube import DAY_ORDER, MONTH_NAMES, city_total, city_view, corridor_daily_average, corridor_view
+
+# Foot traffic metrics behind the Restaurant Insights views.
+# Everything here works on the aggregate cube (see trafficCube.py) and has no Streamlit
+# dependency, so the same numbers can be produced by the app, batch jobs and reports.
+
+
+# "1 PM"-style label used on the hourly chart, e.g. 13 -> "01:00 PM"
+def format_hour(hour):
+    return pd.Timestamp(2000, 1, 1, int(hour)).strftime('%I:%M %p')
+
+
+# City-wide averages behind the headline metric cards. A typical day is the sum of every
+# corridor's average day (each corridor's total over the days it reported), so the figures
+# hold for any span of data, not just a single year.
+def overall_averages(cube):
+    per_day = float(corridor_daily_average(cube).sum())
+    return {
+        'total': city_total(cube),
+        'per_day': int(round(per_day)),
+        'per_week': int(round(per_day * 7)),
+        'per_month': int(round(per_day * 365 / 12)),
+    }
+
+
+# Peak and quiet hours of a 24-value hourly profile (index = hour of day)
+def hourly_metrics(profile):
+    profile = pd.Series(profile).reindex(range(24), fill_value=0)
+    return {
+        'by_hour': profile,
+        'peak_hour': int(profile.idxmax()),
+        'quietest_hour': int(profile.idxmin()),
+        'average': int(profile.mean()),
+    }
+
+
+# Average traffic per day of the week; `corridor=None` averages over the whole city
+def weekly_metrics(cube, corridor=None):
+    table = city_view(cube, 'Day of Week') if corridor is None else corridor_view(cube, 'Day of Week', corridor)
+    if table.empty:
+        return None
+    by_day = table['mean'].reindex(DAY_ORDER)
+    return {
+        'by_day': by_day,
+        'busiest_day': by_day.idxmax(),
+        'busiest_traffic': int(by_day.max()),
+        'least_busy_day': by_day.idxmin(),
+        'least_busy_traffic': int(by_day.min()),
+        'average': int(by_day.mean()),
+    }
+
+
+# Average traffic in weeks 1-4 of a typical month at one corridor
+def week_of_month_metrics(cube, corridor):
+    table = corridor_view(cube, 'Week of Month', corridor)
+    if table.empty:
+        return None
+    by_week = table['mean'].reindex(range(1, 5), fill_value=0)  # Ensure weeks 1 to 4 are included
+    return {
+        'by_week': by_week,
+        'busiest_week': int(by_week.idxmax()),
+        'busiest_traffic': int(by_week.max()),
+        'quietest_week': int(by_week.idxmin()),
+        'quietest_traffic': int(by_week.min()),
+        'average': int(by_week.mean()),
+    }
+
+
+# Total traffic per calendar month at one corridor
+def monthly_metrics(cube, corridor):
+    table = corridor_view(cube, 'Month', corridor)
+    if table.empty:
+        return None
+    by_month = table['sum'].copy()
+    by_month.index = by_month.index.map(MONTH_NAMES)
+    return {
+        'by_month': by_month,
+        'busiest_month': by_month.idxmax(),
+        'busiest_traffic': int(by_month.max()),
+        'quietest_month': by_month.idxmin(),
+        'quietest_traffic': int(by_month.min()),
+        'average': int(round(by_month.mean())),
+        'total': int(by_month.sum()),
+    }
+
+
+# Every metric for one corridor as flat, JSON-friendly values
+def corridor_summary(cube, corridor, hourly_profile=None):
+    years = corridor_view(cube, 'Year', corridor)
+    if years.empty:
+        return None
+    weekly = weekly_metrics(cube, corridor)
+    weeks = week_of_month_metrics(cube, corridor)
+    months = monthly_metrics(cube, corridor)
+    days = int(years['count'].sum())
+    total = int(years['sum'].sum())
+    summary = {
+        'corridor': str(corridor),
+        'days': days,
+        'total_traffic': total,
+        'average_daily_traffic': round(total / days, 1),
+        'min_daily_traffic': int(years['min'].min()),
+        'max_daily_traffic': int(years['max'].max()),
+        'busiest_day': weekly['busiest_day'],
+        'busiest_day_average': weekly['busiest_traffic'],
+        'least_busy_day': weekly['least_busy_day'],
+        'least_busy_day_average': weekly['least_busy_traffic'],
+        'busiest_week_of_month': weeks['busiest_week'],
+        'busiest_week_average': weeks['busiest_traffic'],
+        'quietest_week_of_month': weeks['quietest_week'],
+        'quietest_week_average': weeks['quietest_traffic'],
+        'busiest_month': months['busiest_month'],
+        'busiest_month_total': months['busiest_traffic'],
+        'quietest_month': months['quietest_month'],
+        'quietest_month_total': months['quietest_traffic'],
+        'average_monthly_total': months['average'],
+        'peak_hour': None,
+        'quietest_hour': None,
+        'average_hourly_traffic': None,
+    }
+    if hourly_profile is not None:
+        hours = hourly_metrics(hourly_profile)
+        summary['peak_hour'] = hours['peak_hour']
+        summary['quietest_hour'] = hours['quietest_hour']
+        summary['average_hourly_traffic'] = hours['average']
+    return summary
+
+
+# Weekly, monthly and yearly traffic of several corridors side by side (one column per
+# corridor, ready to overlay) plus a one-row-per-corridor summary. Everything comes from
+# row-range slices of the prebuilt corridor index (see trafficCube.CorridorIndex).
+def comparison_metrics(corridor_index, corridors):
+    by_day = corridor_index.compare('Day of Week', corridors, 'mean')
+    if by_day.empty:
+        return None
+    by_day = by_day.reindex(DAY_ORDER)
+    by_week = corridor_index.compare('Week of Month', corridors, 'mean').reindex(range(1, 5), fill_value=0)
+    by_month = corridor_index.compare('Month', corridors, 'sum')
+    by_month.index = by_month.index.map(MONTH_NAMES)
+    totals = corridor_index.compare('Year', corridors, 'sum').sum()
+    days = corridor_index.compare('Year', corridors, 'count').sum()
+    summary = pd.DataFrame({
+        'Business Corridor': by_day.columns,
+        'Avg Daily Foot Traffic': (totals / days).round().astype(int).values,
+        'Total Foot Traffic': totals.astype(int).values,
+        'Busiest Day': by_day.idxmax().values,
+        'Quietest Day': by_day.idxmin().values,
+        'Busiest Week of Month': by_week.idxmax().values,
+        'Busiest Month': by_month.idxmax().values,
+    })
+    return {
+        'by_day': by_day,
+        'by_week': by_week,
+        'by_month': by_month,
+        'summary': summary.sort_values('Avg Daily Foot Traffic', ascending=False, ignore_index=True),
+    }
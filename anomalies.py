@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+
+# Online spike / drop detection over the daily foot traffic feed.
+# Every corridor keeps a smoothed level, a factor per weekday and the variance of its
+# deviations from that baseline: a fixed handful of numbers, whatever the length of its
+# history. Days are processed in date order, all corridors reporting that day at once, so
+# new rows only touch the state of the corridors they belong to (see dailyTraffic.py).
+
+# Smoothing of the level, weekday factors and deviation variance (higher adapts faster)
+LEVEL_ALPHA = 0.05
+WEEKDAY_GAMMA = 0.1
+VARIANCE_BETA = 0.05
+
+# Days a corridor must have reported before its days can be flagged (four of each weekday)
+WARMUP_DAYS = 28
+
+# Deviation from the baseline, in standard deviations, that counts as unusual
+Z_THRESHOLD = 3.5
+
+# Unusual days remembered per corridor (most recent kept)
+MAX_EVENTS = 10
+
+_EPOCH = np.datetime64('1970-01-01', 'D')
+
+
+# Per-corridor baseline state plus the most recent unusual days of each corridor
+class AnomalyDetector:
+    def __init__(self, z_threshold=Z_THRESHOLD, warmup_days=WARMUP_DAYS, max_events=MAX_EVENTS):
+        self.z_threshold = z_threshold
+        self.warmup_days = warmup_days
+        self.max_events = max_events
+        self.corridors = pd.Index([], dtype=object)
+        self.level = np.zeros(0)
+        self.weekday_factor = np.ones((0, 7))
+        self.weekday_count = np.zeros((0, 7), dtype=np.int64)
+        self.variance = np.zeros(0)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.last_day = np.zeros(0, dtype=np.int64)   # days since 1970-01-01 of the latest row, -1 before any
+        self.events = {}   # corridor -> [(date, volume, expected, z)], oldest first
+
+    def __len__(self):
+        return len(self.corridors)
+
+    def _positions(self, names):
+        positions = self.corridors.get_indexer(names)
+        new = pd.unique(names[positions < 0])
+        if len(new):
+            self.corridors = self.corridors.append(pd.Index(new, dtype=object))
+            grow = len(new)
+            self.level = np.r_[self.level, np.zeros(grow)]
+            self.weekday_factor = np.vstack([self.weekday_factor, np.ones((grow, 7))])
+            self.weekday_count = np.vstack([self.weekday_count, np.zeros((grow, 7), dtype=np.int64)])
+            self.variance = np.r_[self.variance, np.zeros(grow)]
+            self.count = np.r_[self.count, np.zeros(grow, dtype=np.int64)]
+            self.last_day = np.r_[self.last_day, np.full(grow, -1, dtype=np.int64)]
+            positions = self.corridors.get_indexer(names)
+        return positions
+
+    # Fold daily rows (Business Corridor, Date, Foot Traffic Volume) into the state and return
+    # the unusual days among them. Rows dated on or before a corridor's latest day are ignored.
+    def update(self, daily):
+        dates = pd.to_datetime(daily['Date'], errors='coerce')
+        valid = (dates.notna() & daily['Foot Traffic Volume'].notna()).to_numpy()
+        if not valid.any():
+            return self.events_frame([])
+        names = daily['Business Corridor'].astype(str).to_numpy(dtype=object)[valid]
+        days = (dates[valid].to_numpy().astype('datetime64[D]') - _EPOCH).astype(np.int64)
+        volumes = daily['Foot Traffic Volume'].to_numpy(dtype=float)[valid]
+        positions = self._positions(names)
+
+        # One step per calendar day, every corridor reporting that day at once.
+        # A corridor reporting twice on one day keeps its last row.
+        order = np.lexsort((np.arange(len(days)), positions, days))
+        days, positions, volumes = days[order], positions[order], volumes[order]
+        last_of_day = np.r_[(days[1:] != days[:-1]) | (positions[1:] != positions[:-1]), True]
+        days, positions, volumes = days[last_of_day], positions[last_of_day], volumes[last_of_day]
+
+        flagged = []
+        bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            day = days[start]
+            rows = positions[start:stop]
+            fresh = self.last_day[rows] < day
+            rows, values = rows[fresh], volumes[start:stop][fresh]
+            if len(rows):
+                flagged.extend(self._step(day, rows, values))
+        return self.events_frame(flagged)
+
+    def _step(self, day, rows, values):
+        weekday = int((day + 3) % 7)   # 1970-01-01 was a Thursday; Monday is 0
+        level = self.level[rows]
+        factor = self.weekday_factor[rows, weekday]
+        count = self.count[rows]
+        expected = level * factor
+        deviation = values - expected
+        spread = np.sqrt(self.variance[rows])
+        ready = count >= self.warmup_days
+        z = np.divide(deviation, spread, out=np.zeros_like(deviation), where=spread > 0)
+        unusual = ready & (np.abs(z) >= self.z_threshold)
+
+        # Unusual days move the baseline only as far as a threshold-sized deviation would,
+        # so a closure or one-off event doesn't become the new normal
+        limit = np.where(ready, self.z_threshold * spread, np.inf)
+        clipped = np.clip(deviation, -limit, limit)
+        observed = expected + clipped
+
+        # Plain running means until there is enough history, exponential after that
+        seen = count + 1
+        alpha = np.maximum(LEVEL_ALPHA, 1 / seen)
+        safe_factor = np.where(factor > 0, factor, 1.0)
+        new_level = level + alpha * (observed / safe_factor - level)
+        weekday_seen = self.weekday_count[rows, weekday] + 1
+        gamma = np.maximum(WEEKDAY_GAMMA, 1 / weekday_seen)
+        safe_level = np.where(new_level > 0, new_level, 1.0)
+        beta = np.maximum(VARIANCE_BETA, 1 / np.maximum(count, 1))
+
+        self.level[rows] = new_level
+        self.weekday_factor[rows, weekday] = factor + gamma * (observed / safe_level - factor)
+        self.weekday_count[rows, weekday] = weekday_seen
+        self.variance[rows] = np.where(count > 0, (1 - beta) * self.variance[rows] + beta * clipped ** 2, 0.0)
+        self.count[rows] = seen
+        self.last_day[rows] = day
+
+        date = (_EPOCH + day).astype(str)
+        flagged = []
+        for row, volume, baseline, score in zip(rows[unusual], values[unusual], expected[unusual], z[unusual]):
+            event = (date, int(volume), int(round(baseline)), round(float(score), 1))
+            history = self.events.setdefault(self.corridors[row], [])
+            history.append(event)
+            del history[:-self.max_events]
+            flagged.append((self.corridors[row], *event))
+        return flagged
+
+    # Unusual days as a table; all remembered ones by default
+    def events_frame(self, events=None):
+        if events is None:
+            events = [(corridor, *event) for corridor, history in self.events.items() for event in history]
+        frame = pd.DataFrame(events, columns=['Business Corridor', 'Date', 'Foot Traffic Volume', 'Expected', 'Z-Score'])
+        frame['Date'] = pd.to_datetime(frame['Date'])
+        frame['Day'] = frame['Date'].dt.day_name()
+        frame['Change'] = np.where(frame['Z-Score'] > 0, "Spike", "Drop")
+        return frame.sort_values(['Date', 'Business Corridor'], ascending=[False, True], ignore_index=True)
+
+    # Remembered unusual days of one corridor, most recent first
+    def corridor_events(self, corridor):
+        return self.events_frame([(corridor, *event) for event in self.events.get(corridor, [])])
+
+    # Latest day each corridor reported
+    def latest_date(self, corridor):
+        position = self.corridors.get_indexer([corridor])[0]
+        if position < 0 or self.last_day[position] < 0:
+            return None
+        return pd.Timestamp(_EPOCH + self.last_day[position])
+
+    # JSON-friendly state, stored with the daily aggregates
+    def to_dict(self):
+        return {
+            'z_threshold': self.z_threshold,
+            'warmup_days': self.warmup_days,
+            'max_events': self.max_events,
+            'corridors': list(self.corridors),
+            'level': self.level.tolist(),
+            'weekday_factor': self.weekday_factor.tolist(),
+            'weekday_count': self.weekday_count.tolist(),
+            'variance': self.variance.tolist(),
+            'count': self.count.tolist(),
+            'last_day': self.last_day.tolist(),
+            'events': self.events,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        detector = cls(state['z_threshold'], state['warmup_days'], state['max_events'])
+        corridors = len(state['corridors'])
+        detector.corridors = pd.Index(state['corridors'], dtype=object)
+        detector.level = np.array(state['level'], dtype=float)
+        detector.weekday_factor = np.array(state['weekday_factor'], dtype=float).reshape(corridors, 7)
+        detector.weekday_count = np.array(state['weekday_count'], dtype=np.int64).reshape(corridors, 7)
+        detector.variance = np.array(state['variance'], dtype=float)
+        detector.count = np.array(state['count'], dtype=np.int64)
+        detector.last_day = np.array(state['last_day'], dtype=np.int64)
+        detector.events = {corridor: [tuple(event) for event in history] for corridor, history in state['events'].items()}
+        return detector
+
+
+# Detector that has seen every row of a daily frame
+def detect_anomalies(daily):
+    detector = AnomalyDetector()
+    detector.update(daily)
+    return detector
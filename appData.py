@@ -0,0 +1,138 @@
+import os
+
+import streamlit as st
+
+from ingest import read_typed_csv, DAILY_SCHEMA, LOCATION_SCHEMA
+from hourlyTraffic import HOURLY_FILE, hourly_data_available, load_corridor_hourly, load_hourly_profiles
+from cuisineIndex import CuisineIndex
+from dailyTraffic import DAILY_FILE, load_daily_cube, load_daily_detector
+from forecast import forecast_traffic
+from ranking import RankingEngine
+from retrieval import build_fact_index
+from snapshots import DEFAULT_SNAPSHOT_DIR, open_snapshot_store
+from spatial import PlazaMap
+from telemetry import span
+from timeSeries import daily_series, hourly_series
+from trafficCube import CorridorIndex, corridor_daily_average
+
+# Load data functions (typed columnar copies are cached on disk, see ingest.py).
+# The listings frame is one shared object for every session: treat it as read-only and keep
+# row positions into it (see searchResults.py) rather than filtered copies.
+@st.cache_resource
+def load_data(file_path="sanjosedataset.csv"):
+    with span("data.load_csv", file=file_path):
+        return read_typed_csv(file_path, LOCATION_SCHEMA)
+
+# Load data functions
+@st.cache_data
+def load_foot_traffic_data(file_path=DAILY_FILE):
+    with span("data.load_csv", file=file_path):
+        return read_typed_csv(file_path, DAILY_SCHEMA)
+
+# Identify the current hourly file so cached profiles are refreshed when it changes
+def hourly_file_version(file_path=HOURLY_FILE):
+    if not hourly_data_available(file_path):
+        return None
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Load the per-corridor hourly profiles (built from the hourly file in chunks on first use; shared, read-only)
+@st.cache_resource(max_entries=2)
+def get_hourly_profiles(version, file_path=HOURLY_FILE):
+    if version is None:
+        return None
+    with span("data.hourly_profiles", file=file_path):
+        return load_hourly_profiles(file_path)
+
+# Identify the current daily file so the cube picks up newly appended rows
+def daily_file_version(file_path=DAILY_FILE):
+    stat = os.stat(file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Aggregate cube for the daily file; new rows are folded into the stored cube (see dailyTraffic.py).
+# Shared and read-only like the listings.
+@st.cache_resource(max_entries=2)
+def load_traffic_cube(version=None, file_path=DAILY_FILE):
+    with span("data.update_cube", file=file_path):
+        return load_daily_cube(file_path)
+
+# Corridor -> row range index over the cube, for slicing out several corridors at once (shared, read-only)
+@st.cache_resource(max_entries=2)
+def load_corridor_index(version=None, file_path=DAILY_FILE):
+    cube = load_traffic_cube(version, file_path)
+    with span("data.build_corridor_index"):
+        return CorridorIndex(cube)
+
+# Spike / drop detector state for every corridor; new daily rows are stepped through it as
+# they arrive (see dailyTraffic.py). Shared, read-only.
+@st.cache_resource(max_entries=2)
+def load_anomaly_detector(version=None, file_path=DAILY_FILE):
+    with span("data.update_anomalies", file=file_path):
+        return load_daily_detector(file_path)
+
+# Full daily series of every corridor at each zoom level of the history chart (shared, read-only)
+@st.cache_resource(max_entries=2)
+def load_daily_series(version=None, file_path=DAILY_FILE):
+    with span("data.load_csv", file=file_path):
+        daily = read_typed_csv(file_path, DAILY_SCHEMA)
+    with span("data.decimate", resolution="daily"):
+        return daily_series(daily)
+
+# One corridor's hourly series at each zoom level, read from its partition; the most recently
+# viewed corridors are kept
+@st.cache_resource(max_entries=32)
+def load_hourly_series(corridor, version, file_path=HOURLY_FILE):
+    # Loading the profiles builds the corridor partitions on first use
+    if get_hourly_profiles(version, file_path) is None:
+        return None
+    with span("data.decimate", resolution="hourly"):
+        return hourly_series(load_corridor_hourly(corridor))
+
+# Foot traffic forecasts for every corridor, refitted when the daily file changes (shared, read-only)
+@st.cache_resource(max_entries=2)
+def load_forecasts(version=None, file_path=DAILY_FILE):
+    with span("data.load_csv", file=file_path):
+        daily = read_typed_csv(file_path, DAILY_SCHEMA)
+    with span("data.forecast"):
+        return forecast_traffic(daily)
+
+# Build the restaurant type / cuisine index once per plaza dataset (rows line up with load_data)
+@st.cache_resource
+def load_cuisine_index(file_path="sanjosedataset.csv"):
+    plazas = load_data(file_path)
+    with span("data.build_cuisine_index"):
+        return CuisineIndex(plazas['Cuisine Compatibility'])
+
+# Listings joined to their corridor's traffic and ready to score (rows line up with load_data)
+@st.cache_resource(max_entries=2)
+def load_ranking_engine(version=None, file_path="sanjosedataset.csv"):
+    plazas = load_data(file_path)
+    traffic = corridor_daily_average(load_traffic_cube(version))
+    with span("data.build_ranking"):
+        return RankingEngine(plazas, traffic)
+
+# Geocoded plazas and corridors with their spatial indexes (rows line up with load_data)
+@st.cache_resource(max_entries=2)
+def load_plaza_map(version=None, file_path="sanjosedataset.csv", daily_file=DAILY_FILE):
+    plazas = load_data(file_path)
+    daily = read_typed_csv(daily_file, DAILY_SCHEMA)
+    corridors = daily.drop_duplicates('Business Corridor')[['Business Corridor', 'Address']]
+    traffic = corridor_daily_average(load_traffic_cube(version))
+    with span("data.build_plaza_map"):
+        return PlazaMap(plazas, corridors, traffic)
+
+# Retrieval index of plaza and corridor facts for the chatbot, rebuilt when the daily file changes
+@st.cache_resource(max_entries=2)
+def load_fact_index(version=None, file_path="sanjosedataset.csv"):
+    plazas = load_data(file_path)
+    cube = load_traffic_cube(version)
+    forecasts = load_forecasts(version)
+    ranking = load_ranking_engine(version, file_path)
+    with span("data.build_fact_index"):
+        return build_fact_index(plazas, cube, forecasts, ranking)
+
+# Pre-rendered foot traffic views for the current data (None until `python snapshots.py` has run for it)
+@st.cache_resource(max_entries=2)
+def load_snapshot_store(version, store_dir=DEFAULT_SNAPSHOT_DIR):
+    with span("data.open_snapshots"):
+        return open_snapshot_store(version, store_dir)
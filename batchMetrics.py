@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from analytics import corridor_summary
+from hourlyTraffic import HOURLY_FILE, corridor_hourly_profile, load_hourly_profiles
+from ingest import DAILY_SCHEMA, read_typed_csv
+from trafficCube import build_traffic_cube
+
+
+# Worker: build a cube for a batch of corridors and summarise each of them
+def summarise_batch(daily_rows, hourly_profiles=None):
+    cube = build_traffic_cube(daily_rows)
+    summaries = []
+    for corridor in daily_rows['Business Corridor'].unique():
+        profile = corridor_hourly_profile(hourly_profiles, corridor)
+        summary = corridor_summary(cube, corridor, profile)
+        if summary is not None:
+            summaries.append(summary)
+    return summaries
+
+
+# Split the daily rows into roughly equal batches of whole corridors
+def corridor_batches(daily, batches):
+    corridors = daily['Business Corridor'].astype(str)
+    names = sorted(corridors.unique())
+    groups = {name: i % batches for i, name in enumerate(names)}
+    batch_ids = corridors.map(groups)
+    return [daily[batch_ids == i] for i in range(batches) if (batch_ids == i).any()]
+
+
+# Compute every metric for every corridor, in parallel across `workers` processes
+def compute_all_metrics(daily_file="sj_daily_foottraffic.csv", hourly_file=HOURLY_FILE, workers=None, batches_per_worker=4):
+    workers = workers or os.cpu_count() or 1
+    daily = read_typed_csv(daily_file, DAILY_SCHEMA)
+    daily = daily.assign(**{'Business Corridor': daily['Business Corridor'].astype(str)})
+    hourly_profiles = load_hourly_profiles(hourly_file)
+    batches = corridor_batches(daily, max(1, workers * batches_per_worker))
+
+    if workers == 1:
+        results = [summarise_batch(batch, _profiles_for(hourly_profiles, batch)) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(summarise_batch, batches, [_profiles_for(hourly_profiles, b) for b in batches]))
+    summaries = [summary for batch in results for summary in batch]
+    return sorted(summaries, key=lambda s: s['corridor'])
+
+
+# Only ship each worker the hourly profiles of its own corridors
+def _profiles_for(hourly_profiles, batch):
+    if hourly_profiles is None:
+        return None
+    corridors = set(batch['Business Corridor'].unique())
+    wanted = hourly_profiles.index.get_level_values('Business Corridor').astype(str).isin(corridors)
+    return hourly_profiles[wanted]
+
+
+def write_metrics(summaries, output):
+    if output.endswith('.parquet'):
+        pd.DataFrame(summaries).to_parquet(output, index=False)
+    else:
+        with open(output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+
+
+# Nightly reporting entry point: python batchMetrics.py --output metrics.json
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute foot traffic metrics for every corridor.")
+    parser.add_argument("--daily", default="sj_daily_foottraffic.csv", help="Daily foot traffic CSV")
+    parser.add_argument("--hourly", default=HOURLY_FILE, help="Hourly foot traffic CSV (optional)")
+    parser.add_argument("--output", default="corridor_metrics.json", help="Output file (.json or .parquet)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    summaries = compute_all_metrics(args.daily, args.hourly, workers=args.workers)
+    write_metrics(summaries, args.output)
+    print(f"Wrote metrics for {len(summaries)} corridors to {args.output} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
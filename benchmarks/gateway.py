@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import openai  # noqa: E402
+
+from llmGateway import LLMGateway  # noqa: E402
+from llmStream import StreamStats  # noqa: E402
+from marketAnalysis import MARKET_MAX_TOKENS, MARKET_MODEL, build_market_messages  # noqa: E402
+from stubServer import request_count, start_stub_server  # noqa: E402
+
+
+# A traffic spike against the local stub server: `users` sessions open one of `plazas` plazas at
+# the same moment. Reports upstream requests (coalescing), rate limited answers and wall time.
+def run_spike(gateway, users, plazas, streamed):
+    barrier = threading.Barrier(users)
+
+    def open_plaza(user):
+        messages = build_market_messages(f"Plaza {user % plazas}")
+        barrier.wait()
+        if streamed:
+            return "".join(gateway.stream(messages, MARKET_MODEL, MARKET_MAX_TOKENS, StreamStats(), kind="benchmark"))
+        response = gateway.complete(messages, MARKET_MODEL, MARKET_MAX_TOKENS, kind="benchmark")
+        return response['choices'][0]['message']['content']
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        replies = list(pool.map(open_plaza, range(users)))
+    return time.perf_counter() - started, replies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the LLM gateway against the local stub server.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--plazas", type=int, default=5)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--rate-limit-every", type=int, default=4, help="Stub answers every Nth request with 429")
+    parser.add_argument("--stream", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = start_stub_server(first_token_delay=0.2, token_delay=0.005, rate_limit_every=args.rate_limit_every)
+    openai.api_key = "stub"
+    openai.api_base = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    try:
+        gateway = LLMGateway(max_concurrency=args.max_concurrency, base_delay=0.05)
+        seconds, replies = run_spike(gateway, args.users, args.plazas, args.stream)
+    finally:
+        server.shutdown()
+
+    print(f"{args.users} users, {args.plazas} plazas, {'streamed' if args.stream else 'non-streamed'}")
+    print(f"  upstream requests  {request_count(server):6d} (incl. rate limited)")
+    print(f"  replies            {sum(1 for reply in replies if reply):6d}")
+    print(f"  wall time          {seconds * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# Libraries whose cold import cost we track
+IMPORT_TARGETS = ["streamlit", "pandas", "numpy", "plotly.express", "openai", "pyarrow"]
+
+PAGES = ["Home", "Restaurant Insights", "Chatbot"]
+
+# Heavy modules that should only be loaded by the pages that need them
+HEAVY_MODULES = ["pandas", "plotly", "openai", "pyarrow"]
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Seconds to import `module` in a fresh interpreter
+def time_import(module):
+    code = "import importlib, sys, time; t = time.perf_counter(); importlib.import_module(sys.argv[1]); print(time.perf_counter() - t)"
+    result = subprocess.run([sys.executable, "-c", code, module], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+# Runs inside a fresh interpreter: render one page once and report how long it took
+def measure_first_paint(page):
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    runtime_ready = time.perf_counter()
+
+    app = AppTest.from_file(os.path.join(ROOT, "footFlow.py"), default_timeout=120)
+    app.secrets["OPENAI_API_KEY"] = "startup-benchmark"
+    app.session_state["page"] = page
+    app.run()
+    finished = time.perf_counter()
+    return {
+        "page": page,
+        "runtime_import_seconds": runtime_ready - started,
+        "first_paint_seconds": finished - runtime_ready,
+        "errors": [str(e.message) for e in app.exception],
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def run_page_in_subprocess(page):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", page], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return {"page": page, "errors": [result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Foot Flow cold import and first-paint times.")
+    parser.add_argument("--repeat", type=int, default=3, help="Cold runs per measurement (the median is reported)")
+    parser.add_argument("--no-save", action="store_true", help="Don't append the result to benchmarks/results/startup.jsonl")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        os.chdir(ROOT)
+        print(json.dumps(measure_first_paint(args.child)))
+        return
+
+    def median(values):
+        values = sorted(v for v in values if v is not None)
+        return values[len(values) // 2] if values else None
+
+    imports = {module: median([time_import(module) for _ in range(args.repeat)]) for module in IMPORT_TARGETS}
+    pages = {}
+    for page in PAGES:
+        runs = [run_page_in_subprocess(page) for _ in range(args.repeat)]
+        pages[page] = {
+            "first_paint_seconds": median([r.get("first_paint_seconds") for r in runs]),
+            "runtime_import_seconds": median([r.get("runtime_import_seconds") for r in runs]),
+            "heavy_modules_loaded": runs[-1].get("heavy_modules_loaded"),
+            "errors": runs[-1].get("errors"),
+        }
+
+    record = {
+        "benchmark": "startup",
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": sys.version.split()[0],
+        "imports": imports,
+        "pages": pages,
+    }
+    print(json.dumps(record, indent=2))
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        with open(os.path.join(RESULTS_DIR, "startup.jsonl"), "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Synthetic data shaped like sj_daily_foottraffic.csv and sanjosedataset.csv, for benchmarks
+
+RESTAURANT_TERMS = ["Fast Food", "Casual Dining", "Fine Dining", "Cafe", "Coffee Shop", "Dessert Shops", "Buffet", "Food Truck", "Other"]
+VACANCY_OPTIONS = ["No vacant spots", "1 vacant spot open", "2 vacant spots open", "3 vacant spots open", "Coming Soon!"]
+PRICE_RANGES = ["$-$$", "$-$$$", "$$", "$$-$$$", "$$-$$$$", "$-$$$$"]
+
+# Relative traffic Monday..Sunday and January..December
+WEEKDAY_FACTORS = np.array([0.85, 0.8, 0.85, 0.9, 1.05, 1.3, 1.25])
+MONTH_FACTORS = np.array([0.9, 0.88, 0.95, 1.0, 1.02, 1.05, 1.1, 1.08, 1.0, 0.98, 1.02, 1.12])
+
+
+def corridor_names(corridors):
+    width = len(str(corridors))
+    return [f"Corridor {i:0{width}d}" for i in range(1, corridors + 1)]
+
+
+# Daily foot traffic for `corridors` corridors over `years` years (365 days per year),
+# or over exactly `days` days when given
+def generate_daily_foot_traffic(corridors=10, years=1, start="2023-01-01", seed=0, days=None):
+    rng = np.random.default_rng(seed)
+    names = corridor_names(corridors)
+    dates = pd.date_range(start, periods=days or 365 * years, freq="D")
+    days = len(dates)
+
+    base = rng.lognormal(mean=8.0, sigma=0.35, size=corridors)
+    seasonal = WEEKDAY_FACTORS[dates.dayofweek.to_numpy()] * MONTH_FACTORS[dates.month.to_numpy() - 1]
+    noise = rng.normal(1.0, 0.18, size=(corridors, days)).clip(0.1)
+    volumes = np.rint(base[:, None] * seasonal[None, :] * noise).astype(np.int64)
+
+    zips = rng.integers(95110, 95140, size=corridors)
+    addresses = [f"{100 + i} Main St, San Jose, CA {zips[i]}" for i in range(corridors)]
+    return pd.DataFrame({
+        'Business Corridor': np.repeat(names, days),
+        'Address': np.repeat(addresses, days),
+        'Day': np.tile(dates.day_name().to_numpy(), corridors),
+        'Date': np.tile(dates.strftime('%Y-%m-%d').to_numpy(), corridors),
+        'Foot Traffic Volume': volumes.ravel(),
+    })
+
+
+# Append `days` more days of traffic after a dataset written by write_dataset
+def append_daily_foot_traffic(daily_path, corridors=10, years=1, days=1, start="2023-01-01", seed=0):
+    next_day = pd.Timestamp(start) + pd.Timedelta(days=365 * years)
+    rows = generate_daily_foot_traffic(corridors, start=next_day, seed=seed + 1, days=days)
+    rows.to_csv(daily_path, mode="a", header=False, index=False)
+
+
+# Plaza listings, one per corridor, with random restaurant types, sizes and lease rates
+def generate_locations(corridors=10, seed=0):
+    rng = np.random.default_rng(seed + 1)
+    names = corridor_names(corridors)
+    cuisines = []
+    for _ in range(corridors):
+        count = rng.integers(1, 4)
+        cuisines.append(", ".join(rng.choice(RESTAURANT_TERMS, size=count, replace=False)))
+    return pd.DataFrame({
+        'Location Name': names,
+        'Address': [f"{100 + i} Main St, San Jose, CA 951{10 + i % 30}" for i in range(corridors)],
+        'Cuisine Compatibility': cuisines,
+        'Image URL': [f"https://example.com/plaza/{i}.jpg" for i in range(corridors)],
+        'Average Store Size (sq ft)': rng.integers(8, 60, size=corridors) * 100.0,
+        'Average Lease Rate ($/sq ft)': np.round(rng.uniform(2.0, 8.0, size=corridors), 2),
+        'Vacancy Status': rng.choice(VACANCY_OPTIONS, size=corridors),
+        'Price Range': rng.choice(PRICE_RANGES, size=corridors),
+    })
+
+
+# Write both synthetic CSVs into `out_dir`; returns (daily_path, locations_path)
+def write_dataset(out_dir, corridors=10, years=1, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    daily_path = os.path.join(out_dir, "sj_daily_foottraffic.csv")
+    locations_path = os.path.join(out_dir, "sanjosedataset.csv")
+    generate_daily_foot_traffic(corridors, years, seed=seed).to_csv(daily_path, index=False)
+    generate_locations(corridors, seed=seed).to_csv(locations_path, index=False)
+    return daily_path, locations_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Foot Flow datasets.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--corridors", type=int, default=10)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    for path in write_dataset(args.out_dir, args.corridors, args.years, args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
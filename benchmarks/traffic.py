@@ -0,0 +1,220 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from analytics import comparison_metrics, monthly_metrics, week_of_month_metrics, weekly_metrics  # noqa: E402
+from anomalies import AnomalyDetector, detect_anomalies  # noqa: E402
+from cuisineIndex import CuisineIndex  # noqa: E402
+from dailyTraffic import update_daily_store  # noqa: E402
+from forecast import forecast_traffic  # noqa: E402
+from ingest import DAILY_SCHEMA, LOCATION_SCHEMA, read_typed_csv  # noqa: E402
+from locationTable import render_table, row_html, sort_positions  # noqa: E402
+from ranking import RankingEngine  # noqa: E402
+from searchResults import search_results  # noqa: E402
+from spatial import PlazaMap  # noqa: E402
+from startup import git_revision  # noqa: E402
+from synthetic import append_daily_foot_traffic, write_dataset  # noqa: E402
+from timeSeries import SeriesLevels, daily_series  # noqa: E402
+from trafficCube import CorridorIndex, build_traffic_cube, corridor_daily_average  # noqa: E402
+from trafficViews import build_traffic_view, chart_figure, serialise_view  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+RESULTS_FILE = os.path.join(RESULTS_DIR, "traffic.jsonl")
+
+# Corridors looked up in the aggregation benchmarks
+SAMPLE_CORRIDORS = 20
+
+# Length of the synthetic hourly series decimated for the history chart
+HISTORY_POINTS = 5_000_000
+
+
+# Median wall time of `repeat` calls to `fn`
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+# The per-plaza scan the insight views used to run before the cube existed (kept as a baseline)
+def scan_month_totals(daily, corridor):
+    rows = daily[daily['Business Corridor'] == corridor]
+    dates = pd.to_datetime(rows['Date'])
+    return rows.groupby(dates.dt.month)['Foot Traffic Volume'].sum()
+
+
+# Time every foot traffic code path on one synthetic dataset size
+def run_size(corridors, years, repeat, work_dir):
+    daily_path, locations_path = write_dataset(work_dir, corridors, years)
+    cache_dir = os.path.join(work_dir, "columnar")
+    timings = {}
+
+    timings['load.raw_csv'] = timed(lambda: pd.read_csv(daily_path), repeat)
+    started = time.perf_counter()
+    daily = read_typed_csv(daily_path, DAILY_SCHEMA, cache_dir=cache_dir)
+    timings['load.typed_first'] = time.perf_counter() - started
+    timings['load.typed_cached'] = timed(lambda: read_typed_csv(daily_path, DAILY_SCHEMA, cache_dir=cache_dir), repeat)
+
+    timings['cube.build'] = timed(lambda: build_traffic_cube(daily), repeat)
+    cube = build_traffic_cube(daily)
+
+    # Anomaly detection: the whole history once, then one new day from the stored state
+    timings['anomalies.full_pass'] = timed(lambda: detect_anomalies(daily), repeat)
+    last_day = daily['Date'] == daily['Date'].max()
+    stored = detect_anomalies(daily[~last_day]).to_dict()
+    timings['anomalies.one_day'] = timed(lambda: AnomalyDetector.from_dict(stored).update(daily[last_day]), repeat)
+
+    # Incremental ingestion: fold one newly appended day into the stored cube
+    store_dir = os.path.join(work_dir, "daily")
+    started = time.perf_counter()
+    update_daily_store(daily_path, store_dir)
+    timings['cube.store_full'] = time.perf_counter() - started
+    append_daily_foot_traffic(daily_path, corridors, years)
+    started = time.perf_counter()
+    update_daily_store(daily_path, store_dir)
+    timings['cube.append_day'] = time.perf_counter() - started
+
+    timings['forecast.fit_all'] = timed(lambda: forecast_traffic(daily), repeat)
+
+    locations = read_typed_csv(locations_path, LOCATION_SCHEMA, cache_dir=cache_dir)
+    timings['filter.index_build'] = timed(lambda: CuisineIndex(locations['Cuisine Compatibility']), repeat)
+    index = CuisineIndex(locations['Cuisine Compatibility'])
+    timings['filter.match_any'] = timed(lambda: index.match(any_of=["Fast Food", "Cafe"]), repeat)
+    timings['filter.match_all'] = timed(lambda: index.match(all_of=["Casual Dining", "Other"]), repeat)
+
+    sample = list(daily['Business Corridor'].cat.categories[:SAMPLE_CORRIDORS])
+    timings['aggregate.weekly_city'] = timed(lambda: weekly_metrics(cube), repeat)
+    timings['aggregate.week_of_month'] = timed(lambda: [week_of_month_metrics(cube, c) for c in sample], repeat) / len(sample)
+    timings['aggregate.yearly_by_month'] = timed(lambda: [monthly_metrics(cube, c) for c in sample], repeat) / len(sample)
+    timings['aggregate.yearly_by_month_scan'] = timed(lambda: [scan_month_totals(daily, c) for c in sample[:3]], repeat) / min(3, len(sample))
+    timings['aggregate.corridor_index'] = timed(lambda: CorridorIndex(cube), repeat)
+    corridor_index = CorridorIndex(cube)
+    timings['aggregate.compare_10'] = timed(lambda: comparison_metrics(corridor_index, sample[:10]), repeat)
+    timings['views.build_live'] = timed(lambda: build_traffic_view("Total Foot Traffic Per Year", sample[0], cube), repeat)
+    stored = json.loads(json.dumps(serialise_view(build_traffic_view("Total Foot Traffic Per Year", sample[0], cube))))
+    timings['views.from_snapshot'] = timed(lambda: chart_figure(stored['figure']), repeat)
+
+    timings['history.daily_levels'] = timed(lambda: daily_series(daily), repeat)
+    # A multi-year hourly series is millions of points; the chart gets at most MAX_POINTS of them
+    hours = np.arange(np.datetime64('2015-01-01T00'), np.datetime64('2015-01-01T00') + HISTORY_POINTS, dtype='datetime64[h]')
+    volumes = np.random.default_rng(0).integers(0, 500, HISTORY_POINTS)
+    timings['history.hourly_levels_5m'] = timed(lambda: SeriesLevels(hours, volumes), 1)
+    levels = SeriesLevels(hours, volumes)
+    timings['history.window_full'] = timed(lambda: levels.window(), repeat)
+    timings['history.window_week'] = timed(lambda: levels.window('2020-03-01', '2020-03-08'), repeat)
+
+    traffic = corridor_daily_average(cube)
+    timings['ranking.build'] = timed(lambda: RankingEngine(locations, traffic), repeat)
+    ranking = RankingEngine(locations, traffic)
+    timings['ranking.top_k'] = timed(lambda: ranking.top_k(2000, "$10,000-$50,000", k=10), repeat)
+
+    corridor_rows = daily.drop_duplicates('Business Corridor')[['Business Corridor', 'Address']]
+    timings['spatial.build'] = timed(lambda: PlazaMap(locations, corridor_rows, traffic), repeat)
+    plaza_map = PlazaMap(locations, corridor_rows, traffic)
+    origin = plaza_map.location_of(locations['Location Name'].iloc[0])
+    timings['spatial.within_3mi'] = timed(lambda: plaza_map.plazas_within(*origin, 3), repeat)
+    timings['spatial.nearest_corridors'] = timed(lambda: plaza_map.nearest_corridors(*origin, 3), repeat)
+
+    timings['results.search'] = timed(lambda: search_results(locations, ranking, plaza_map, index.match(any_of=["Fast Food", "Cafe"]), 1000, "$10,000-$50,000", 5), repeat)
+    results = search_results(locations, ranking, plaza_map, np.ones(len(locations), dtype=bool), 1000, "$10,000-$50,000", 5)
+    columns = results.sort_columns(locations, ranking)
+    order = results.positions[sort_positions(columns, "Foot Traffic: High to Low")]
+
+    def render_cold(positions):
+        row_html.cache_clear()
+        render_table(locations, positions, 1000, ranking.traffic[positions])
+
+    timings['table.sort'] = timed(lambda: sort_positions(results.sort_columns(locations, ranking), "Monthly Lease: Low to High"), repeat)
+    timings['table.render_page_cold'] = timed(lambda: render_cold(order[:25]), repeat)
+    timings['table.render_page_warm'] = timed(lambda: render_table(locations, order[:25], 1000, ranking.traffic[order[:25]]), repeat)
+    timings['table.render_all_cold'] = timed(lambda: render_cold(order), repeat)
+
+    return {
+        'corridors': corridors,
+        'years': years,
+        'rows': len(daily),
+        'timings': timings,
+    }
+
+
+def load_history(path=RESULTS_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# Compare a run with the latest earlier run of the same size; returns the regressed timings
+def compare(record, history, threshold):
+    previous = [r for r in history if r['corridors'] == record['corridors'] and r['years'] == record['years']]
+    if not previous:
+        return []
+    baseline = previous[-1]
+    regressions = []
+    print(f"  vs {baseline.get('revision')} ({baseline.get('timestamp')}):")
+    for name, seconds in record['timings'].items():
+        before = baseline['timings'].get(name)
+        if not before:
+            continue
+        ratio = seconds / before
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"    {name:<32} {before * 1000:10.3f} ms -> {seconds * 1000:10.3f} ms  x{ratio:5.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Foot Flow data paths on synthetic data.")
+    parser.add_argument("--corridors", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio reported as a regression")
+    parser.add_argument("--no-save", action="store_true", help="Don't append results to benchmarks/results/traffic.jsonl")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    history = load_history()
+    revision = git_revision()
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    regressions = []
+    for corridors in args.corridors:
+        for years in args.years:
+            work_dir = tempfile.mkdtemp(prefix="footflow-bench-")
+            try:
+                record = run_size(corridors, years, args.repeat, work_dir)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            record.update({'benchmark': 'traffic', 'timestamp': timestamp, 'revision': revision})
+            print(f"{corridors} corridors x {years} years ({record['rows']:,} rows)")
+            for name, seconds in record['timings'].items():
+                print(f"  {name:<34} {seconds * 1000:10.3f} ms")
+            regressions += [f"{corridors}x{years} {name}" for name in compare(record, history, args.threshold)]
+            if not args.no_save:
+                os.makedirs(RESULTS_DIR, exist_ok=True)
+                with open(RESULTS_FILE, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+
+    if regressions:
+        print("Regressions: " + ", ".join(regressions))
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
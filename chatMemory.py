@@ -0,0 +1,150 @@
+import threading
+
+from chatbotPrompt import CHARS_PER_TOKEN, CHATBOT_MODEL, estimate_tokens
+from llmGateway import default_gateway
+
+# Recent turns are sent word for word up to this many tokens; past it the oldest are
+# folded into a rolling summary. At twice the budget the oldest turns are cut down
+# without waiting for a summary, so a session never holds more than that.
+HISTORY_TOKEN_BUDGET = 1200
+HARD_HISTORY_TOKENS = 2 * HISTORY_TOKEN_BUDGET
+
+# Longest rolling summary kept, and the completion limit of the request writing it
+SUMMARY_TOKEN_BUDGET = 250
+SUMMARY_MAX_TOKENS = 200
+
+# Longest question or answer stored (answers past this are kept only in part)
+MAX_MESSAGE_TOKENS = 400
+
+# Label of summarisation requests in the telemetry metrics
+SUMMARY_KIND = "chat_summary"
+
+
+def truncate_tokens(text, tokens):
+    limit = tokens * CHARS_PER_TOKEN
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _turn_tokens(turn):
+    return estimate_tokens(turn[0]) + estimate_tokens(turn[1])
+
+
+# Prompt asking the model to fold older turns into the running summary
+def build_summary_messages(summary, turns):
+    transcript = "\n".join(f"User: {question}\nAssistant: {answer}" for question, answer in turns)
+    return [
+        {"role": "system", "content": (
+            "Summarise this restaurant-advice conversation for later context in at most "
+            f"{SUMMARY_TOKEN_BUDGET * 3 // 4} words. Keep the user's goals, plazas, budgets, numbers and decisions; drop pleasantries."
+        )},
+        {"role": "user", "content": f"Summary so far: {summary or '(none)'}\n\nNew turns:\n{transcript}"},
+    ]
+
+
+def summarize_turns(summary, turns):
+    messages = build_summary_messages(summary, turns)
+    response = default_gateway().complete(messages, CHATBOT_MODEL, SUMMARY_MAX_TOKENS, kind=SUMMARY_KIND)
+    return response['choices'][0]['message']['content'].strip()
+
+
+# Summary used when the model can't be asked: the start of each question folded in
+def extractive_summary(summary, turns):
+    asked = "; ".join(truncate_tokens(question, 25) for question, _ in turns)
+    return f"{summary} Earlier the user asked: {asked}." if summary else f"The user asked: {asked}."
+
+
+# One session's conversation: a rolling summary plus the most recent turns.
+# Both are bounded in tokens, so prompts and memory stay the same size however long the
+# conversation runs. Summaries are written off the request path (see compact()).
+class ChatMemory:
+    def __init__(self, history_budget=HISTORY_TOKEN_BUDGET, hard_limit=HARD_HISTORY_TOKENS,
+                 summary_budget=SUMMARY_TOKEN_BUDGET, max_message_tokens=MAX_MESSAGE_TOKENS):
+        self.history_budget = history_budget
+        self.hard_limit = hard_limit
+        self.summary_budget = summary_budget
+        self.max_message_tokens = max_message_tokens
+        self.summary = ""
+        self.turns = []   # (question, answer), oldest first
+        self.folded_turns = 0   # turns already folded into the summary
+        self._compacting = False
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.folded_turns + len(self.turns)
+
+    def history_tokens(self):
+        return sum(_turn_tokens(turn) for turn in self.turns)
+
+    # Characters held by this session's memory
+    def footprint(self):
+        with self._lock:
+            return len(self.summary) + sum(len(question) + len(answer) for question, answer in self.turns)
+
+    def add_turn(self, question, answer):
+        with self._lock:
+            self.turns.append((truncate_tokens(question, self.max_message_tokens), truncate_tokens(answer, self.max_message_tokens)))
+            # Over the hard limit (e.g. summaries are failing): fold the oldest turns in now
+            while len(self.turns) > 1 and self.history_tokens() > self.hard_limit:
+                self._fold(extractive_summary(self.summary, self.turns[:1]), 1)
+
+    def _fold(self, summary, count):
+        self.summary = truncate_tokens(summary, self.summary_budget)
+        del self.turns[:count]
+        self.folded_turns += count
+
+    def needs_compaction(self):
+        with self._lock:
+            return not self._compacting and len(self.turns) > 1 and self.history_tokens() > self.history_budget
+
+    # Fold the oldest turns into the summary until the recent ones fit in half the budget.
+    # Meant to run in the background; turns added meanwhile are left alone.
+    def compact(self, summarize=summarize_turns):
+        with self._lock:
+            if self._compacting:
+                return False
+            kept, count = self.history_tokens(), 0
+            while count < len(self.turns) - 1 and kept > self.history_budget // 2:
+                kept -= _turn_tokens(self.turns[count])
+                count += 1
+            if not count:
+                return False
+            self._compacting = True
+            summary, folded, end = self.summary, self.turns[:count], self.folded_turns + count
+        try:
+            new_summary = summarize(summary, folded)
+        except Exception:
+            new_summary = extractive_summary(summary, folded)
+        with self._lock:
+            # The hard limit may have folded some of these turns in meanwhile
+            self._fold(new_summary, max(0, end - self.folded_turns))
+            self._compacting = False
+        return True
+
+    # Chat messages carrying the conversation so far, to go before the new question
+    def messages(self):
+        with self._lock:
+            messages = []
+            if self.summary:
+                messages.append({"role": "system", "content": f"Earlier in this conversation: {self.summary}"})
+            for question, answer in self.turns:
+                messages.append({"role": "user", "content": question})
+                messages.append({"role": "assistant", "content": answer})
+            return messages
+
+    def recent_turns(self):
+        with self._lock:
+            return list(self.turns)
+
+    # The latest question, to widen retrieval for follow-ups ("what about its rent?")
+    def last_question(self):
+        with self._lock:
+            return self.turns[-1][0] if self.turns else ""
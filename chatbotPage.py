@@ -0,0 +1,82 @@
+import streamlit as st
+
+from chatbotPrompt import CHATBOT_KIND, CHATBOT_MAX_TOKENS, CHATBOT_MODEL, build_chatbot_messages, prompt_tokens
+from llmGateway import default_gateway
+from chatMemory import ChatMemory
+from llmServices import get_summary_executor, record_stream_stats
+from llmStream import StreamStats, stream_chat_completion
+from telemetry import span
+
+
+# Render the chatbot answer inside its styled card
+def render_chatbot_response(container, chatbot_response):
+    container.markdown(f"""
+        <div style='background-color: #2c2f38; padding: 15px; border-radius: 10px; margin-top: 20px;'>
+            <strong>Chatbot:</strong> {chatbot_response}
+        </div>
+    """, unsafe_allow_html=True)
+
+
+# Chatbot page
+def render():
+    st.markdown("<h1 style='color: white;'>Chatbot 🤖</h1>", unsafe_allow_html=True)
+    
+    # Chatbot description
+    st.write("Ask any questions about opening or managing a restaurant in San Jose, and get tailored insights to help you succeed. "
+             "Whether you're a beginner or an experienced restaurant owner, our chatbot is here to provide guidance.")
+
+    memory = st.session_state.setdefault('chat_memory', ChatMemory())
+    if len(memory):
+        if memory.folded_turns:
+            st.caption(f"{memory.folded_turns} earlier question(s) summarized to keep answers fast.")
+        for question, answer in memory.recent_turns():
+            st.markdown(f"**You:** {question}")
+            render_chatbot_response(st, answer)
+        if st.button("New conversation"):
+            st.session_state['chat_memory'] = ChatMemory()
+            st.rerun()
+
+    # Input field and customized button
+    user_input = st.text_input("Type your question here:")
+    ask_button = st.button("Get Advice")
+
+    if ask_button and user_input:
+        try:
+            # Ground the answer in the plaza and foot traffic facts most relevant to the question.
+            # Imported here so opening the Chatbot page doesn't load the data libraries.
+            from appData import daily_file_version, load_fact_index
+            with span("chatbot.retrieve"):
+                # Follow-ups ("what about its rent?") also match on the previous question
+                facts = load_fact_index(daily_file_version()).context(f"{memory.last_question()} {user_input}")
+            messages = build_chatbot_messages(user_input, facts, memory.messages())
+
+            if st.session_state.get('stream_responses', True):
+                # Display the chatbot response as it is generated
+                response_area = st.empty()
+                chatbot_response = ""
+                stream_stats = StreamStats()
+                with span("chatbot.answer", streamed=True):
+                    for text in stream_chat_completion(messages, CHATBOT_MODEL, CHATBOT_MAX_TOKENS, stats=stream_stats, kind=CHATBOT_KIND):
+                        chatbot_response += text
+                        render_chatbot_response(response_area, chatbot_response)
+                record_stream_stats("Chatbot", stream_stats)
+            else:
+                # Generate a response from OpenAI
+                with span("chatbot.answer", streamed=False):
+                    response = default_gateway().complete(messages, CHATBOT_MODEL, CHATBOT_MAX_TOKENS, kind=CHATBOT_KIND)
+
+                # Extract and display the chatbot response
+                chatbot_response = response['choices'][0]['message']['content'].strip()
+                render_chatbot_response(st, chatbot_response)
+
+            memory.add_turn(user_input, chatbot_response)
+            if memory.needs_compaction():
+                get_summary_executor().submit(memory.compact)
+
+            if facts:
+                with st.expander(f"Foot Flow data used ({len(facts)} facts, ~{prompt_tokens(messages)} prompt tokens)"):
+                    st.markdown("\n".join(f"- {fact}" for fact in facts))
+
+        except Exception as e:
+            st.error("An error occurred while processing your request.")
+            st.write(f"Error details: {e}")
@@ -0,0 +1,40 @@
+import math
+
+# Model and token limit used for chatbot answers
+CHATBOT_MODEL = "gpt-3.5-turbo"
+CHATBOT_MAX_TOKENS = 4096
+
+# Label of chatbot requests in the telemetry metrics
+CHATBOT_KIND = "chatbot"
+
+# Rough size of an English token, used instead of a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Kept short: the data facts below it carry the San Jose specifics
+SYSTEM_PROMPT = (
+    "You advise people opening or running restaurants in San Jose, California. "
+    "Answer directly, then give concrete steps and pro tips; add examples or resources only when they help. "
+    "Briefly cover the obvious follow-up questions. "
+    "When Foot Flow data is provided, base plaza, lease and foot traffic figures on it and say when it doesn't cover the question."
+)
+
+
+# Chat prompt for one question, grounded in the facts retrieved for it (see retrieval.py) and
+# following the conversation so far (`history`, from chatMemory.ChatMemory.messages())
+def build_chatbot_messages(question, facts=(), history=()):
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if facts:
+        data = "\n".join(f"- {fact}" for fact in facts)
+        messages.append({"role": "system", "content": f"Foot Flow data:\n{data}"})
+    messages.extend(history)
+    messages.append({"role": "user", "content": question})
+    return messages
+
+
+def estimate_tokens(text):
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+# Estimated prompt size of a list of chat messages
+def prompt_tokens(messages):
+    return sum(estimate_tokens(message["content"]) for message in messages)
@@ -0,0 +1,53 @@
+import numpy as np
+
+
+# Split a "Cuisine Compatibility" cell into normalised terms, e.g. "Fast Food, Other" -> ["fast food", "other"]
+def tokenize(text):
+    if not isinstance(text, str):
+        return []
+    return [term.strip().lower() for term in text.split(',') if term.strip()]
+
+
+# Inverted index from restaurant type / cuisine terms to the plazas that list them.
+# Postings are stored term-major as a boolean matrix (one contiguous row mask per term),
+# so a query is a handful of vectorised OR/AND reductions instead of a per-row text scan.
+class CuisineIndex:
+    def __init__(self, values):
+        values = list(values)
+        self.size = len(values)
+        self.vocabulary = {}
+        terms, rows = [], []
+        for row, text in enumerate(values):
+            for term in set(tokenize(text)):
+                terms.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                rows.append(row)
+        self.postings = np.zeros((len(self.vocabulary), self.size), dtype=bool)
+        self.postings[terms, rows] = True
+
+    # Boolean row mask of the plazas listing `term` (all False for unknown terms)
+    def posting(self, term):
+        column = self.vocabulary.get(term.strip().lower())
+        if column is None:
+            return np.zeros(self.size, dtype=bool)
+        return self.postings[column]
+
+    def _columns(self, terms):
+        return [self.vocabulary.get(term.strip().lower()) for term in terms]
+
+    # Rows listing at least one of `any_of` and every term in `all_of`
+    def match(self, any_of=(), all_of=()):
+        if not any_of and not all_of:
+            return np.zeros(self.size, dtype=bool)
+        mask = np.ones(self.size, dtype=bool)
+        if any_of:
+            columns = [c for c in self._columns(any_of) if c is not None]
+            mask &= self.postings[columns].any(axis=0) if columns else False
+        if all_of:
+            columns = self._columns(all_of)
+            if None in columns:
+                return np.zeros(self.size, dtype=bool)
+            mask &= self.postings[columns].all(axis=0)
+        return mask
+
+    def terms(self):
+        return sorted(self.vocabulary)
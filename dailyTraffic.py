@@ -0,0 +1,215 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:   # Windows: only threads within one process are serialised
+    fcntl = None
+
+import pandas as pd
+
+from anomalies import AnomalyDetector, detect_anomalies
+from ingest import DAILY_SCHEMA, apply_schema, parquet_available, read_typed_csv
+from trafficCube import CUBE_KEYS, build_traffic_cube, merge_traffic_cubes
+
+DAILY_FILE = "sj_daily_foottraffic.csv"
+
+# Where the running aggregate cube, the anomaly detector state and the ingestion watermarks are kept
+DEFAULT_DAILY_DIR = os.path.join(".footflow_cache", "daily")
+
+# Bump when the stored layout changes so existing stores are rebuilt
+STORE_VERSION = 2
+
+# Bytes before the last read position that must be unchanged for an append-only update
+DIGEST_BYTES = 4096
+
+_update_lock = threading.Lock()
+
+
+# Exclusive hold on the store for this thread and, through a lock file beside the store
+# (the store directory itself is swapped on every save), for every other process using it:
+# the app and the ingestion CLI never update or read it half-swapped at the same time.
+@contextmanager
+def _store_lock(store_dir):
+    with _update_lock:
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(store_dir)), exist_ok=True)
+        with open(f"{store_dir}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _table_file(key):
+    return key.lower().replace(' ', '_') + ".parquet"
+
+
+# Digest of the bytes just before `offset`; a mismatch means earlier rows were rewritten
+def _prefix_digest(f, offset):
+    start = max(0, offset - DIGEST_BYTES)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+# Offset just past the last complete line, so a row still being written is read next time
+def _complete_lines_end(f, size):
+    start = max(0, size - 65536)
+    f.seek(start)
+    return start + f.read().rfind(b'\n') + 1
+
+
+# Latest date seen for every corridor, as ISO date strings
+def corridor_watermarks(daily):
+    dates = pd.to_datetime(daily['Date'], errors='coerce')
+    latest = dates.groupby(daily['Business Corridor'].astype(str)).max().dropna()
+    return {corridor: date.strftime('%Y-%m-%d') for corridor, date in latest.items()}
+
+
+def _read_state(store_dir):
+    state_path = os.path.join(store_dir, "state.json")
+    if not os.path.exists(state_path):
+        return None
+    with open(state_path) as f:
+        state = json.load(f)
+    return state if state.get('version') == STORE_VERSION else None
+
+
+def _load_cube(store_dir):
+    cube = {}
+    for key in CUBE_KEYS:
+        table = pd.read_parquet(os.path.join(store_dir, _table_file(key)))
+        cube[key] = table.set_index(['Business Corridor', key]).sort_index()
+    return cube
+
+
+def _load_detector(store_dir):
+    with open(os.path.join(store_dir, "anomalies.json")) as f:
+        return AnomalyDetector.from_dict(json.load(f))
+
+
+# Write the cube, detector and state to a fresh directory and swap it into place
+def _save_store(store_dir, cube, state, detector):
+    build_dir = f"{store_dir}.building-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+    for key in CUBE_KEYS:
+        cube[key].reset_index().to_parquet(os.path.join(build_dir, _table_file(key)), index=False)
+    with open(os.path.join(build_dir, "anomalies.json"), "w") as f:
+        json.dump(detector.to_dict(), f)
+    with open(os.path.join(build_dir, "state.json"), "w") as f:
+        json.dump(state, f)
+
+    stale_dir = f"{store_dir}.stale-{os.getpid()}-{threading.get_ident()}"
+    if os.path.exists(store_dir):
+        os.replace(store_dir, stale_dir)
+    os.replace(build_dir, store_dir)
+    shutil.rmtree(stale_dir, ignore_errors=True)
+
+
+# Aggregate every complete line of the file and record where reading stopped.
+# A partial last line is left out of the aggregates, to be read by the next update.
+def _rebuild(file_path, store_dir):
+    with open(file_path, 'rb') as f:
+        offset = _complete_lines_end(f, os.path.getsize(file_path))
+        digest = _prefix_digest(f, offset)
+        # Parse exactly the bytes the offset covers, even if the file grows meanwhile
+        f.seek(0)
+        head = f.read(offset)
+    daily = apply_schema(pd.read_csv(io.BytesIO(head)), DAILY_SCHEMA)
+    cube = build_traffic_cube(daily)
+    state = {
+        'version': STORE_VERSION,
+        'columns': list(daily.columns),
+        'offset': offset,
+        'digest': digest,
+        'rows': len(daily),
+        'watermarks': corridor_watermarks(daily),
+    }
+    _save_store(store_dir, cube, state, detect_anomalies(daily))
+    return cube, {'mode': 'full', 'appended': len(daily), 'skipped': 0, 'rows': len(daily)}
+
+
+# Bring the stored cube up to date with the daily CSV and return (cube, report).
+# Rows appended since the last update are read on their own and folded into the running
+# aggregates. Rows dated on or before their corridor's watermark are skipped as already
+# counted; rewriting earlier rows (not just appending) triggers a full rebuild.
+def update_daily_store(file_path=DAILY_FILE, store_dir=DEFAULT_DAILY_DIR, rebuild=False):
+    if not parquet_available():
+        daily = read_typed_csv(file_path, DAILY_SCHEMA)
+        return build_traffic_cube(daily), {'mode': 'full', 'appended': len(daily), 'skipped': 0, 'rows': len(daily)}
+
+    with _store_lock(store_dir):
+        state = None if rebuild else _read_state(store_dir)
+        if state is None:
+            return _rebuild(file_path, store_dir)
+
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            if size < state['offset'] or _prefix_digest(f, state['offset']) != state['digest']:
+                return _rebuild(file_path, store_dir)
+            f.seek(state['offset'])
+            tail = f.read()
+
+        cube = _load_cube(store_dir)
+        detector = _load_detector(store_dir)
+        end = tail.rfind(b'\n') + 1
+        if end == 0:
+            return cube, {'mode': 'unchanged', 'appended': 0, 'skipped': 0, 'rows': state['rows']}
+
+        new_rows = apply_schema(pd.read_csv(io.BytesIO(tail[:end]), header=None, names=state['columns']), DAILY_SCHEMA)
+        watermarks = pd.to_datetime(new_rows['Business Corridor'].astype(str).map(state['watermarks']))
+        fresh = new_rows['Date'].notna() & (watermarks.isna() | (new_rows['Date'] > watermarks))
+        accepted = new_rows[fresh]
+        if not accepted.empty:
+            cube = merge_traffic_cubes(cube, build_traffic_cube(accepted))
+            # The detector steps through the new days only, from its stored per-corridor state
+            detector.update(accepted)
+
+        state['offset'] += end
+        with open(file_path, 'rb') as f:
+            state['digest'] = _prefix_digest(f, state['offset'])
+        state['rows'] += len(accepted)
+        state['watermarks'].update(corridor_watermarks(accepted))
+        _save_store(store_dir, cube, state, detector)
+        report = {'mode': 'incremental', 'appended': len(accepted), 'skipped': len(new_rows) - len(accepted), 'rows': state['rows']}
+        return cube, report
+
+
+# The up-to-date aggregate cube for the daily CSV
+def load_daily_cube(file_path=DAILY_FILE, store_dir=DEFAULT_DAILY_DIR):
+    return update_daily_store(file_path, store_dir)[0]
+
+
+# The anomaly detector, up to date with the daily CSV (see anomalies.py)
+def load_daily_detector(file_path=DAILY_FILE, store_dir=DEFAULT_DAILY_DIR):
+    if not parquet_available():
+        return detect_anomalies(read_typed_csv(file_path, DAILY_SCHEMA))
+    update_daily_store(file_path, store_dir)
+    with _store_lock(store_dir):
+        return _load_detector(store_dir)
+
+
+# Daily ingestion entry point: python dailyTraffic.py after new rows are appended
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold newly appended daily foot traffic rows into the aggregate store.")
+    parser.add_argument("--daily", default=DAILY_FILE, help="Daily foot traffic CSV")
+    parser.add_argument("--store", default=DEFAULT_DAILY_DIR, help="Aggregate store directory")
+    parser.add_argument("--rebuild", action="store_true", help="Re-aggregate the whole file (e.g. after a backfill)")
+    args = parser.parse_args(argv)
+
+    _, report = update_daily_store(args.daily, args.store, rebuild=args.rebuild)
+    print(f"{report['mode']}: {report['appended']:,} rows added, {report['skipped']:,} already counted, {report['rows']:,} rows in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+import streamlit as st
+
+from sessionMemory import session_memory
+from telemetry import telemetry
+
+
+# Timing breakdown of the current rerun plus process-wide percentiles and LLM counters,
+# and the memory held in session state (`state_sizes`: bytes per key for this session)
+def render(rerun_spans, state_sizes=None):
+    with st.expander("Performance (debug)", expanded=True):
+        st.write("#### This rerun")
+        if rerun_spans:
+            spans = pd.DataFrame(rerun_spans)
+            spans['ms'] = (spans.pop('seconds') * 1000).round(2)
+            st.dataframe(spans, use_container_width=True, hide_index=True)
+
+        histograms, counters = telemetry.summary()
+        st.write("#### Since the server started")
+        if histograms:
+            st.dataframe(pd.DataFrame(histograms).round(2), use_container_width=True, hide_index=True)
+        if counters:
+            st.dataframe(pd.DataFrame(counters), use_container_width=True, hide_index=True)
+
+        if state_sizes is not None:
+            totals = session_memory.totals()
+            st.write("#### Session state")
+            st.caption(
+                f"This session: {sum(state_sizes.values()) / 1024:,.1f} KiB · "
+                f"{totals['sessions']} active sessions: {totals['total_bytes'] / 1024:,.1f} KiB in total, "
+                f"{totals['max_bytes'] / 1024:,.1f} KiB largest"
+            )
+            sizes = pd.DataFrame({'key': list(state_sizes), 'bytes': list(state_sizes.values())})
+            st.dataframe(sizes, use_container_width=True, hide_index=True)
+
+        if telemetry.export_enabled:
+            st.caption(f"Exported to {os.path.join(telemetry.metrics_dir, 'events.jsonl')} and {os.path.join(telemetry.metrics_dir, 'metrics.prom')}")
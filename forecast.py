@@ -0,0 +1,153 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# Foot traffic forecasts for every corridor at once.
+# Daily counts are laid out as a corridor x day matrix, divided by each corridor's
+# month-of-year factors (seasonal decomposition), and the remainder is fitted with a damped
+# additive Holt-Winters model with a weekly season. Every corridor and every candidate set
+# of smoothing parameters is fitted in the same NumPy pass over the days; there is no
+# per-corridor Python loop, so the cost grows with the number of days, not of corridors.
+
+# Days projected ahead, and the periods summarised for each corridor
+FORECAST_HORIZON = 90
+FORECAST_PERIODS = {'next_30_days': 30, 'next_90_days': 90}
+
+# Weekly seasonality of daily counts
+SEASON_LENGTH = 7
+
+# Most recent days used for fitting (older history only informs the month factors)
+HISTORY_DAYS = 730
+
+# Candidate smoothing parameters; each corridor keeps the combination with the lowest error
+ALPHAS = (0.1, 0.3, 0.5)
+BETAS = (0.01, 0.05)
+GAMMAS = (0.05, 0.2, 0.4)
+
+# Trend damping, so a recent slope isn't extrapolated unchanged for a whole quarter
+DAMPING = 0.98
+
+# z-score of the 80% interval reported around period totals
+INTERVAL_Z = 1.28
+
+
+# Corridor x day matrix of daily volumes (NaN where a day is missing)
+def traffic_matrix(daily):
+    dates = pd.to_datetime(daily['Date'], errors='coerce')
+    valid = dates.notna() & daily['Foot Traffic Volume'].notna()
+    corridors = daily['Business Corridor'][valid].astype('category').cat.remove_unused_categories()
+    days = dates[valid].dt.normalize()
+    start = days.min()
+    day_index = ((days - start) // pd.Timedelta(days=1)).to_numpy()
+
+    matrix = np.full((len(corridors.cat.categories), day_index.max() + 1), np.nan)
+    matrix[corridors.cat.codes.to_numpy(), day_index] = daily['Foot Traffic Volume'][valid].to_numpy(dtype=float)
+    names = pd.Index(corridors.cat.categories.astype(str), name='Business Corridor')
+    return names, pd.date_range(start, periods=matrix.shape[1], freq='D'), matrix
+
+
+# Fill missing days with the last known value (or the corridor mean before the first one)
+def fill_gaps(matrix):
+    known = ~np.isnan(matrix)
+    last_known = np.maximum.accumulate(np.where(known, np.arange(matrix.shape[1]), 0), axis=1)
+    filled = matrix[np.arange(matrix.shape[0])[:, None], last_known]
+    return np.where(np.isnan(filled), np.nanmean(matrix, axis=1, keepdims=True), filled)
+
+
+# Month-of-year factors per corridor (month mean / overall mean); 1 until a full year is known
+def monthly_factors(matrix, dates):
+    factors = np.ones((matrix.shape[0], 12))
+    if len(dates) < 365:
+        return factors
+    one_hot = np.eye(12)[dates.month.to_numpy() - 1]
+    sums = matrix @ one_hot
+    counts = one_hot.sum(axis=0)
+    present = counts > 0
+    month_means = sums[:, present] / counts[present]
+    overall = matrix.mean(axis=1, keepdims=True)
+    factors[:, present] = np.divide(month_means, overall, out=np.ones_like(month_means), where=overall > 0)
+    return np.where(factors > 0, factors, 1.0)
+
+
+# Damped additive Holt-Winters over every row of `series` for every parameter set in `params`
+# (rows of alpha, beta, gamma). Returns the final level, trend and season (each parameter set x
+# row) and the sum of squared one-step errors after the warm-up weeks.
+def holt_winters(series, params, phi=DAMPING, m=SEASON_LENGTH):
+    alpha, beta, gamma = (params[:, i][:, None] for i in range(3))
+    # Day-major copies keep every per-day slice contiguous
+    days = np.ascontiguousarray(series.T)
+    first, second = days[:m].mean(axis=0), days[m:2 * m].mean(axis=0)
+    level = np.broadcast_to(first, (len(params), len(first))).copy()
+    trend = np.broadcast_to((second - first) / m, level.shape).copy()
+    season = np.broadcast_to((days[:m] - first)[:, None, :], (m,) + level.shape).copy()
+    sse = np.zeros(level.shape)
+
+    for t, y in enumerate(days):
+        s = season[t % m]
+        expected = level + phi * trend
+        if t >= 2 * m:
+            sse += (y - expected - s) ** 2
+        new_level = alpha * (y - s) + (1 - alpha) * expected
+        trend = beta * (new_level - level) + (1 - beta) * phi * trend
+        season[t % m] = gamma * (y - new_level) + (1 - gamma) * s
+        level = new_level
+    return level, trend, season.transpose(1, 2, 0), sse
+
+
+# Fit every corridor and project the next `horizon` days.
+# Returns {'dates': future days, 'daily': corridor x day forecasts, 'summary': per-corridor totals}
+# or None when there are fewer than two weeks of history.
+def forecast_traffic(daily, horizon=FORECAST_HORIZON, history_days=HISTORY_DAYS):
+    corridors, dates, matrix = traffic_matrix(daily)
+    if len(dates) < 2 * SEASON_LENGTH:
+        return None
+    matrix = fill_gaps(matrix)
+    factors = monthly_factors(matrix, dates)
+    adjusted = matrix / factors[:, dates.month.to_numpy() - 1]
+
+    window = adjusted[:, -history_days:]
+    params = np.array(list(itertools.product(ALPHAS, BETAS, GAMMAS)))
+    level, trend, season, sse = holt_winters(window, params)
+
+    best = sse.argmin(axis=0)
+    rows = np.arange(len(corridors))
+    level, trend, season = level[best, rows], trend[best, rows], season[best, rows]
+    fitted_days = max(1, window.shape[1] - 2 * SEASON_LENGTH)
+    sigma = np.sqrt(sse[best, rows] / fitted_days)
+
+    steps = np.arange(1, horizon + 1)
+    damped = np.cumsum(DAMPING ** steps)
+    future = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon, freq='D')
+    weekly = season[:, (window.shape[1] + steps - 1) % SEASON_LENGTH]
+    projected = (level[:, None] + damped[None, :] * trend[:, None] + weekly) * factors[:, future.month.to_numpy() - 1]
+    projected = projected.clip(min=0)
+
+    summary = {}
+    for name, days in FORECAST_PERIODS.items():
+        total = projected[:, :days].sum(axis=1)
+        spread = INTERVAL_Z * sigma * np.sqrt(days)
+        summary[name] = total
+        summary[f'{name}_low'] = (total - spread).clip(min=0)
+        summary[f'{name}_high'] = total + spread
+        summary[f'last_{days}_days'] = matrix[:, -days:].sum(axis=1)
+    summary['alpha'], summary['beta'], summary['gamma'] = params[best].T
+    return {
+        'dates': future,
+        'daily': pd.DataFrame(projected, index=corridors, columns=future),
+        'summary': pd.DataFrame(summary, index=corridors),
+    }
+
+
+# Forecast totals for one corridor as plain numbers (None if it has no forecast)
+def corridor_forecast(forecasts, corridor):
+    if forecasts is None or corridor not in forecasts['summary'].index:
+        return None
+    row = forecasts['summary'].loc[corridor]
+    result = {'start': forecasts['dates'][0], 'daily': forecasts['daily'].loc[corridor]}
+    for name, days in FORECAST_PERIODS.items():
+        result[name] = int(round(row[name]))
+        result[f'{name}_low'] = int(round(row[f'{name}_low']))
+        result[f'{name}_high'] = int(round(row[f'{name}_high']))
+        result[f'{name}_change'] = (row[name] / row[f'last_{days}_days'] - 1) if row[f'last_{days}_days'] > 0 else None
+    return result
@@ -0,0 +1,20 @@
+import streamlit as st
+
+
+# Home page
+def render():
+    # Main Title
+    st.markdown("<div class='main-title'>Welcome to Foot Flow! 👣</div>", unsafe_allow_html=True)
+    st.write(
+    "Foot Flow is a powerful tool for aspiring and seasoned restaurant owners looking to find prime locations in San Jose. "
+    "By providing insights on foot traffic, demographics, local competition, and leasing options, Foot Flow helps you make informed decisions "
+    "on where to establish your new restaurant. Customize your search based on restaurant type, cuisine, budget, and space needs to find a location "
+    "that aligns with your vision and maximizes your potential for success."
+)
+    
+    # Features Section
+    st.write("### Features:")
+
+    # Feature Cards
+    st.markdown("<div class='feature-card'><div class='feature-title'>🍽 Restaurant Insights</div><p>Explore location-specific data for choosing the right restaurant spot.</p></div>", unsafe_allow_html=True)
+    st.markdown("<div class='feature-card'><div class='feature-title'>🤖 Chatbot</div><p>Ask questions about setting up your business in San Jose.</p></div>", unsafe_allow_html=True)
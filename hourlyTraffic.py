@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+
+import pandas as pd
+
+from ingest import DAY_ORDER, HOURLY_SCHEMA, apply_schema, parquet_available, source_fingerprint
+
+HOURLY_FILE = "sj_hourly_foottraffic.csv"
+
+# Where the corridor partitions and precomputed profiles are kept
+DEFAULT_HOURLY_DIR = os.path.join(".footflow_cache", "hourly")
+
+# Rows read from the hourly CSV at a time
+DEFAULT_CHUNKSIZE = 250_000
+
+# Typical San Jose day, shown when no hourly counts exist for a location
+SAMPLE_HOURLY_PROFILE = [0, 0, 0, 0, 0, 5, 20, 50, 100, 150, 200, 250, 300, 320, 310, 290, 270, 250, 200, 150, 100, 50, 10, 0]
+
+# Bump when the layout of the store changes, so stores built by older code are rebuilt
+HOURLY_STORE_FORMAT = 2
+
+_build_lock = threading.Lock()
+
+
+def hourly_data_available(file_path=HOURLY_FILE):
+    return os.path.exists(file_path)
+
+
+# Filesystem-safe directory name for a corridor partition. Slugs can collide
+# ("St. James" and "St James"), so part of the raw name's hash is added.
+def partition_name(corridor):
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', str(corridor)).strip('-').lower() or "corridor"
+    return f"{slug}-{hashlib.sha1(str(corridor).encode()).hexdigest()[:8]}"
+
+
+# Sum/count of foot traffic per (corridor, weekday, hour) for one chunk
+def _chunk_profile_totals(chunk):
+    valid = chunk.dropna(subset=['Date', 'Hour', 'Foot Traffic Volume'])
+    return (
+        valid.assign(Weekday=valid['Date'].dt.dayofweek, Hour=valid['Hour'].astype(int))
+        .groupby(['Business Corridor', 'Weekday', 'Hour'], observed=True)['Foot Traffic Volume']
+        .agg(['sum', 'count'])
+    )
+
+
+# Read the hourly CSV chunk by chunk into per-corridor Parquet partitions and
+# per-corridor, per-weekday 24-hour profiles. Only one chunk is in memory at a time.
+def build_hourly_store(file_path=HOURLY_FILE, store_dir=DEFAULT_HOURLY_DIR, chunksize=DEFAULT_CHUNKSIZE):
+    write_partitions = parquet_available()
+    build_dir = f"{store_dir}.building-{os.getpid()}-{threading.get_ident()}"
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    partitions = {}
+    totals = []
+    for number, chunk in enumerate(pd.read_csv(file_path, chunksize=chunksize)):
+        chunk = apply_schema(chunk, HOURLY_SCHEMA)
+        totals.append(_chunk_profile_totals(chunk))
+        if not write_partitions:
+            continue
+        for corridor, part in chunk.groupby('Business Corridor', observed=True):
+            name = partitions.setdefault(str(corridor), partition_name(corridor))
+            os.makedirs(os.path.join(build_dir, name), exist_ok=True)
+            part[['Date', 'Hour', 'Foot Traffic Volume']].to_parquet(
+                os.path.join(build_dir, name, f"part-{number:05d}.parquet"), index=False
+            )
+
+    profiles = hourly_profiles_from_totals(totals)
+    if write_partitions:
+        profiles.reset_index().to_parquet(os.path.join(build_dir, "profiles.parquet"), index=False)
+    else:
+        profiles.reset_index().to_pickle(os.path.join(build_dir, "profiles.pkl"))
+    with open(os.path.join(build_dir, "meta.json"), "w") as f:
+        json.dump({'format': HOURLY_STORE_FORMAT, 'source': source_fingerprint(file_path, HOURLY_SCHEMA), 'partitions': partitions}, f)
+
+    # Swap the finished store into place so readers never see a partial build
+    stale_dir = f"{store_dir}.stale-{os.getpid()}-{threading.get_ident()}"
+    if os.path.exists(store_dir):
+        os.replace(store_dir, stale_dir)
+    os.replace(build_dir, store_dir)
+    shutil.rmtree(stale_dir, ignore_errors=True)
+    return profiles
+
+
+# Combine per-chunk totals into average foot traffic per (corridor, weekday, hour)
+def hourly_profiles_from_totals(totals):
+    if not totals:
+        return pd.DataFrame(columns=['sum', 'count', 'mean'])
+    combined = pd.concat(totals).groupby(level=['Business Corridor', 'Weekday', 'Hour'], observed=True).sum()
+    combined['mean'] = combined['sum'] / combined['count']
+    return combined.sort_index()
+
+
+def _store_is_current(file_path, store_dir):
+    meta_path = os.path.join(store_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return False
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return meta.get('format') == HOURLY_STORE_FORMAT and meta.get('source') == source_fingerprint(file_path, HOURLY_SCHEMA)
+
+
+# Load the precomputed hourly profiles, building the store first if the CSV is new or changed.
+# Returns None when there is no hourly file.
+def load_hourly_profiles(file_path=HOURLY_FILE, store_dir=DEFAULT_HOURLY_DIR):
+    if not hourly_data_available(file_path):
+        return None
+    with _build_lock:
+        if not _store_is_current(file_path, store_dir):
+            return build_hourly_store(file_path, store_dir)
+    if os.path.exists(os.path.join(store_dir, "profiles.parquet")):
+        profiles = pd.read_parquet(os.path.join(store_dir, "profiles.parquet"))
+    else:
+        profiles = pd.read_pickle(os.path.join(store_dir, "profiles.pkl"))
+    return profiles.set_index(['Business Corridor', 'Weekday', 'Hour']).sort_index()
+
+
+# Average foot traffic for each of the 24 hours at one corridor.
+# `weekday` is a day name (e.g. "Monday"); None averages over every day of the week.
+def corridor_hourly_profile(profiles, corridor, weekday=None):
+    if profiles is None or corridor not in profiles.index.get_level_values('Business Corridor'):
+        return None
+    rows = profiles.xs(corridor, level='Business Corridor')
+    if weekday is not None:
+        day_number = DAY_ORDER.index(weekday)
+        if day_number not in rows.index.get_level_values('Weekday'):
+            return None
+        rows = rows.xs(day_number, level='Weekday')
+    else:
+        rows = rows.groupby(level='Hour')[['sum', 'count']].sum()
+    profile = rows['sum'] / rows['count']
+    return profile.reindex(range(24), fill_value=0)
+
+
+# Raw hourly rows for one corridor, read from its partition only
+def load_corridor_hourly(corridor, store_dir=DEFAULT_HOURLY_DIR):
+    meta_path = os.path.join(store_dir, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        name = json.load(f)['partitions'].get(corridor)
+    if name is None:
+        return None
+    return pd.read_parquet(os.path.join(store_dir, name)).sort_values(['Date', 'Hour']).reset_index(drop=True)
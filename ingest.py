@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+# Where converted CSVs are kept between runs
+DEFAULT_COLUMNAR_DIR = os.path.join(".footflow_cache", "columnar")
+
+# Bump when the conversion below changes so existing caches are rebuilt
+FORMAT_VERSION = 2
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Column types for each dataset: "category", "day", "datetime", "hour", "int", "float" or "string"
+DAILY_SCHEMA = {
+    'Business Corridor': 'category',
+    'Address': 'category',
+    'Day': 'day',
+    'Date': 'datetime',
+    'Foot Traffic Volume': 'int',
+}
+
+HOURLY_SCHEMA = {
+    'Business Corridor': 'category',
+    'Address': 'category',
+    'Day': 'day',
+    'Date': 'datetime',
+    'Hour': 'hour',
+    'Foot Traffic Volume': 'int',
+}
+
+LOCATION_SCHEMA = {
+    'Location Name': 'string',
+    'Address': 'string',
+    'Cuisine Compatibility': 'string',
+    'Image URL': 'string',
+    'Average Store Size (sq ft)': 'float',
+    'Average Lease Rate ($/sq ft)': 'float',
+    'Vacancy Status': 'category',
+    'Price Range': 'category',
+}
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Hours of the day as small integers; accepts 0-23 or "HH:MM" text
+def parse_hours(values):
+    hours = pd.to_numeric(values, errors='coerce')
+    if hours.isna().any():
+        clock = pd.to_datetime(values.astype(str), format='%H:%M', errors='coerce').dt.hour
+        hours = hours.fillna(clock)
+    return hours.astype('Int8' if hours.isna().any() else 'int8')
+
+
+# Convert raw CSV columns to compact typed columns
+def apply_schema(frame, schema):
+    typed = {}
+    for column in frame.columns:
+        kind = schema.get(column)
+        values = frame[column]
+        if kind == 'category':
+            typed[column] = values.astype('category')
+        elif kind == 'day':
+            typed[column] = pd.Categorical(values, categories=DAY_ORDER)
+        elif kind == 'datetime':
+            typed[column] = pd.to_datetime(values, errors='coerce')
+        elif kind == 'hour':
+            typed[column] = parse_hours(values)
+        elif kind == 'int':
+            numbers = pd.to_numeric(values, errors='coerce')
+            # Keep missing counts as nulls rather than inventing zeros
+            typed[column] = numbers.astype('Int32' if numbers.isna().any() else 'int32')
+        elif kind == 'float':
+            typed[column] = pd.to_numeric(values, errors='coerce').astype('float64')
+        else:
+            typed[column] = values
+    return pd.DataFrame(typed, index=frame.index)
+
+
+# Fingerprint of the source file; the cache is rebuilt whenever it changes
+def source_fingerprint(file_path, schema):
+    stat = os.stat(file_path)
+    return {
+        'format_version': FORMAT_VERSION,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'schema': schema,
+    }
+
+
+def cache_paths(file_path, cache_dir):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{stem}.parquet"), os.path.join(cache_dir, f"{stem}.meta.json")
+
+
+# Read a CSV as a typed columnar frame.
+# The first read converts the CSV and stores it as Parquet next to a fingerprint of the source;
+# later reads load the Parquet file directly until the CSV's mtime or size changes.
+def read_typed_csv(file_path, schema, cache_dir=DEFAULT_COLUMNAR_DIR):
+    if not parquet_available():
+        return apply_schema(pd.read_csv(file_path), schema)
+
+    parquet_path, meta_path = cache_paths(file_path, cache_dir)
+    fingerprint = source_fingerprint(file_path, schema)
+    if os.path.exists(parquet_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            if json.load(f) == fingerprint:
+                return pd.read_parquet(parquet_path)
+
+    typed = apply_schema(pd.read_csv(file_path), schema)
+    os.makedirs(cache_dir, exist_ok=True)
+    # The fingerprint is written only once the Parquet file is in place
+    _replace_file(parquet_path, lambda path: typed.to_parquet(path, index=False))
+    _replace_file(meta_path, lambda path: _write_json(path, fingerprint))
+    return typed
+
+
+# Write `path` through a temporary file of its own in the same directory, then swap it in,
+# so neither a concurrent reader nor another writer (thread or process) sees a partial file
+def _replace_file(path, write):
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as f:
+        temp_path = f.name
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_json(path, value):
+    with open(path, "w") as f:
+        json.dump(value, f)
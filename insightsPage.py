@@ -0,0 +1,421 @@
+from datetime import timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from analytics import comparison_metrics
+from appData import daily_file_version, get_hourly_profiles, hourly_file_version, load_anomaly_detector, load_cuisine_index, load_corridor_index, load_daily_series, load_data, load_forecasts, load_hourly_series, load_plaza_map, load_ranking_engine, load_snapshot_store, load_traffic_cube
+from llmServices import get_market_details, get_prefetcher, get_response_cache, record_stream_stats
+from llmStream import StreamStats
+from marketAnalysis import stream_market_details
+from prefetch import DEFAULT_WAIT_SECONDS
+from locationTable import PAGE_SIZES, SORT_OPTIONS, page_count, render_table, sort_positions
+from searchResults import search_results
+from snapshots import snapshot_version
+from spatial import DENSITY_RADIUS_MILES
+from telemetry import increment, span
+from trafficViews import PROFILE_DAYS, TRAFFIC_METRICS, build_traffic_view, chart_figure, history_figure, view_key
+
+# Listings shown in the Top Picks table after a search
+TOP_PICKS = 5
+
+# High-traffic corridors listed near the selected plaza
+NEARBY_CORRIDORS = 3
+
+# Most plazas overlaid in the comparison charts
+MAX_COMPARED = 10
+
+
+# Restaurant Insights page
+def render():
+    st.header("Restaurant Insights 🍽")
+    st.write("Explore and compare prime locations in San Jose for opening your restaurant. Tailor your search by restaurant style, cuisine, budget, and space requirements to find a location that aligns with your business goals and maximizes customer reach.")
+
+    
+    with span("insights.load_data"):
+        data = load_data()
+    
+    # Check for required columns
+    required_columns = ['Location Name', 'Address', 'Cuisine Compatibility', 'Image URL', 'Average Store Size (sq ft)', 'Average Lease Rate ($/sq ft)', 'Price Range', 'Vacancy Status']
+    if not all(column in data.columns for column in required_columns):
+        st.error(f"Dataset is missing one or more required columns: {', '.join(required_columns)}")
+    else:
+        # Filters sit in a form, so changing them reruns nothing until Submit is pressed
+        with st.form("insights_filters", border=False):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                restaurant_type = st.selectbox("Restaurant Type:", ["Fast Food", "Casual Dining", "Fine Dining", "Cafe", "Coffee Shop", "Dessert Shops", "Buffet", "Food Truck", "Other"], key="restaurant_type")
+            with col2:
+                food_types = st.multiselect("Cuisine Type:", ["Italian", "Mexican", "Chinese", "Indian", "Japanese", "Korean", "American", "Mediterranean", "Vegan", "Fusion", "Other"], key="food_types")
+            with col3:
+                startup_costs = st.selectbox("Startup Costs:", ["<$10,000", "$10,000-$50,000", "$50,000-$100,000", "$100,000+"], key="startup_costs")
+
+            square_footage = st.slider("Desired Square Footage (sq²):", min_value=100, max_value=10000, step=100, key="square_footage")
+            match_mode = st.radio("Show plazas that suit:", ["Any selected type", "All selected types"], horizontal=True, key="match_mode")
+
+            submit_button = st.form_submit_button("Submit", key="restaurant_insights_submit")
+
+        if submit_button:
+            with span("insights.filter"):
+                # Match whole restaurant type / cuisine terms using the prebuilt index
+                selected_types = [restaurant_type] + food_types
+                if match_mode == "All selected types":
+                    matches = load_cuisine_index().match(all_of=selected_types)
+                else:
+                    matches = load_cuisine_index().match(any_of=selected_types)
+
+                if not matches.any():
+                    st.write("No matching plazas found. Please adjust your selection criteria.")
+                    get_prefetcher().cancel(st.session_state.session_id)
+                else:
+                    # Only row positions and a few small vectors are kept per session; the listings
+                    # themselves stay in the one shared frame. Fit scores and traffic come from the
+                    # listing <-> corridor join in the ranking engine.
+                    results = search_results(
+                        data, load_ranking_engine(daily_file_version()), load_plaza_map(daily_file_version()),
+                        matches, square_footage, startup_costs, top_k=TOP_PICKS,
+                    )
+                    st.session_state['search_results'] = results
+                    st.session_state['results_page'] = 1
+                    # Start fetching analyses for every listed plaza so picking one is instant.
+                    # A new search replaces the queue and cancels analyses that are no longer listed.
+                    get_prefetcher().prefetch(st.session_state.session_id, results.names(data))
+
+        # Display filtered results in a centered table format
+        results = st.session_state.get('search_results')
+        if results is not None and len(results):
+            ranking = load_ranking_engine(daily_file_version())
+            # Best overall fits on traffic per lease dollar, vacancy, size and budget
+            top_picks = ranking.top_k(results.square_footage, results.budget, k=TOP_PICKS, candidates=results.top_positions)
+            # Other matching plazas close by compete for the same diners
+            top_picks[f'Similar Plazas Within {DENSITY_RADIUS_MILES:g} mi'] = pd.Series(results.top_density, index=results.top_positions)
+            st.write("### Top Picks:")
+            st.dataframe(
+                top_picks.drop(columns=['Business Corridor']),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    'Fit Score': st.column_config.ProgressColumn('Fit Score', min_value=0, max_value=100, format="%.0f"),
+                    'Avg Daily Foot Traffic': st.column_config.NumberColumn(format="%.0f"),
+                },
+            )
+
+            render_results_table(data, results)
+            render_plaza_details(results.names(data))
+            render_comparison(results.names(data))
+
+
+# Each section below is a fragment: its own widgets rerun only that section, not the page.
+# Sorting or paging the results table only redraws the table.
+@st.fragment
+def render_results_table(data, results):
+    st.write("### Potential Locations:")
+    st.markdown(
+        """
+        <style>
+        .wide-table {
+            width: 100%;
+            table-layout: auto;
+            text-align: center;
+            margin: 0 auto;
+            border-collapse: collapse;
+            background-color: #2c2f38;
+            color: white;
+            font-size: 16px;
+        }
+        .wide-table th, .wide-table td {
+            border: 1px solid #444;
+            padding: 10px;
+            vertical-align: middle;
+        }
+        .wide-table th {
+            background-color: #444;
+            font-weight: bold;
+        }
+        .wide-table img {
+            width: 150px;
+            height: auto;
+            display: block;
+            margin: 0 auto;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True
+    )
+
+    ranking = load_ranking_engine(daily_file_version())
+    sort_col, size_col, page_col = st.columns(3)
+    with sort_col:
+        sort_label = st.selectbox("Sort By:", list(SORT_OPTIONS), key="results_sort")
+    with size_col:
+        page_size = st.selectbox("Rows Per Page:", PAGE_SIZES, key="results_page_size")
+    total_pages = page_count(len(results), page_size)
+    if st.session_state.get('results_page', 1) > total_pages:
+        st.session_state['results_page'] = total_pages
+    with page_col:
+        page = st.number_input(f"Page (of {total_pages}):", min_value=1, max_value=total_pages, step=1, key="results_page")
+
+    # Only the visible page is rendered; row HTML is memoised across reruns
+    with span("insights.table"):
+        order = sort_positions(results.sort_columns(data, ranking), sort_label)
+        visible = results.positions[order[(page - 1) * page_size:page * page_size]]
+        st.markdown(render_table(data, visible, results.square_footage, ranking.traffic[visible]), unsafe_allow_html=True)
+
+
+# Market analysis, nearby plazas and foot traffic for one plaza; picking another plaza reruns
+# this section (and the nested ones) but leaves the filters and results table alone
+@st.fragment
+def render_plaza_details(plazas):
+    selected_place = st.selectbox("Learn more about a specific location:", plazas)
+    if not selected_place:
+        return
+    with span("insights.market_analysis"):
+        # Wait briefly for a background request already fetching this plaza rather than sending
+        # another; if it hasn't landed by then, the request below is sent (or served from cache)
+        if get_prefetcher().is_pending(selected_place):
+            with st.spinner(f"Preparing the market analysis for {selected_place}..."):
+                get_prefetcher().wait(selected_place, timeout=DEFAULT_WAIT_SECONDS)
+
+        # Retrieve and display detailed market analysis
+        if st.session_state.get('stream_responses', True):
+            # Picking another place reruns this section, which stops and closes this stream
+            stream_stats = StreamStats()
+            st.write_stream(stream_market_details(selected_place, cache=get_response_cache(), stats=stream_stats))
+            record_stream_stats("Market analysis", stream_stats)
+        else:
+            detailed_insights = get_market_details(selected_place)
+            st.write(detailed_insights)
+
+    render_nearby(selected_place)
+    st.divider()  # Add a horizontal line for separation
+    st.subheader(f"Overall Foot Traffic Insights for {selected_place}")
+
+
+    # Replace general description above the dropdown
+    st.markdown("""
+        <p>Understanding foot traffic is crucial for making informed decisions about your restaurant's location. 
+        Select a metric below to explore detailed foot traffic insights for the selected plaza. These metrics provide 
+        valuable information on daily, weekly, monthly, and yearly visitor trends, helping you tailor your operations, 
+        marketing strategies, and staffing to maximize customer engagement.</p>
+    """, unsafe_allow_html=True)
+
+    render_unusual_days(selected_place)
+    render_traffic_metrics(selected_place)
+    render_history(selected_place)
+
+
+# Several plazas' foot traffic overlaid; changing the selection reruns only this section.
+# All views come from one set of row-range slices per selection (see analytics.comparison_metrics).
+@st.fragment
+def render_comparison(plazas):
+    st.divider()
+    st.subheader("Compare Plazas")
+    compared = st.multiselect(
+        f"Pick up to {MAX_COMPARED} plazas to compare:", plazas, max_selections=MAX_COMPARED, key="compared_plazas"
+    )
+    if len(compared) < 2:
+        st.caption("Pick two or more plazas to overlay their weekly, monthly and yearly foot traffic.")
+        return
+
+    with span("insights.aggregate", view="compare", plazas=len(compared)):
+        comparison = comparison_metrics(load_corridor_index(daily_file_version()), compared)
+    if comparison is None:
+        st.error("No foot traffic data is available for the selected plazas.")
+        return
+    missing = [plaza for plaza in compared if plaza not in set(comparison['summary']['Business Corridor'])]
+    if missing:
+        st.info(f"No foot traffic data for {', '.join(missing)}.")
+
+    st.dataframe(
+        comparison['summary'],
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            'Avg Daily Foot Traffic': st.column_config.NumberColumn(format="%d"),
+            'Total Foot Traffic': st.column_config.NumberColumn(format="%d"),
+        },
+    )
+    views = [
+        ("Per Week", 'by_day', "Average Foot Traffic by Day of the Week", "Day of the Week", "Average Foot Traffic Volume"),
+        ("Per Month", 'by_week', "Average Foot Traffic by Week of a Typical Month", "Week of the Month", "Average Foot Traffic Volume"),
+        ("Per Year", 'by_month', "Monthly Foot Traffic Totals", "Month", "Total Foot Traffic Volume"),
+    ]
+    with span("insights.chart", view="compare"):
+        for tab, (_, name, title, x_title, y_title) in zip(st.tabs([view[0] for view in views]), views):
+            table = comparison[name]
+            fig = px.line(table, x=table.index, y=table.columns, template="plotly_dark", markers=True)
+            fig.update_layout(
+                title={"text": title, "x": 0.5, "xanchor": "center", "yanchor": "top"},
+                title_font_size=20,
+                xaxis_title=x_title,
+                yaxis_title=y_title,
+                legend_title_text="Plaza",
+                font=dict(size=14),
+            )
+            tab.plotly_chart(fig, use_container_width=True)
+
+
+# Recent spikes and drops the streaming detector flagged at one plaza (closures, events, ...)
+def render_unusual_days(selected_place):
+    detector = load_anomaly_detector(daily_file_version())
+    events = detector.corridor_events(selected_place)
+    if events.empty:
+        return
+    latest = events.iloc[0]
+    if latest['Date'] == detector.latest_date(selected_place):
+        direction = "above" if latest['Change'] == "Spike" else "below"
+        st.warning(
+            f"Foot traffic at {selected_place} on {latest['Date']:%B %d, %Y} was {latest['Foot Traffic Volume']:,} people, "
+            f"far {direction} the {latest['Expected']:,} expected for a {latest['Day']}."
+        )
+    with st.expander(f"Unusual days at {selected_place} ({len(events)})"):
+        st.caption("Days far from this plaza's usual traffic for that weekday, which may point to closures, events or construction.")
+        st.dataframe(
+            events[['Date', 'Day', 'Change', 'Foot Traffic Volume', 'Expected', 'Z-Score']],
+            hide_index=True,
+            use_container_width=True,
+            column_config={'Date': st.column_config.DateColumn(format="MMM D, YYYY")},
+        )
+
+
+# Every recorded day (or hour) at one plaza. Zooming reruns only this chart, and each window
+# is served from the finest pre-decimated level that fits in the chart's point budget.
+@st.fragment
+def render_history(selected_place):
+    st.subheader(f"Foot Traffic History for {selected_place}")
+    resolutions = ["Daily", "Hourly"] if hourly_file_version() is not None else ["Daily"]
+    resolution = st.radio("Resolution:", resolutions, horizontal=True, key="history_resolution")
+    if resolution == "Daily":
+        series = load_daily_series(daily_file_version()).get(selected_place)
+    else:
+        series = load_hourly_series(selected_place, hourly_file_version())
+    if series is None or not len(series):
+        st.info(f"No {resolution.lower()} foot traffic history is available for {selected_place}.")
+        return
+
+    start, end = series.start.to_pydatetime(), series.end.to_pydatetime()
+    unit = "day" if resolution == "Daily" else "hour"
+    window = (start, end)
+    if end > start:
+        # Keyed per plaza and resolution, since the range differs between them
+        window = st.slider(
+            "Zoom to:", min_value=start, max_value=end, value=(start, end),
+            step=timedelta(days=1) if unit == "day" else timedelta(hours=1),
+            format="MMM D, YYYY" if unit == "day" else "MMM D, YYYY HH:00",
+            key=f"history_window|{selected_place}|{resolution}",
+        )
+    with span("insights.history", resolution=resolution):
+        times, values, bucket = series.window(*window)
+        unusual_days = load_anomaly_detector(daily_file_version()).corridor_events(selected_place)
+        unusual_days = unusual_days[unusual_days['Date'].between(*window)] if resolution == "Daily" else None
+        fig = history_figure(times, values, selected_place, resolution, unusual_days)
+    st.plotly_chart(fig, use_container_width=True)
+    shown = f"Showing {len(times):,} of {len(series):,} {unit}s"
+    if bucket > 1:
+        shown += f" (the lowest and highest of every {bucket:,} {unit}s); narrow the range to see every {unit}"
+    st.caption(shown + ".")
+
+
+# Other plazas and busy corridors around one plaza; moving the radius slider reruns only this
+@st.fragment
+def render_nearby(selected_place):
+    plaza_map = load_plaza_map(daily_file_version())
+    location = plaza_map.location_of(selected_place)
+    if location is not None:
+        with st.expander(f"Plazas and busy corridors near {selected_place}"):
+            radius = st.slider("Within (miles):", min_value=1, max_value=10, value=3, key="nearby_radius")
+            with span("insights.nearby"):
+                nearby_plazas = plaza_map.plazas_within(*location, radius)
+                nearby_plazas = nearby_plazas[nearby_plazas['Location Name'] != selected_place]
+                busy_corridors = plaza_map.nearest_corridors(*location, k=NEARBY_CORRIDORS + 1)
+                busy_corridors = busy_corridors[busy_corridors['Business Corridor'] != selected_place].head(NEARBY_CORRIDORS)
+            st.write(f"**Other plazas within {radius} miles:**")
+            if nearby_plazas.empty:
+                st.write("None listed.")
+            else:
+                st.dataframe(nearby_plazas, hide_index=True, use_container_width=True)
+            st.write("**Nearest high-traffic corridors:**")
+            st.dataframe(busy_corridors, hide_index=True, use_container_width=True)
+            st.caption("Distances are approximate: plazas are placed at the centre of their ZIP code.")
+
+
+# Foot traffic views for one plaza; switching metric or weekday reruns only these charts,
+# never the market analysis above them
+@st.fragment
+def render_traffic_metrics(selected_place):
+    traffic_option = st.selectbox("Choose Foot Traffic Metric:", TRAFFIC_METRICS)
+
+    # Include the styling for the insights card
+    st.markdown("""
+        <style>
+        .insights-card {
+            background-color: #2c2f38;
+            padding: 15px;
+            border-radius: 10px;
+            margin-top: 15px;
+        }
+        .insights-card h4 {
+            color: #ff4b4b;
+            margin-bottom: 5px;
+        }
+        .insights-card p {
+            margin: 0;
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # Cards built live or pre-rendered (see snapshots.py); the weekday picker of the hourly
+    # chart sits between the header card and the chart
+    header_area = st.container()
+    profile_day = "All Days"
+    if traffic_option == "Average Foot Traffic Per Day":
+        profile_day = st.selectbox("Day of the Week:", PROFILE_DAYS, key="hourly_profile_day")
+    view = traffic_view(traffic_option, selected_place, profile_day)
+
+    if 'error' in view:
+        st.error(view['error'])
+        return
+    header_area.markdown(view['header'], unsafe_allow_html=True)
+    if 'info' in view:
+        st.info(view['info'])
+
+    with span("insights.chart", view=traffic_option):
+        if 'forecast' in view:
+            # The forecast for the coming month and quarter sits next to the yearly chart
+            chart_col, forecast_col = st.columns([3, 1])
+            chart_col.plotly_chart(chart_figure(view['figure']), use_container_width=True)
+            with forecast_col:
+                render_forecast(view['forecast'])
+        else:
+            st.plotly_chart(chart_figure(view['figure']), use_container_width=True)
+
+    st.markdown(view['insights'], unsafe_allow_html=True)
+
+
+# One foot traffic view of a plaza: served from the pre-rendered snapshot of the current data
+# when there is one, otherwise built from the cube of the current data (and hourly profiles /
+# forecasts when needed). Loaded on each call, so a fragment rerun never sees an older cube.
+def traffic_view(metric, corridor, profile_day="All Days"):
+    snapshots = load_snapshot_store(snapshot_version())
+    view = None if snapshots is None else snapshots.view(corridor, view_key(metric, profile_day))
+    increment("footflow_traffic_views_total", source="live" if view is None else "snapshot")
+    if view is not None:
+        return view
+    with span("insights.aggregate", view=metric):
+        # Hourly data is only loaded (and partitioned on first use) when the per-day view is opened
+        hourly_profiles = get_hourly_profiles(hourly_file_version()) if metric == "Average Foot Traffic Per Day" else None
+        forecasts = load_forecasts(daily_file_version()) if metric == "Total Foot Traffic Per Year" else None
+        traffic_cube = load_traffic_cube(daily_file_version())
+        return build_traffic_view(metric, corridor, traffic_cube, hourly_profiles, forecasts, profile_day)
+
+
+def render_forecast(forecast):
+    if 'info' in forecast:
+        st.info(forecast['info'])
+        return
+    st.markdown("#### Forecast")
+    st.caption(f"Projected from {forecast['start']}")
+    for metric in forecast['metrics']:
+        st.metric(metric['label'], metric['value'], delta=metric['delta'])
+        st.caption(metric['caption'])
@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Default location and limits of the shared on-disk response cache
+DEFAULT_CACHE_PATH = os.path.join(".footflow_cache", "llm_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+# Stable hash of a chat prompt so identical prompts share a cache entry
+def prompt_hash(messages):
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Disk-backed LLM response cache shared by every session and process on the server.
+# Entries are keyed by plaza name + prompt hash + model, expire after `ttl_seconds`
+# and the least recently used entries are evicted once the cache grows past `max_bytes`.
+class ResponseCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl_seconds=DEFAULT_TTL_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    plaza TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_plaza ON responses (plaza)")
+
+    @staticmethod
+    def make_key(plaza, messages, model):
+        return f"{plaza}|{model}|{prompt_hash(messages)}"
+
+    # Return the cached response, or None if it is missing or expired
+    def get(self, plaza, messages, model):
+        key = self.make_key(plaza, messages, model)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created = row
+            if now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return response
+
+    # Store a response and evict least recently used entries if over the size limit
+    def put(self, plaza, messages, model, response):
+        key = self.make_key(plaza, messages, model)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, plaza, model, prompt_hash(messages), response, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    # Drop cached entries for the given plazas (or every entry); returns the number removed
+    def invalidate(self, plazas=None):
+        with self._lock, self._conn:
+            if not plazas:
+                return self._conn.execute("DELETE FROM responses").rowcount
+            return self._conn.executemany("DELETE FROM responses WHERE plaza = ?", [(p,) for p in plazas]).rowcount
+
+    # Remove every expired entry; returns the number removed
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses WHERE created < ?", (cutoff,)).rowcount
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            plazas = [row[0] for row in self._conn.execute("SELECT DISTINCT plaza FROM responses ORDER BY plaza")]
+        return {"entries": entries, "bytes": total, "max_bytes": self.max_bytes, "ttl_seconds": self.ttl_seconds, "plazas": plazas}
+
+
+# Admin command line: inspect, invalidate or pre-warm the shared response cache
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the Foot Flow LLM response cache.")
+    parser.add_argument("--path", default=DEFAULT_CACHE_PATH, help="Cache database file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Show cache size and cached plazas")
+    invalidate = commands.add_parser("invalidate", help="Drop cached analyses")
+    invalidate.add_argument("plazas", nargs="*", help="Plazas to drop (default: everything)")
+    commands.add_parser("purge-expired", help="Drop entries older than the TTL")
+    warm = commands.add_parser("warm", help="Fetch and cache market analyses ahead of time")
+    warm.add_argument("plazas", nargs="*", help="Plazas to warm (default: every plaza in the dataset)")
+    warm.add_argument("--data", default="sanjosedataset.csv", help="Plaza dataset used when no plazas are given")
+    args = parser.parse_args(argv)
+
+    cache = ResponseCache(path=args.path)
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "invalidate":
+        print(f"Removed {cache.invalidate(args.plazas)} cached entries")
+    elif args.command == "purge-expired":
+        print(f"Removed {cache.purge_expired()} expired entries")
+    elif args.command == "warm":
+        import pandas as pd
+        from marketAnalysis import get_market_details
+
+        plazas = args.plazas or list(pd.read_csv(args.data)["Location Name"].dropna().unique())
+        for plaza in plazas:
+            started = time.perf_counter()
+            get_market_details(plaza, cache=cache)
+            print(f"{plaza}: {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
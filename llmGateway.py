@@ -0,0 +1,240 @@
+import hashlib
+import json
+import random
+import threading
+import time
+
+import openai
+import requests
+from requests.adapters import HTTPAdapter
+
+from telemetry import increment, record_completion, record_llm_call
+
+# Requests allowed to talk to the API at the same time, across every session
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Seconds to wait for the API to answer (and, when streaming, between chunks) before giving up.
+# Without it a stuck request would hold a concurrency slot for openai's 600 s default.
+DEFAULT_REQUEST_TIMEOUT = 30.0
+
+# Retries of a request failing with a transient error, and the backoff bounds in seconds
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 20.0
+
+# Errors worth retrying: rate limits and transient server / network failures
+RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.ServiceUnavailableError,
+    openai.error.APIConnectionError,
+    openai.error.Timeout,
+)
+
+
+# Identity of a request: identical requests in flight at the same time are sent only once.
+# Streamed and non-streamed requests never share a flight, as they hand back different results.
+def request_key(messages, model, max_tokens, stream=False):
+    payload = json.dumps([messages, model, max_tokens, stream], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# One HTTP session with a connection pool shared by every thread
+def pooled_session(pool_size=DEFAULT_MAX_CONCURRENCY):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Raised to waiting requests when the stream they joined was stopped before it finished
+class FlightAbandoned(Exception):
+    pass
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# Process-wide front door for chat completions.
+# Identical requests already in flight are coalesced (singleflight): only the first is sent,
+# the others wait for its result. At most `max_concurrency` requests reach the API at once,
+# transient errors (timeouts included) are retried with exponential backoff and full jitter
+# (honouring Retry-After), and requests go through one pooled HTTP session.
+class LLMGateway:
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES,
+                 base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY, session=None, sleep=time.sleep,
+                 request_timeout=DEFAULT_REQUEST_TIMEOUT):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.request_timeout = request_timeout
+        self.session = session if session is not None else pooled_session(max_concurrency)
+        # openai 0.28 sends every request through `requestssession` when it is a Session.
+        # It is set once, and only if nothing else in the process has configured one.
+        if openai.requestssession is None:
+            openai.requestssession = self.session
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._flights = {}   # request key -> _Flight
+
+    # Seconds to wait before retry number `attempt` (0-based)
+    def backoff_delay(self, attempt, error=None):
+        headers = getattr(error, "headers", None) or {}
+        retry_after = headers.get("retry-after") or headers.get("Retry-After")
+        try:
+            if retry_after is not None:
+                return min(self.max_delay, float(retry_after))
+        except ValueError:
+            pass
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _with_retries(self, kind, model, call):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return call()
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    increment("footflow_llm_errors_total", kind=kind, model=model)
+                    raise
+                increment("footflow_llm_retries_total", kind=kind, model=model, error=type(e).__name__)
+                self._sleep(self.backoff_delay(attempt, e))
+            except Exception:
+                increment("footflow_llm_errors_total", kind=kind, model=model)
+                raise
+
+    def _create(self, **params):
+        return openai.ChatCompletion.create(request_timeout=self.request_timeout, **params)
+
+    # Join the in-flight request for `key`; returns (flight, True) when this caller must send it
+    def _join(self, key):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _land(self, key, flight, result=None, error=None):
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.result, flight.error = result, error
+        flight.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
+
+    # Non-streamed completion; returns the API response
+    def complete(self, messages, model, max_tokens, kind="chat"):
+        key = request_key(messages, model, max_tokens)
+        flight, leader = self._join(key)
+        if not leader:
+            increment("footflow_llm_coalesced_total", kind=kind, model=model)
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            with self._slots:
+                started = time.perf_counter()
+                response = self._with_retries(kind, model, lambda: self._create(
+                    model=model, messages=messages, max_tokens=max_tokens
+                ))
+            record_completion(kind, model, response, time.perf_counter() - started)
+        except Exception as e:
+            self._land(key, flight, error=e)
+            raise
+        self._land(key, flight, result=response)
+        return response
+
+    # Streamed completion, yielding text deltas. `stats` is a llmStream.StreamStats.
+    # A caller joining an identical stream already running receives its full text in one piece
+    # when it finishes. Setting `cancel_event` stops the stream and closes the connection.
+    def stream(self, messages, model, max_tokens, stats, kind="chat", cancel_event=None):
+        key = request_key(messages, model, max_tokens, stream=True)
+        flight, leader = self._join(key)
+        if stats.started is None:
+            stats.started = time.perf_counter()
+        if not leader:
+            increment("footflow_llm_coalesced_total", kind=kind, model=model)
+            while not flight.done.wait(0.1):
+                if cancel_event is not None and cancel_event.is_set():
+                    stats.cancelled = True
+                    stats.finished_at = time.perf_counter()
+                    return
+            if isinstance(flight.error, FlightAbandoned):
+                # The stream we joined was stopped; send our own request instead
+                yield from self.stream(messages, model, max_tokens, stats, kind, cancel_event)
+                return
+            if flight.error is not None:
+                raise flight.error
+            stats.first_token_at = stats.finished_at = time.perf_counter()
+            stats.chunks = 1
+            yield flight.result
+            return
+
+        parts = []
+        error = None
+        self._slots.acquire()
+        try:
+            response = self._with_retries(kind, model, lambda: self._create(
+                model=model, messages=messages, max_tokens=max_tokens, stream=True
+            ))
+            try:
+                for chunk in response:
+                    if cancel_event is not None and cancel_event.is_set():
+                        stats.cancelled = True
+                        break
+                    choices = chunk.get('choices') or [{}]
+                    text = (choices[0].get('delta') or {}).get('content')
+                    if not text:
+                        continue
+                    if stats.first_token_at is None:
+                        stats.first_token_at = time.perf_counter()
+                    stats.chunks += 1
+                    parts.append(text)
+                    yield text
+            finally:
+                close = getattr(response, 'close', None)
+                if close is not None:
+                    close()
+        except GeneratorExit:
+            # The consumer stopped reading (e.g. Streamlit interrupted the rerun)
+            stats.cancelled = True
+            raise
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._slots.release()
+            stats.finished_at = time.perf_counter()
+            if stats.cancelled:
+                self._land(key, flight, error=FlightAbandoned())
+            else:
+                self._land(key, flight, result="".join(parts), error=error)
+            if error is None:
+                # Streamed responses carry no usage block; each content delta is one token
+                record_llm_call(
+                    kind, model, cache_hit=False, latency=stats.total_latency,
+                    time_to_first_token=stats.time_to_first_token, completion_tokens=stats.chunks,
+                    streamed=True, cancelled=stats.cancelled,
+                )
+
+
+_default_gateway = None
+_default_lock = threading.Lock()
+
+
+# The shared gateway used by the app, the prefetcher and the chatbot
+def default_gateway():
+    global _default_gateway
+    with _default_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway()
+        return _default_gateway
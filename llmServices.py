@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import openai
+import streamlit as st
+
+from marketAnalysis import get_market_details as fetch_market_details, request_market_details
+from llmCache import ResponseCache
+from prefetch import AnalysisPrefetcher, DEFAULT_PREFETCH_WORKERS
+
+# Set OpenAI API key
+openai.api_key = st.secrets["OPENAI_API_KEY"]
+
+# Shared on-disk cache of LLM responses, reused across sessions and restarts
+@st.cache_resource
+def get_response_cache():
+    return ResponseCache()
+
+# Process-wide pool that fetches analyses for every filtered plaza in the background
+@st.cache_resource
+def get_prefetcher(max_workers=DEFAULT_PREFETCH_WORKERS):
+    cache = get_response_cache()
+    return AnalysisPrefetcher(lambda plaza: request_market_details(plaza, cache=cache), max_workers=max_workers)
+
+# Small process-wide pool that writes chatbot conversation summaries off the request path
+@st.cache_resource
+def get_summary_executor(max_workers=2):
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat-summary")
+
+# Function to get detailed market information using OpenAI (served from cache when possible)
+def get_market_details(center_name):
+    return fetch_market_details(center_name, cache=get_response_cache())
+
+# Show and remember the latency of a streamed response
+def record_stream_stats(label, stats):
+    if stats.started is None:
+        return  # Served from cache, nothing was streamed
+    st.session_state.setdefault('llm_latency', []).append({'label': label, **stats.as_dict()})
+    if stats.time_to_first_token is not None:
+        st.caption(f"First words after {stats.time_to_first_token:.2f}s · full response in {stats.total_latency:.2f}s")
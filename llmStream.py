@@ -0,0 +1,39 @@
+from llmGateway import default_gateway
+
+
+# Latency of one streamed completion: time to first token is tracked separately from the total
+class StreamStats:
+    def __init__(self):
+        self.started = None
+        self.first_token_at = None
+        self.finished_at = None
+        self.chunks = 0
+        self.cancelled = False
+
+    @property
+    def time_to_first_token(self):
+        if self.started is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started
+
+    @property
+    def total_latency(self):
+        if self.started is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started
+
+    def as_dict(self):
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "total_latency": self.total_latency,
+            "chunks": self.chunks,
+            "cancelled": self.cancelled,
+        }
+
+
+# Stream a chat completion through the shared LLM gateway, yielding text deltas as they arrive.
+# Setting `cancel_event` (a threading.Event) stops the stream and closes the connection.
+# `kind` labels the request in the telemetry metrics (e.g. "chatbot", "market_analysis").
+def stream_chat_completion(messages, model, max_tokens, stats=None, cancel_event=None, kind="chat"):
+    stats = stats if stats is not None else StreamStats()
+    yield from default_gateway().stream(messages, model, max_tokens, stats, kind=kind, cancel_event=cancel_event)
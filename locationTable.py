@@ -0,0 +1,79 @@
+import html
+import math
+from functools import lru_cache
+
+import numpy as np
+
+TABLE_HEADER = (
+    "<table class='wide-table'><tr><th>Image</th><th>Center Name</th><th>Address</th><th>Price Range</th>"
+    "<th>Monthly Lease Cost</th><th>Yearly Lease Cost</th><th>Avg Daily Foot Traffic</th><th>Vacancy Status</th></tr>"
+)
+
+# Sort choices for the results table: label -> (column, ascending); None keeps the match order
+SORT_OPTIONS = {
+    "Best Match": None,
+    "Overall Fit: Best First": ('Fit Score', False),
+    "Monthly Lease: Low to High": ('Monthly Lease Cost', True),
+    "Monthly Lease: High to Low": ('Monthly Lease Cost', False),
+    "Foot Traffic: High to Low": ('Avg Daily Foot Traffic', False),
+    "Foot Traffic: Low to High": ('Avg Daily Foot Traffic', True),
+}
+
+PAGE_SIZES = [10, 25, 50]
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "nan"
+    return html.escape(str(value))
+
+
+# HTML for one table row, memoised per plaza and square footage (plus the listing fields it shows),
+# so reruns, re-sorts and page changes reuse fragments instead of formatting every row again
+@lru_cache(maxsize=8192)
+def row_html(plaza, square_footage, image_url, address, price_range, lease_rate, vacancy_status, avg_daily_traffic):
+    monthly_cost = lease_rate * square_footage
+    traffic = "n/a" if avg_daily_traffic is None or math.isnan(avg_daily_traffic) else f"{avg_daily_traffic:,.0f}"
+    return (
+        f"<tr><td><img src='{_text(image_url)}' loading='lazy' decoding='async' /></td>"
+        f"<td>{_text(plaza)}</td><td>{_text(address)}</td><td>{_text(price_range)}</td>"
+        f"<td>${monthly_cost:,.2f}</td><td>${monthly_cost * 12:,.2f}</td>"
+        f"<td>{traffic}</td><td>{_text(vacancy_status)}</td></tr>"
+    )
+
+
+# Row positions of `results` in display order for a SORT_OPTIONS label (missing values last)
+def sort_positions(results, sort_label):
+    option = SORT_OPTIONS.get(sort_label)
+    if option is None or option[0] not in results.columns:
+        return np.arange(len(results))
+    column, ascending = option
+    values = results[column].to_numpy(dtype=float)
+    keys = values if ascending else -values
+    # NaN sorts last in either direction
+    return np.argsort(np.where(np.isnan(keys), np.inf, keys), kind='stable')
+
+
+def page_count(total_rows, page_size):
+    return max(1, math.ceil(total_rows / page_size))
+
+
+# Build the table HTML for the listings at `positions` only (rows of the shared listings frame);
+# `traffic` holds each of those rows' average daily foot traffic
+def render_table(listings, positions, square_footage, traffic=None):
+    rows = listings.take(positions)
+    traffic = [None] * len(rows) if traffic is None else np.asarray(traffic, dtype=float).tolist()
+    fragments = [
+        row_html(*fields)
+        for fields in zip(
+            rows['Location Name'].tolist(),
+            [square_footage] * len(rows),
+            rows['Image URL'].tolist(),
+            rows['Address'].tolist(),
+            rows['Price Range'].astype(object).tolist(),
+            rows['Average Lease Rate ($/sq ft)'].tolist(),
+            rows['Vacancy Status'].astype(object).tolist(),
+            traffic,
+        )
+    ]
+    return TABLE_HEADER + "".join(fragments) + "</table>"
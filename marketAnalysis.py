@@ -0,0 +1,85 @@
+from llmGateway import default_gateway
+from llmStream import StreamStats, stream_chat_completion
+from telemetry import record_llm_call
+
+# Model and token limit used for the plaza market analysis
+MARKET_MODEL = "gpt-3.5-turbo"
+MARKET_MAX_TOKENS = 4096
+
+# Label of market analysis requests in the telemetry metrics
+MARKET_KIND = "market_analysis"
+
+
+# Build the chat prompt asking for a market analysis of one plaza
+def build_market_messages(center_name):
+    return [
+        {"role": "system", "content": "You are a market analyst specializing in providing detailed insights for restaurant owners in San Jose, California."},
+        {"role": "user", "content": f"""
+        Provide a comprehensive analysis of the market for the plaza called '{center_name}' in San Jose, specifically for someone looking to open a restaurant. Include the following details:
+        
+        - **Pros and Cons**: List the main advantages and disadvantages of this location as it pertains to opening a restaurant, considering both high-level and detailed points.
+        
+        - **Accessibility Issues**: Describe the accessibility of the location, including parking availability, public transit options, walkability, and any accessibility challenges or benefits that might affect customer flow.
+        
+        - **Demographics**: Provide an overview of the local population, including average income, family size, age distribution, and relevant lifestyle preferences. Explain why these demographics would or would not be favorable for different types of restaurants (e.g., casual, fine dining, fast food, or niche cuisines).
+        
+        - **Foot Traffic Trends**: Describe the foot traffic patterns around this plaza, highlighting peak hours, busy days, and seasonal variations. Include specific tips for capturing foot traffic based on these trends, such as recommended hours of operation or menu specials.
+        
+        - **Local Competition**: Identify the existing restaurant types and notable competitors in the area. Highlight any gaps in the market or opportunities for new restaurant types. Provide insights into how a new restaurant could differentiate itself in this competitive environment.
+        
+        - **Atmosphere and Customer Expectations**: Describe the general atmosphere of the plaza and the type of dining experiences people expect when visiting this location. Indicate whether this plaza attracts families, professionals, students, tourists, etc., and how a restaurant could tailor its vibe and decor to align with these expectations.
+        
+        - **Special Advice for Beginners**: Include additional insights for first-time restaurant owners, such as startup tips, common pitfalls in this area, and advice on building a customer base. Recommend initial marketing strategies to attract attention and build loyalty.
+        
+        - **Advanced Insights for Experienced Owners**: For seasoned restaurateurs, suggest ways to maximize revenue, streamline operations, and use advanced marketing techniques. Include advice on leveraging digital tools (e.g., delivery platforms, social media) and optimizing operational efficiency based on the plaza's characteristics.
+        
+        Aim to provide practical, actionable insights that would be valuable to both a beginner and an experienced restaurant owner.
+        """}
+    ]
+
+
+# Request the market analysis for one plaza, raising on API errors.
+# Successful analyses are stored in `cache` (a llmCache.ResponseCache) when given.
+def request_market_details(center_name, cache=None):
+    messages = build_market_messages(center_name)
+    if cache is not None:
+        cached = cache.get(center_name, messages, MARKET_MODEL)
+        if cached is not None:
+            record_llm_call(MARKET_KIND, MARKET_MODEL, cache_hit=True)
+            return cached
+    response = default_gateway().complete(messages, MARKET_MODEL, MARKET_MAX_TOKENS, kind=MARKET_KIND)
+    details = response['choices'][0]['message']['content'].strip()
+    if cache is not None:
+        cache.put(center_name, messages, MARKET_MODEL, details)
+    return details
+
+
+# Function to get detailed market information using OpenAI
+def get_market_details(center_name, cache=None):
+    try:
+        return request_market_details(center_name, cache=cache)
+    except Exception as e:
+        return f"An error occurred: {str(e)}"
+
+
+# Streaming variant of get_market_details: yields the analysis as it is generated.
+# A cached analysis is yielded in one piece; a fully streamed one is added to the cache.
+def stream_market_details(center_name, cache=None, stats=None, cancel_event=None):
+    messages = build_market_messages(center_name)
+    if cache is not None:
+        cached = cache.get(center_name, messages, MARKET_MODEL)
+        if cached is not None:
+            record_llm_call(MARKET_KIND, MARKET_MODEL, cache_hit=True, streamed=True)
+            yield cached
+            return
+    stats = stats if stats is not None else StreamStats()
+    parts = []
+    try:
+        for text in stream_chat_completion(messages, MARKET_MODEL, MARKET_MAX_TOKENS, stats=stats, cancel_event=cancel_event, kind=MARKET_KIND):
+            parts.append(text)
+            yield text
+    except Exception as e:
+        yield f"An error occurred: {str(e)}"
+        return
+    if cache is not None and parts and not stats.cancelled:
+        cache.put(center_name, messages, MARKET_MODEL, "".join(parts).strip())
@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from sessionMemory import SESSION_IDLE_SECONDS
+
+# Default number of analyses fetched at the same time
+DEFAULT_PREFETCH_WORKERS = 4
+
+# Seconds a page waits on a background analysis before sending its own request
+DEFAULT_WAIT_SECONDS = 5.0
+
+
+# Process-wide background prefetcher for plaza market analyses.
+# `fetch(plaza)` does the request and stores the result in the shared response cache;
+# the prefetcher bounds how many run at once, lets callers wait on an in-flight request
+# instead of issuing a duplicate, and cancels queued work nobody wants any more.
+# Owners that haven't asked for anything in `idle_seconds` (closed sessions) are forgotten.
+class AnalysisPrefetcher:
+    def __init__(self, fetch, max_workers=DEFAULT_PREFETCH_WORKERS, idle_seconds=SESSION_IDLE_SECONDS):
+        self._fetch = fetch
+        self.idle_seconds = idle_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-prefetch")
+        self._lock = threading.Lock()
+        self._pending = {}   # plaza -> Future
+        self._wanted = {}    # owner (e.g. session id) -> plazas it asked for
+        self._last_seen = {}   # owner -> time of its latest prefetch
+
+    # Queue every plaza for `owner`, replacing (and cancelling) what it asked for before
+    def prefetch(self, owner, plazas):
+        plazas = list(dict.fromkeys(plazas))
+        now = time.monotonic()
+        with self._lock:
+            unwanted = self._wanted.get(owner, set()) - set(plazas)
+            self._wanted[owner] = set(plazas)
+            self._last_seen[owner] = now
+            # Drop owners gone idle, with whatever only they were still waiting for
+            for stale in [o for o, seen in self._last_seen.items() if now - seen > self.idle_seconds]:
+                unwanted |= self._wanted.pop(stale, set())
+                del self._last_seen[stale]
+            self._cancel_unwanted(unwanted)
+            for plaza in plazas:
+                if plaza not in self._pending:
+                    self._pending[plaza] = self._executor.submit(self._run, plaza)
+
+    # Cancel everything `owner` queued that no other owner still wants
+    def cancel(self, owner):
+        with self._lock:
+            self._last_seen.pop(owner, None)
+            self._cancel_unwanted(self._wanted.pop(owner, set()))
+
+    def _cancel_unwanted(self, plazas):
+        still_wanted = set().union(*self._wanted.values())
+        for plaza in plazas - still_wanted:
+            future = self._pending.get(plaza)
+            # Requests already running can't be stopped; their result still lands in the cache
+            if future is not None and future.cancel():
+                del self._pending[plaza]
+
+    def _run(self, plaza):
+        try:
+            return self._fetch(plaza)
+        finally:
+            with self._lock:
+                self._pending.pop(plaza, None)
+
+    def is_pending(self, plaza):
+        with self._lock:
+            return plaza in self._pending
+
+    # Wait up to `timeout` seconds for an in-flight prefetch of `plaza`. Returns None when none
+    # is running, it was cancelled, it failed or it is still running, so the caller can fall
+    # back to its own request.
+    def wait(self, plaza, timeout=DEFAULT_WAIT_SECONDS):
+        with self._lock:
+            future = self._pending.get(plaza)
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except (CancelledError, FutureTimeoutError):
+            return None
+        except Exception:
+            # Let the caller's own request surface the error
+            return None
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self):
+        with self._lock:
+            self._wanted.clear()
+            self._last_seen.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
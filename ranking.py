@@ -0,0 +1,153 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Ranks plaza listings (sanjosedataset.csv) against a search in one vectorised pass.
+# Listings are joined to their foot traffic corridor once, and every listing's static
+# attributes are kept as arrays, so a query is a handful of array operations plus a top-k.
+
+# Words dropped when matching listing names to corridor names
+GENERIC_NAME_WORDS = {"the", "shopping", "center", "centre", "mall"}
+
+# Startup budget choices on the insights page -> most that budget allows in $ (None: no ceiling)
+BUDGET_CEILINGS = {"<$10,000": 10_000, "$10,000-$50,000": 50_000, "$50,000-$100,000": 100_000, "$100,000+": None}
+
+# Months of rent a new lease takes up front (first month plus deposit), paid out of the startup budget
+UPFRONT_LEASE_MONTHS = 3
+
+# Relative weight of each criterion in the overall fit score
+DEFAULT_WEIGHTS = {
+    'traffic_per_dollar': 0.4,
+    'vacancy': 0.2,
+    'size_fit': 0.2,
+    'budget_fit': 0.2,
+}
+
+
+# Lowercase, "&" -> "and", punctuation and generic words removed: "The Plant Shopping Center" -> "plant"
+def normalise_name(name):
+    words = re.sub(r"[^a-z0-9]+", " ", str(name).lower().replace("&", " and ")).split()
+    kept = [word for word in words if word not in GENERIC_NAME_WORDS]
+    return " ".join(kept or words)
+
+
+# Position in `corridor_names` of the corridor for each listing name (-1 when there is none).
+# Exact matches win; otherwise a listing joins the only corridor whose words all appear in its
+# name (or the other way round), so "Westgate Center" finds "Westgate".
+def corridor_join_index(listing_names, corridor_names):
+    corridor_keys = [normalise_name(name) for name in corridor_names]
+    exact = {key: position for position, key in enumerate(corridor_keys)}
+    corridor_words = [set(key.split()) for key in corridor_keys]
+    by_word = {}
+    for position, words in enumerate(corridor_words):
+        for word in words:
+            by_word.setdefault(word, set()).add(position)
+
+    join = np.full(len(listing_names), -1, dtype=np.int64)
+    for row, name in enumerate(listing_names):
+        key = normalise_name(name)
+        if key in exact:
+            join[row] = exact[key]
+            continue
+        words = set(key.split())
+        nearby = set().union(*(by_word.get(word, ()) for word in words))
+        candidates = [position for position in nearby if corridor_words[position] <= words or words <= corridor_words[position]]
+        if len(candidates) == 1:
+            join[row] = candidates[0]
+    return join
+
+
+# Open units from vacancy text: "2 vacant spots open" -> 1.0 (capped at 2), "Coming Soon!" -> 0.5
+def vacancy_scores(vacancy_status):
+    text = pd.Series(vacancy_status, dtype=object).astype(str).str.lower()
+    open_spots = pd.to_numeric(text.str.extract(r"(\d+)\s+vacant", expand=False), errors='coerce')
+    scores = (open_spots / 2).clip(upper=1).fillna(0.0)
+    scores[text.str.contains("coming soon")] = 0.5
+    return scores.to_numpy(dtype=float)
+
+
+# Percentile rank in [0, 1] of each finite value; missing values score 0
+def percentile_scores(values):
+    values = np.asarray(values, dtype=float)
+    scores = np.zeros(len(values))
+    finite = np.isfinite(values)
+    if finite.sum() > 1:
+        ranks = values[finite].argsort().argsort()
+        scores[finite] = ranks / (finite.sum() - 1)
+    elif finite.any():
+        scores[finite] = 1.0
+    return scores
+
+
+def _weighted_total(criteria, weights=None):
+    weights = weights or DEFAULT_WEIGHTS
+    total = sum(weight * criteria[name] for name, weight in weights.items())
+    return 100 * total / sum(weights.values())
+
+
+class RankingEngine:
+    # `listings` is the plaza dataset; `corridor_traffic` maps corridor name -> average daily foot traffic
+    def __init__(self, listings, corridor_traffic):
+        self.names = listings['Location Name'].to_numpy(dtype=object)
+        self.lease_rate = listings['Average Lease Rate ($/sq ft)'].to_numpy(dtype=float)
+        self.store_size = listings['Average Store Size (sq ft)'].to_numpy(dtype=float)
+        self.vacancy = vacancy_scores(listings['Vacancy Status'])
+
+        corridors = pd.Series(corridor_traffic, dtype=float)
+        self.join = corridor_join_index(self.names, corridors.index)
+        matched = self.join >= 0
+        self.corridor = np.where(matched, corridors.index.to_numpy(dtype=object)[np.maximum(self.join, 0)], None)
+        self.traffic = np.where(matched, corridors.to_numpy()[np.maximum(self.join, 0)], np.nan)
+        # The desired square footage scales every lease alike, so this ranking is query independent
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.traffic_per_rate = self.traffic / self.lease_rate
+        self.traffic_per_dollar_score = percentile_scores(self.traffic_per_rate)
+
+    def __len__(self):
+        return len(self.names)
+
+    # Criterion scores in [0, 1] for every listing, one array per criterion
+    def criterion_scores(self, square_footage, budget):
+        size_fit = np.exp(-np.abs(np.log(self.store_size / square_footage)))
+        # The up-front rent for the desired space against the budget: full marks when it fits,
+        # falling with the share of it the budget can't cover
+        ceiling = BUDGET_CEILINGS.get(budget)
+        if ceiling is None:
+            budget_fit = np.ones(len(self))
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                budget_fit = np.clip(ceiling / (self.lease_rate * square_footage * UPFRONT_LEASE_MONTHS), 0, 1)
+        return {
+            'traffic_per_dollar': self.traffic_per_dollar_score,
+            'vacancy': self.vacancy,
+            'size_fit': np.nan_to_num(size_fit),
+            'budget_fit': np.nan_to_num(budget_fit, nan=0.5),
+        }
+
+    # Overall fit score (0-100) of every listing
+    def score(self, square_footage, budget, weights=None):
+        return _weighted_total(self.criterion_scores(square_footage, budget), weights)
+
+    # The `k` best listings among `candidates` (a boolean mask or row positions; default all)
+    def top_k(self, square_footage, budget, k=10, candidates=None, weights=None):
+        criteria = self.criterion_scores(square_footage, budget)
+        scores = _weighted_total(criteria, weights)
+        positions = np.arange(len(self)) if candidates is None else np.asarray(candidates)
+        if positions.dtype == bool:
+            positions = np.flatnonzero(positions)
+        if len(positions) > k:
+            positions = positions[np.argpartition(-scores[positions], k - 1)[:k]]
+        positions = positions[np.argsort(-scores[positions], kind='stable')]
+
+        monthly_lease = self.lease_rate[positions] * square_footage
+        return pd.DataFrame({
+            'Location Name': self.names[positions],
+            'Business Corridor': self.corridor[positions],
+            'Fit Score': scores[positions].round(1),
+            'Avg Daily Foot Traffic': self.traffic[positions],
+            'Daily Visitors per $1k Rent': (self.traffic[positions] / monthly_lease * 1000).round(1),
+            'Vacancy Score': criteria['vacancy'][positions].round(2),
+            'Size Fit': criteria['size_fit'][positions].round(2),
+            'Budget Fit': criteria['budget_fit'][positions].round(2),
+        }, index=pd.Index(positions, name='row'))
@@ -0,0 +1,195 @@
+import argparse
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+from chatbotPrompt import estimate_tokens
+from trafficCube import MONTH_NAMES, corridor_daily_average
+
+# Local retrieval of facts from our own data for the chatbot.
+# Every plaza row and every corridor's traffic summary is written out as one short fact,
+# the facts are indexed with TF-IDF (an inverted index of term weights), and a question
+# only pulls in the best matching facts that fit in a fixed token budget.
+
+# Most facts added to one prompt, and the token budget they must fit in
+TOP_FACTS = 8
+CONTEXT_TOKEN_BUDGET = 500
+
+# Facts scoring below this cosine similarity are not worth their tokens
+MIN_SCORE = 0.1
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how", "i",
+    "in", "is", "it", "me", "my", "of", "on", "or", "should", "the", "to", "what", "which", "with",
+    "would", "you", "your", "we", "our", "this", "that", "there", "where", "who", "will",
+}
+
+# Question words standing for the words our facts use
+QUERY_SYNONYMS = {
+    "weekend": ["saturday", "sunday"],
+    "weekday": ["monday", "tuesday", "wednesday", "thursday", "friday"],
+    "rent": ["lease"],
+    "cost": ["lease"],
+    "vacancy": ["vacant"],
+    "available": ["vacant"],
+    "crowded": ["busiest"],
+    "busy": ["busiest"],
+    "visitor": ["traffic"],
+}
+
+
+# Lowercase words without stop words, plurals folded: "Saturdays" -> "saturday"
+def tokenize(text):
+    words = re.findall(r"[a-z0-9]+", str(text).lower())
+    return [word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+            for word in words if word not in STOP_WORDS]
+
+
+def query_terms(question):
+    terms = tokenize(question)
+    return terms + [synonym for term in terms for synonym in QUERY_SYNONYMS.get(term, ())]
+
+
+# One fact per plaza listing, joined to its corridor's average daily traffic when known
+def plaza_facts(listings, corridor_traffic=None, corridors=None):
+    facts = []
+    for row, plaza in enumerate(listings.to_dict('records')):
+        fact = (
+            f"{plaza['Location Name']} ({plaza['Address']}): suits {plaza['Cuisine Compatibility']}; "
+            f"stores average {plaza['Average Store Size (sq ft)']:,.0f} sq ft at "
+            f"${plaza['Average Lease Rate ($/sq ft)']:.2f}/sq ft; {plaza['Vacancy Status']}"
+        )
+        fact += f"; price range {plaza['Price Range']}." if pd.notna(plaza['Price Range']) else "."
+        corridor = corridors[row] if corridors is not None else None
+        if corridor is not None and corridor_traffic is not None:
+            fact += f" Its corridor, {corridor}, averages {corridor_traffic[corridor]:,.0f} visitors a day."
+        facts.append(fact)
+    return facts
+
+
+# One fact per corridor: average traffic, busiest and quietest weekday and month, forecast
+def corridor_facts(cube, forecasts=None):
+    average = corridor_daily_average(cube)
+    days = cube['Day of Week']['mean'].unstack()
+    months = cube['Month']['mean'].unstack()
+    summary = forecasts['summary'] if forecasts is not None else None
+
+    facts = []
+    for corridor, visitors in average.items():
+        fact = f"{corridor} foot traffic averages {visitors:,.0f} visitors a day"
+        if corridor in days.index and days.loc[corridor].notna().any():
+            by_day = days.loc[corridor].dropna()
+            fact += f", busiest on {by_day.idxmax()}s ({by_day.max():,.0f}) and quietest on {by_day.idxmin()}s ({by_day.min():,.0f})"
+        if corridor in months.index and months.loc[corridor].notna().any():
+            by_month = months.loc[corridor].dropna()
+            fact += f"; busiest month {MONTH_NAMES[int(by_month.idxmax())]}, quietest {MONTH_NAMES[int(by_month.idxmin())]}"
+        if summary is not None and corridor in summary.index:
+            row = summary.loc[corridor]
+            fact += f"; about {row['next_30_days']:,.0f} visitors forecast over the next 30 days"
+            if row['last_30_days'] > 0:
+                fact += f" ({row['next_30_days'] / row['last_30_days'] - 1:+.0%} vs the last 30)"
+        facts.append(fact + ".")
+
+    ranked = average.sort_values(ascending=False)
+    facts.append(
+        "Busiest San Jose corridors by average daily foot traffic: "
+        + ", ".join(f"{name} ({visitors:,.0f})" for name, visitors in ranked.head(5).items())
+        + "; quietest: "
+        + ", ".join(f"{name} ({visitors:,.0f})" for name, visitors in ranked.tail(3).items()) + "."
+    )
+    return facts
+
+
+# TF-IDF index over a list of facts
+class FactIndex:
+    def __init__(self, facts):
+        self.facts = list(facts)
+        self.tokens = np.array([estimate_tokens(fact) for fact in self.facts])
+        counts = [pd.Series(tokenize(fact), dtype=object).value_counts() for fact in self.facts]
+
+        self.vocabulary = {}
+        doc_ids, term_ids, tf = [], [], []
+        for doc, terms in enumerate(counts):
+            for term, count in terms.items():
+                doc_ids.append(doc)
+                term_ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                tf.append(1 + math.log(count))
+        doc_ids, term_ids, tf = np.array(doc_ids, dtype=np.int64), np.array(term_ids, dtype=np.int64), np.array(tf)
+
+        document_frequency = np.bincount(term_ids, minlength=len(self.vocabulary))
+        self.idf = np.log((1 + len(self.facts)) / (1 + document_frequency)) + 1
+        weights = tf * self.idf[term_ids]
+        norms = np.sqrt(np.bincount(doc_ids, weights=weights ** 2, minlength=len(self.facts)))
+        weights /= norms[doc_ids]
+
+        # Postings grouped by term: the documents containing term t are postings[starts[t]:starts[t + 1]]
+        order = np.argsort(term_ids, kind='stable')
+        self.posting_docs, self.posting_weights = doc_ids[order], weights[order]
+        self.starts = np.concatenate([[0], np.cumsum(document_frequency)])
+
+    def __len__(self):
+        return len(self.facts)
+
+    # Cosine similarity of every fact to `query`
+    def scores(self, query):
+        terms = pd.Series([self.vocabulary[t] for t in query_terms(query) if t in self.vocabulary], dtype=np.int64)
+        scores = np.zeros(len(self.facts))
+        if terms.empty:
+            return scores
+        query_weights = terms.value_counts()
+        query_weights = (1 + np.log(query_weights)) * self.idf[query_weights.index]
+        query_weights /= np.sqrt((query_weights ** 2).sum())
+        for term, weight in query_weights.items():
+            start, end = self.starts[term], self.starts[term + 1]
+            scores[self.posting_docs[start:end]] += weight * self.posting_weights[start:end]
+        return scores
+
+    # The best matching facts for `query`, best first, within `token_budget` estimated tokens
+    def context(self, query, k=TOP_FACTS, token_budget=CONTEXT_TOKEN_BUDGET):
+        scores = self.scores(query)
+        candidates = np.flatnonzero(scores >= MIN_SCORE)
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        chosen, used = [], 0
+        for doc in candidates:
+            if used + self.tokens[doc] > token_budget:
+                continue
+            chosen.append(self.facts[doc])
+            used += self.tokens[doc]
+            if len(chosen) == k:
+                break
+        return chosen
+
+
+# Index of every plaza and corridor fact (rows of `listings` line up with `ranking`)
+def build_fact_index(listings, cube, forecasts=None, ranking=None):
+    corridor_traffic = corridor_daily_average(cube)
+    corridors = ranking.corridor if ranking is not None else None
+    return FactIndex(plaza_facts(listings, corridor_traffic, corridors) + corridor_facts(cube, forecasts))
+
+
+# Show which facts a question would pull in: python retrieval.py "Which mall is busiest on weekends?"
+def main(argv=None):
+    from dailyTraffic import DAILY_FILE, load_daily_cube
+    from ingest import LOCATION_SCHEMA, read_typed_csv
+    from ranking import RankingEngine
+
+    parser = argparse.ArgumentParser(description="Print the facts retrieved for a chatbot question.")
+    parser.add_argument("question")
+    parser.add_argument("--listings", default="sanjosedataset.csv")
+    parser.add_argument("--daily", default=DAILY_FILE)
+    parser.add_argument("--budget", type=int, default=CONTEXT_TOKEN_BUDGET, help="Token budget of the facts")
+    args = parser.parse_args(argv)
+
+    listings = read_typed_csv(args.listings, LOCATION_SCHEMA)
+    cube = load_daily_cube(args.daily)
+    index = build_fact_index(listings, cube, ranking=RankingEngine(listings, corridor_daily_average(cube)))
+    facts = index.context(args.question, token_budget=args.budget)
+    for fact in facts:
+        print(f"- {fact}")
+    print(f"{len(facts)} of {len(index)} facts, ~{sum(estimate_tokens(fact) for fact in facts)} tokens")
+
+
+if __name__ == "__main__":
+    main()
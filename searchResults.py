@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+
+# One session's search results as row positions into the shared listings frame, plus the few
+# small vectors derived for them. Sessions keep this instead of a filtered copy of the data;
+# the rows themselves are only materialised for the table page being shown.
+class SearchResults:
+    __slots__ = ('positions', 'fit_score', 'top_positions', 'top_density', 'square_footage', 'budget')
+
+    def __init__(self, positions, fit_score, top_positions, top_density, square_footage, budget):
+        self.positions = positions
+        self.fit_score = fit_score
+        self.top_positions = top_positions
+        self.top_density = top_density
+        self.square_footage = square_footage
+        self.budget = budget
+
+    def __len__(self):
+        return len(self.positions)
+
+    # Bytes held by this session's results
+    @property
+    def nbytes(self):
+        return self.positions.nbytes + self.fit_score.nbytes + self.top_positions.nbytes + self.top_density.nbytes
+
+    def names(self, listings):
+        return listings['Location Name'].to_numpy(dtype=object)[self.positions]
+
+    # The columns the table can be sorted on, one row per result (built per rerun, not stored)
+    def sort_columns(self, listings, ranking):
+        return pd.DataFrame({
+            'Fit Score': self.fit_score,
+            'Monthly Lease Cost': ranking.lease_rate[self.positions] * self.square_footage,
+            'Avg Daily Foot Traffic': ranking.traffic[self.positions],
+        })
+
+
+# Results for the listings flagged in `matches`: one row per plaza name (its first listing),
+# scored with the ranking engine, plus the top `top_k` picks and their competitor density
+def search_results(listings, ranking, plaza_map, matches, square_footage, budget, top_k):
+    positions = np.flatnonzero(matches)
+    _, first = np.unique(listings['Location Name'].to_numpy(dtype=object)[positions].astype(str), return_index=True)
+    positions = positions[np.sort(first)]
+
+    top_positions = ranking.top_k(square_footage, budget, k=top_k, candidates=matches).index.to_numpy()
+    density = plaza_map.competitor_density(matches)[top_positions]
+    return SearchResults(
+        positions=positions.astype(np.int32),
+        fit_score=ranking.score(square_footage, budget)[positions].round(1).astype(np.float32),
+        top_positions=top_positions.astype(np.int32),
+        top_density=density.astype(np.int32),
+        square_footage=square_footage,
+        budget=budget,
+    )
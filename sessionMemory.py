@@ -0,0 +1,74 @@
+import sys
+import threading
+import time
+
+from telemetry import telemetry
+
+# Sessions not seen for this long are dropped from the accounting
+SESSION_IDLE_SECONDS = 30 * 60
+
+# How deep containers in session state are walked when measuring them
+MAX_DEPTH = 4
+
+
+# Approximate bytes held by one session state value. Arrays and frames report their buffers,
+# objects may report `nbytes` or `footprint()`; no data libraries are imported here.
+def value_bytes(value, depth=0):
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(value, 'memory_usage', None)
+    if callable(memory_usage) and hasattr(value, 'columns'):
+        return int(memory_usage(deep=True).sum())
+    footprint = getattr(value, 'footprint', None)
+    if callable(footprint):
+        return int(footprint())
+    if depth < MAX_DEPTH:
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(value_bytes(k, depth + 1) + value_bytes(v, depth + 1) for k, v in value.items())
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return sys.getsizeof(value) + sum(value_bytes(item, depth + 1) for item in value)
+    return sys.getsizeof(value)
+
+
+# Bytes per session state key, largest first
+def state_bytes(state):
+    sizes = {str(key): value_bytes(value) for key, value in state.items()}
+    return dict(sorted(sizes.items(), key=lambda item: -item[1]))
+
+
+# Process-wide view of how much memory session state holds: every session's latest total,
+# exported as gauges so growth with concurrency shows up in the metrics
+class SessionMemory:
+    def __init__(self, idle_seconds=SESSION_IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._sessions = {}   # session id -> (bytes, last seen)
+
+    # Measure one session's state after a rerun; returns its bytes per key
+    def record(self, session_id, state):
+        sizes = state_bytes(state)
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (sum(sizes.values()), now)
+            for stale in [s for s, (_, seen) in self._sessions.items() if now - seen > self.idle_seconds]:
+                del self._sessions[stale]
+        totals = self.totals()
+        telemetry.set_gauge("footflow_sessions_active", totals['sessions'])
+        telemetry.set_gauge("footflow_session_state_bytes", totals['total_bytes'], stat="total")
+        telemetry.set_gauge("footflow_session_state_bytes", totals['max_bytes'], stat="max")
+        return sizes
+
+    def totals(self):
+        with self._lock:
+            sizes = [size for size, _ in self._sessions.values()]
+        return {
+            'sessions': len(sizes),
+            'total_bytes': sum(sizes),
+            'max_bytes': max(sizes, default=0),
+            'mean_bytes': sum(sizes) / len(sizes) if sizes else 0,
+        }
+
+
+# Shared instance used by the app
+session_memory = SessionMemory()
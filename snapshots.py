@@ -0,0 +1,194 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from dailyTraffic import DAILY_FILE, load_daily_cube
+from forecast import forecast_traffic
+from hourlyTraffic import HOURLY_FILE, hourly_data_available, load_hourly_profiles, partition_name
+from ingest import DAILY_SCHEMA, HOURLY_SCHEMA, read_typed_csv, source_fingerprint
+from trafficViews import PROFILE_DAYS, TRAFFIC_METRICS, all_view_keys, build_traffic_view, serialise_view, view_key
+
+# Pre-rendered foot traffic views: every corridor x metric (x weekday, for the hourly chart)
+# built ahead of time into a directory per data version, so the app can serve the figure JSON
+# and insight cards as they are. Rebuild after the daily ingestion: python snapshots.py
+
+# Bump when the layout of stored views changes, so old snapshots are ignored
+SNAPSHOT_FORMAT = 2
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(".footflow_cache", "snapshots")
+
+# Snapshot versions kept on disk (the current one and the one before it)
+KEEP_VERSIONS = 2
+
+# Corridor files held in memory by the app at once
+CORRIDOR_CACHE_SIZE = 256
+
+MANIFEST_FILE = "manifest.json"
+
+
+# Version of the data a snapshot is built from. Changes whenever the daily or hourly
+# file does, so a stale snapshot is never served.
+def snapshot_version(daily_file=DAILY_FILE, hourly_file=HOURLY_FILE):
+    sources = [SNAPSHOT_FORMAT, source_fingerprint(daily_file, DAILY_SCHEMA)]
+    if hourly_data_available(hourly_file):
+        sources.append(source_fingerprint(hourly_file, HOURLY_SCHEMA))
+    return hashlib.sha1(json.dumps(sources, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+# File holding one corridor's views, named like its hourly partition
+def corridor_file(corridor):
+    return f"{partition_name(corridor)}.json"
+
+
+# Every view of one corridor, serialised
+def render_corridor(corridor, cube, hourly_profiles=None, forecasts=None):
+    views = {}
+    for metric in TRAFFIC_METRICS:
+        days = PROFILE_DAYS if metric == TRAFFIC_METRICS[0] else ["All Days"]
+        for day in days:
+            view = build_traffic_view(metric, corridor, cube, hourly_profiles, forecasts, profile_day=day)
+            views[view_key(metric, day)] = serialise_view(view)
+    return views
+
+
+# Data shared by every corridor a worker renders, sent once per worker process
+_worker_data = {}
+
+
+def _init_worker(cube, hourly_profiles, forecasts):
+    _worker_data.update(cube=cube, hourly_profiles=hourly_profiles, forecasts=forecasts)
+
+
+# Worker: render a batch of corridors straight into the build directory
+def render_batch(corridors, build_dir):
+    written = {}
+    for corridor in corridors:
+        views = render_corridor(corridor, _worker_data['cube'], _worker_data['hourly_profiles'], _worker_data['forecasts'])
+        name = corridor_file(corridor)
+        with open(os.path.join(build_dir, name), 'w') as f:
+            json.dump(views, f, separators=(',', ':'))
+        written[corridor] = name
+    return written
+
+
+# Render every corridor's views with `workers` processes into <store_dir>/<version>/
+# and return the manifest. The directory is swapped into place once complete.
+def build_snapshots(daily_file=DAILY_FILE, hourly_file=HOURLY_FILE, store_dir=DEFAULT_SNAPSHOT_DIR, workers=None, batches_per_worker=4):
+    workers = workers or os.cpu_count() or 1
+    version = snapshot_version(daily_file, hourly_file)
+    cube = load_daily_cube(daily_file)
+    hourly_profiles = load_hourly_profiles(hourly_file)
+    forecasts = forecast_traffic(read_typed_csv(daily_file, DAILY_SCHEMA))
+
+    corridors = sorted(str(c) for c in cube['Year'].index.get_level_values('Business Corridor').unique())
+    batch_count = max(1, min(len(corridors), workers * batches_per_worker))
+    batches = [corridors[i::batch_count] for i in range(batch_count)]
+
+    os.makedirs(store_dir, exist_ok=True)
+    build_dir = os.path.join(store_dir, f".building-{version}-{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.makedirs(build_dir)
+
+    if workers == 1:
+        _init_worker(cube, hourly_profiles, forecasts)
+        results = [render_batch(batch, build_dir) for batch in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cube, hourly_profiles, forecasts)) as pool:
+            results = list(pool.map(render_batch, batches, [build_dir] * len(batches)))
+
+    manifest = {
+        'version': version,
+        'format': SNAPSHOT_FORMAT,
+        'built_at': time.time(),
+        'views': all_view_keys(),
+        'corridors': {corridor: name for written in results for corridor, name in sorted(written.items())},
+    }
+    with open(os.path.join(build_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    target = os.path.join(store_dir, version)
+    stale_dir = f"{target}.stale-{os.getpid()}-{threading.get_ident()}"
+    if os.path.exists(target):
+        os.replace(target, stale_dir)
+    os.replace(build_dir, target)
+    shutil.rmtree(stale_dir, ignore_errors=True)
+    _prune_versions(store_dir)
+    return manifest
+
+
+def _prune_versions(store_dir, keep=KEEP_VERSIONS):
+    built = [
+        os.path.join(store_dir, name) for name in os.listdir(store_dir)
+        if not name.startswith('.') and os.path.exists(os.path.join(store_dir, name, MANIFEST_FILE))
+    ]
+    for path in sorted(built, key=lambda p: os.path.getmtime(os.path.join(p, MANIFEST_FILE)), reverse=True)[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# Read-only access to one built snapshot. Corridor files are read on first use and the most
+# recently used ones kept in memory, shared by every session.
+class SnapshotStore:
+    def __init__(self, path, manifest, cache_size=CORRIDOR_CACHE_SIZE):
+        self.path = path
+        self.version = manifest['version']
+        self.files = manifest['corridors']
+        self.view_keys = set(manifest['views'])
+        self._corridor_views = lru_cache(maxsize=cache_size)(self._read_corridor)
+
+    def __contains__(self, corridor):
+        return corridor in self.files
+
+    def __len__(self):
+        return len(self.files)
+
+    def _read_corridor(self, corridor):
+        with open(os.path.join(self.path, self.files[corridor])) as f:
+            return json.load(f)
+
+    # The stored view, or None when this corridor or view wasn't pre-rendered
+    def view(self, corridor, key):
+        if corridor not in self.files or key not in self.view_keys:
+            return None
+        try:
+            return self._corridor_views(corridor).get(key)
+        except (OSError, ValueError):
+            return None
+
+
+# The snapshot built for `version`, or None if there isn't one
+def open_snapshot_store(version, store_dir=DEFAULT_SNAPSHOT_DIR):
+    path = os.path.join(store_dir, version)
+    try:
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format') != SNAPSHOT_FORMAT or manifest.get('version') != version:
+        return None
+    return SnapshotStore(path, manifest)
+
+
+# Build entry point, run after the daily ingestion: python snapshots.py
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render every corridor's foot traffic views for the app to serve.")
+    parser.add_argument("--daily", default=DAILY_FILE, help="Daily foot traffic CSV")
+    parser.add_argument("--hourly", default=HOURLY_FILE, help="Hourly foot traffic CSV (optional)")
+    parser.add_argument("--store", default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    manifest = build_snapshots(args.daily, args.hourly, args.store, workers=args.workers)
+    views = len(manifest['corridors']) * len(manifest['views'])
+    print(f"Rendered {views:,} views for {len(manifest['corridors'])} corridors into {os.path.join(args.store, manifest['version'])} "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
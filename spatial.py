@@ -0,0 +1,188 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# Offline geocoding and spatial lookups for plazas and corridors.
+# Addresses are placed at their ZIP code's centroid from the bundled zip_centroids.csv, so
+# every plaza in one ZIP shares a point. Points go into a uniform grid (cells of
+# DEFAULT_CELL_MILES), and a query only measures the points in the cells around it.
+
+ZIP_CENTROIDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zip_centroids.csv")
+
+DEFAULT_CELL_MILES = 1.0
+
+# Radius used for the precomputed competitor density
+DENSITY_RADIUS_MILES = 1.0
+
+# Corridors at or above this traffic quantile count as high traffic
+HIGH_TRAFFIC_QUANTILE = 0.5
+
+MILES_PER_DEGREE_LAT = 69.0
+
+
+def load_zip_centroids(file_path=ZIP_CENTROIDS_FILE):
+    centroids = pd.read_csv(file_path, dtype={'ZIP': str})
+    return centroids.set_index('ZIP')[['Latitude', 'Longitude']]
+
+
+# Five-digit ZIP at the end of each address ("..., San Jose, CA 95128" -> "95128"), NaN if none
+def extract_zip(addresses):
+    return pd.Series(addresses, dtype=object).astype(str).str.extract(r"(\d{5})(?:-\d{4})?\s*$", expand=False)
+
+
+# Latitude and longitude arrays for each address (NaN when its ZIP isn't in the table)
+def geocode(addresses, centroids):
+    points = centroids.reindex(extract_zip(addresses))
+    return points['Latitude'].to_numpy(dtype=float), points['Longitude'].to_numpy(dtype=float)
+
+
+# Uniform grid over points projected to miles around their mean position
+class GridIndex:
+    def __init__(self, lat, lon, cell_miles=DEFAULT_CELL_MILES):
+        lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        valid = np.isfinite(lat) & np.isfinite(lon)
+        self.size = len(lat)
+        self.cell_miles = cell_miles
+        self.origin = (float(lat[valid].mean()), float(lon[valid].mean())) if valid.any() else (0.0, 0.0)
+        self.lon_miles = MILES_PER_DEGREE_LAT * math.cos(math.radians(self.origin[0]))
+        self.x, self.y = self.project(lat, lon)
+
+        positions = np.flatnonzero(valid)
+        cx, cy = self._cell(self.x[positions]), self._cell(self.y[positions])
+        self.cx_min, self.cy_min = (int(cx.min()), int(cy.min())) if len(positions) else (0, 0)
+        self.cx_max, self.cy_max = (int(cx.max()), int(cy.max())) if len(positions) else (-1, -1)
+        keys = self._key(cx, cy)
+        order = np.argsort(keys, kind='stable')
+        self.positions = positions[order]
+        self.cell_keys, self.cell_starts = np.unique(keys[order], return_index=True)
+        self.cell_ends = np.append(self.cell_starts[1:], len(order))
+
+    def project(self, lat, lon):
+        lat, lon = np.asarray(lat, dtype=float), np.asarray(lon, dtype=float)
+        return (lon - self.origin[1]) * self.lon_miles, (lat - self.origin[0]) * MILES_PER_DEGREE_LAT
+
+    def _cell(self, coordinate):
+        return np.floor(coordinate / self.cell_miles).astype(np.int64)
+
+    def _key(self, cx, cy):
+        return (cx - self.cx_min) * (self.cy_max - self.cy_min + 1) + (cy - self.cy_min)
+
+    # Positions of every point in the cells overlapping the square of half-width `miles` around (x, y)
+    def _candidates(self, x, y, miles):
+        cx0, cx1 = max(int(self._cell(x - miles)), self.cx_min), min(int(self._cell(x + miles)), self.cx_max)
+        cy0, cy1 = max(int(self._cell(y - miles)), self.cy_min), min(int(self._cell(y + miles)), self.cy_max)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.empty(0, dtype=np.int64)
+        cx, cy = np.meshgrid(np.arange(cx0, cx1 + 1), np.arange(cy0, cy1 + 1), indexing='ij')
+        keys = self._key(cx.ravel(), cy.ravel())
+        found = np.searchsorted(self.cell_keys, keys)
+        found = found[(found < len(self.cell_keys)) & (self.cell_keys[np.minimum(found, len(self.cell_keys) - 1)] == keys)]
+        if not len(found):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.positions[s:e] for s, e in zip(self.cell_starts[found], self.cell_ends[found])])
+
+    def _distances(self, x, y, positions):
+        return np.hypot(self.x[positions] - x, self.y[positions] - y)
+
+    # Positions within `miles` of (lat, lon) and their distances, nearest first
+    def within(self, lat, lon, miles):
+        x, y = self.project(lat, lon)
+        positions = self._candidates(float(x), float(y), miles)
+        distances = self._distances(x, y, positions)
+        keep = distances <= miles
+        order = np.argsort(distances[keep], kind='stable')
+        return positions[keep][order], distances[keep][order]
+
+    # The `k` nearest positions (optionally only where `where` is True) and their distances
+    def nearest(self, lat, lon, k, where=None):
+        x, y = self.project(lat, lon)
+        radius = self.cell_miles
+        # A square this wide around the query covers every cell, even from outside the grid
+        cx, cy = int(self._cell(float(x))), int(self._cell(float(y)))
+        reach = self.cell_miles * (2 + max(abs(cx - self.cx_min), abs(cx - self.cx_max), abs(cy - self.cy_min), abs(cy - self.cy_max)))
+        while True:
+            positions = self._candidates(float(x), float(y), radius)
+            if where is not None:
+                positions = positions[where[positions]]
+            distances = self._distances(x, y, positions)
+            # Points in the searched square are only guaranteed complete up to `radius`
+            if (len(positions) >= k and np.sort(distances)[k - 1] <= radius) or radius >= reach:
+                order = np.argsort(distances, kind='stable')[:k]
+                return positions[order], distances[order]
+            radius *= 2
+
+    # Neighbour lists (CSR: indptr, indices) of every point within `miles` of it, itself excluded.
+    # Computed one grid cell at a time, so each cell measures only its surrounding cells.
+    def neighbours(self, miles):
+        rows, cols = [], []
+        for start, end in zip(self.cell_starts, self.cell_ends):
+            members = self.positions[start:end]
+            x, y = self.x[members[0]], self.y[members[0]]
+            # Every member's square lies inside this one, widened by one cell
+            candidates = self._candidates(x, y, miles + self.cell_miles)
+            near = np.hypot(self.x[members][:, None] - self.x[candidates], self.y[members][:, None] - self.y[candidates]) <= miles
+            near &= members[:, None] != candidates[None, :]
+            member_rows, candidate_cols = np.nonzero(near)
+            rows.append(members[member_rows])
+            cols.append(candidates[candidate_cols])
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        order = np.argsort(rows, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=self.size))])
+        return indptr, cols[order]
+
+
+# Number of neighbours flagged in `mask` for every point, from CSR neighbour lists
+def neighbour_counts(indptr, indices, mask):
+    flagged = np.concatenate([[0], np.cumsum(np.asarray(mask, dtype=np.int64)[indices])])
+    return flagged[indptr[1:]] - flagged[indptr[:-1]]
+
+
+# Geocoded plazas and corridors with their spatial indexes and precomputed competitor density
+class PlazaMap:
+    # `corridors` has one row per corridor with 'Business Corridor' and 'Address';
+    # `corridor_traffic` maps corridor name -> average daily foot traffic
+    def __init__(self, listings, corridors, corridor_traffic, centroids=None):
+        centroids = load_zip_centroids() if centroids is None else centroids
+        self.names = listings['Location Name'].to_numpy(dtype=object)
+        self.lat, self.lon = geocode(listings['Address'], centroids)
+        self.plazas = GridIndex(self.lat, self.lon)
+        self.plaza_rows = {name: row for row, name in enumerate(self.names)}
+
+        self.corridor_names = corridors['Business Corridor'].astype(str).to_numpy(dtype=object)
+        corridor_lat, corridor_lon = geocode(corridors['Address'], centroids)
+        self.corridors = GridIndex(corridor_lat, corridor_lon)
+        self.corridor_traffic = pd.Series(corridor_traffic, dtype=float).reindex(self.corridor_names).to_numpy()
+
+        # Plazas within DENSITY_RADIUS_MILES of each other
+        self.density_indptr, self.density_indices = self.plazas.neighbours(DENSITY_RADIUS_MILES)
+        self.listing_density = np.diff(self.density_indptr)
+
+    # (lat, lon) of a listed plaza, or None if it couldn't be placed
+    def location_of(self, plaza):
+        row = self.plaza_rows.get(plaza)
+        if row is None or not np.isfinite(self.lat[row]):
+            return None
+        return self.lat[row], self.lon[row]
+
+    # Nearby plazas accepting the same restaurant types: `mask` flags the competing listings
+    def competitor_density(self, mask):
+        return neighbour_counts(self.density_indptr, self.density_indices, mask)
+
+    def plazas_within(self, lat, lon, miles):
+        positions, distances = self.plazas.within(lat, lon, miles)
+        return pd.DataFrame({'Location Name': self.names[positions], 'Distance (mi)': distances.round(1)}, index=positions)
+
+    # The `k` nearest corridors whose traffic is at least `min_traffic` (default: the median corridor)
+    def nearest_corridors(self, lat, lon, k=3, min_traffic=None):
+        traffic = np.nan_to_num(self.corridor_traffic, nan=-np.inf)
+        if min_traffic is None:
+            min_traffic = np.nanquantile(self.corridor_traffic, HIGH_TRAFFIC_QUANTILE)
+        positions, distances = self.corridors.nearest(lat, lon, k, where=traffic >= min_traffic)
+        return pd.DataFrame({
+            'Business Corridor': self.corridor_names[positions],
+            'Avg Daily Foot Traffic': self.corridor_traffic[positions].round(),
+            'Distance (mi)': distances.round(1),
+        }, index=positions)
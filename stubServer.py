@@ -0,0 +1,140 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Canned reply used when no --reply is given
+DEFAULT_REPLY = (
+    "**Pros and Cons**: Steady weekday lunch crowds and good visibility, but parking fills up on weekends. "
+    "**Foot Traffic Trends**: Traffic peaks around midday and again in the early evening."
+)
+
+
+# Local stand-in for the OpenAI chat completions endpoint so the app can run and be tested offline.
+# Point the app at it with OPENAI_API_BASE=http://127.0.0.1:<port>/v1
+class StubCompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    reply = DEFAULT_REPLY
+    first_token_delay = 0.2
+    token_delay = 0.02
+    # Answer every Nth request with 429 Too Many Requests (0 = never), to exercise client retries
+    rate_limit_every = 0
+    retry_after = 0.1
+    # Requests received, shared by every connection; see request_count()
+    counter = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with self.counter["lock"]:
+            self.counter["requests"] += 1
+            number = self.counter["requests"]
+        if self.rate_limit_every and number % self.rate_limit_every == 0:
+            self._rate_limited()
+            return
+        model = request.get("model", "stub")
+        if request.get("stream"):
+            self._stream(model)
+        else:
+            self._complete(model)
+
+    def _rate_limited(self):
+        body = json.dumps({"error": {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}}).encode("utf-8")
+        self.send_response(429)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Retry-After", str(self.retry_after))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _complete(self, model):
+        time.sleep(self.first_token_delay + self.token_delay * len(self.reply.split()))
+        body = json.dumps({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.reply}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(self.reply.split()), "total_tokens": len(self.reply.split())},
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, model):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        time.sleep(self.first_token_delay)
+        words = self.reply.split(" ")
+        try:
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word}, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(self.token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the stream
+            pass
+        self.close_connection = True
+
+
+def make_stub_handler(reply=DEFAULT_REPLY, first_token_delay=0.2, token_delay=0.02, rate_limit_every=0):
+    return type("ConfiguredStubHandler", (StubCompletionHandler,), {
+        "reply": reply,
+        "first_token_delay": first_token_delay,
+        "token_delay": token_delay,
+        "rate_limit_every": rate_limit_every,
+        "counter": {"lock": threading.Lock(), "requests": 0},
+    })
+
+
+# Start the stub server on a background thread; returns the server (call .shutdown() to stop it)
+def start_stub_server(host="127.0.0.1", port=0, reply=DEFAULT_REPLY, first_token_delay=0.2, token_delay=0.02, rate_limit_every=0):
+    server = ThreadingHTTPServer((host, port), make_stub_handler(reply, first_token_delay, token_delay, rate_limit_every))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Requests a stub server has received so far (rate limited ones included)
+def request_count(server):
+    return server.RequestHandlerClass.counter["requests"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fake OpenAI chat completions for offline testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.02)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429")
+    args = parser.parse_args(argv)
+
+    handler = make_stub_handler(args.reply, args.first_token_delay, args.token_delay, args.rate_limit_every)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Stub completion server on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
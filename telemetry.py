@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Where the JSON-lines event log and Prometheus text file are written.
+# Set FOOTFLOW_TELEMETRY=0 to keep measurements in memory only.
+METRICS_DIR = os.environ.get("FOOTFLOW_METRICS_DIR", os.path.join(".footflow_cache", "metrics"))
+EXPORT_ENABLED = os.environ.get("FOOTFLOW_TELEMETRY", "1") != "0"
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent samples kept per histogram for percentiles in the debug panel
+RECENT_SAMPLES = 1000
+
+# Minimum seconds between rewrites of the Prometheus text file
+PROMETHEUS_INTERVAL = 5.0
+
+
+# Cumulative bucket counts plus a window of recent samples for p50/p95
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+    def quantile(self, q):
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = [(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+# Process-wide timing spans, counters and LLM call metrics
+class Telemetry:
+    def __init__(self, metrics_dir=METRICS_DIR, export_enabled=EXPORT_ENABLED):
+        self.metrics_dir = metrics_dir
+        self.export_enabled = export_enabled
+        self._lock = threading.Lock()
+        self._histograms = {}   # (metric, label key) -> Histogram
+        self._counters = {}     # (metric, label key) -> float
+        self._gauges = {}       # (metric, label key) -> float
+        self._local = threading.local()
+        self._events = None
+        self._last_prometheus_write = 0.0
+
+    def observe(self, metric, seconds, **labels):
+        key = (metric, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, metric, value=1, **labels):
+        key = (metric, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, metric, value, **labels):
+        with self._lock:
+            self._gauges[(metric, _label_key(labels))] = value
+
+    # Time a block of code; nested spans on the same thread are all recorded
+    @contextmanager
+    def span(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.observe("footflow_span_seconds", elapsed, span=name, **labels)
+            spans = getattr(self._local, "spans", None)
+            if spans is not None:
+                spans.append({"span": name, "seconds": elapsed, **labels})
+            self.log_event("span", span=name, seconds=round(elapsed, 6), **labels)
+
+    # Collect the spans recorded on this thread (e.g. during one Streamlit rerun)
+    @contextmanager
+    def trace(self):
+        previous = getattr(self._local, "spans", None)
+        self._local.spans = []
+        try:
+            yield self._local.spans
+        finally:
+            self._local.spans = previous
+
+    # One LLM request: latency, token usage and whether it was served from the cache
+    def record_llm_call(self, kind, model, cache_hit, latency=None, time_to_first_token=None,
+                        prompt_tokens=None, completion_tokens=None, streamed=False, cancelled=False):
+        self.increment("footflow_llm_requests_total", kind=kind, model=model, cache="hit" if cache_hit else "miss")
+        if latency is not None:
+            self.observe("footflow_llm_latency_seconds", latency, kind=kind, model=model, streamed=streamed)
+        if time_to_first_token is not None:
+            self.observe("footflow_llm_time_to_first_token_seconds", time_to_first_token, kind=kind, model=model)
+        if prompt_tokens:
+            self.increment("footflow_llm_tokens_total", prompt_tokens, kind=kind, model=model, type="prompt")
+        if completion_tokens:
+            self.increment("footflow_llm_tokens_total", completion_tokens, kind=kind, model=model, type="completion")
+        if cancelled:
+            self.increment("footflow_llm_cancelled_total", kind=kind, model=model)
+        self.log_event(
+            "llm", kind=kind, model=model, cache_hit=cache_hit, latency=latency,
+            time_to_first_token=time_to_first_token, prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens, streamed=streamed, cancelled=cancelled,
+        )
+
+    # A non-streamed completion, with token counts taken from the response's usage block
+    def record_completion(self, kind, model, response, latency):
+        usage = response.get('usage') or {}
+        self.record_llm_call(
+            kind, model, cache_hit=False, latency=latency,
+            prompt_tokens=usage.get('prompt_tokens'), completion_tokens=usage.get('completion_tokens'),
+        )
+
+    # Append one JSON line to the event log
+    def log_event(self, event, **fields):
+        if not self.export_enabled:
+            return
+        record = json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str)
+        with self._lock:
+            try:
+                if self._events is None:
+                    os.makedirs(self.metrics_dir, exist_ok=True)
+                    self._events = open(os.path.join(self.metrics_dir, "events.jsonl"), "a", buffering=1)
+                self._events.write(record + "\n")
+            except OSError:
+                # Metrics must never break the app
+                self.export_enabled = False
+
+    # Current metrics in the Prometheus text exposition format
+    def prometheus_text(self):
+        with self._lock:
+            histograms = {k: (h.count, h.total, list(h.buckets)) for k, h in self._histograms.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        lines = []
+        for kind, values in (("counter", counters), ("gauge", gauges)):
+            for metric in sorted({m for m, _ in values}):
+                lines.append(f"# TYPE {metric} {kind}")
+                for (name, key), value in sorted(values.items()):
+                    if name == metric:
+                        lines.append(f"{metric}{_format_labels(key)} {value}")
+        for metric in sorted({m for m, _ in histograms}):
+            lines.append(f"# TYPE {metric} histogram")
+            for (name, key), (count, total, buckets) in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                for bound, bucket_count in zip(BUCKETS, buckets):
+                    lines.append(f"{metric}_bucket{_format_labels(key, [('le', str(bound))])} {bucket_count}")
+                lines.append(f"{metric}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {total}")
+                lines.append(f"{metric}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    # Rewrite metrics.prom (at most every PROMETHEUS_INTERVAL seconds unless forced)
+    def write_prometheus(self, force=False):
+        if not self.export_enabled:
+            return
+        now = time.time()
+        if not force and now - self._last_prometheus_write < PROMETHEUS_INTERVAL:
+            return
+        self._last_prometheus_write = now
+        path = os.path.join(self.metrics_dir, "metrics.prom")
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            with open(path + ".tmp", "w") as f:
+                f.write(self.prometheus_text())
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+
+    # Rows of count / mean / p50 / p95 per histogram, and of counter and gauge values, for the debug panel
+    def summary(self):
+        with self._lock:
+            rows = []
+            for (metric, key), histogram in sorted(self._histograms.items()):
+                rows.append({
+                    "metric": metric,
+                    "labels": ", ".join(f"{k}={v}" for k, v in key),
+                    "count": histogram.count,
+                    "mean_ms": 1000 * histogram.total / histogram.count,
+                    "p50_ms": 1000 * histogram.quantile(0.5),
+                    "p95_ms": 1000 * histogram.quantile(0.95),
+                })
+            counters = [
+                {"metric": metric, "labels": ", ".join(f"{k}={v}" for k, v in key), "value": value}
+                for (metric, key), value in sorted({**self._counters, **self._gauges}.items())
+            ]
+        return rows, counters
+
+
+# Shared instance used by the app and its modules
+telemetry = Telemetry()
+span = telemetry.span
+increment = telemetry.increment
+record_llm_call = telemetry.record_llm_call
+record_completion = telemetry.record_completion
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pandas as pd
+
+# The app's modules live at the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trafficCube import CUBE_KEYS  # noqa: E402
+
+# Daily foot traffic shipped with the app
+SAMPLE_DAILY_FILE = os.path.join(ROOT, "sj_daily_foottraffic.csv")
+
+
+# Corridors come back categorical from a fresh build and as strings from the stored cube
+def _plain(table):
+    rows = table.reset_index()
+    rows['Business Corridor'] = rows['Business Corridor'].astype(str)
+    return rows
+
+
+def assert_tables_equal(actual, expected):
+    pd.testing.assert_frame_equal(_plain(actual), _plain(expected), check_dtype=False)
+
+
+def assert_cubes_equal(actual, expected):
+    for key in CUBE_KEYS:
+        assert_tables_equal(actual[key], expected[key])
@@ -0,0 +1,17 @@
+import pandas as pd
+
+from analytics import overall_averages
+from conftest import SAMPLE_DAILY_FILE
+from trafficCube import build_traffic_cube
+
+
+def test_overall_averages_do_not_grow_with_the_years_covered():
+    one_year = pd.read_csv(SAMPLE_DAILY_FILE, parse_dates=['Date'])
+    next_year = one_year.assign(Date=one_year['Date'] + pd.DateOffset(years=1))
+    single = overall_averages(build_traffic_cube(one_year))
+    double = overall_averages(build_traffic_cube(pd.concat([one_year, next_year], ignore_index=True)))
+
+    assert double['total'] == 2 * single['total']
+    assert {k: double[k] for k in ('per_day', 'per_week', 'per_month')} == {k: single[k] for k in ('per_day', 'per_week', 'per_month')}
+    days = one_year['Date'].nunique()
+    assert single['per_day'] == round(one_year['Foot Traffic Volume'].sum() / days)
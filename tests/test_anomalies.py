@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomalies import WARMUP_DAYS, AnomalyDetector, detect_anomalies
+
+WEEKLY_PATTERN = np.array([1.0, 1.05, 1.1, 1.1, 1.2, 1.4, 0.8])
+
+
+# A corridor with steady weekly traffic and a little noise; `changes` maps day -> multiplier
+def daily_rows(corridor="Santana Row", days=120, changes=None, seed=0):
+    dates = pd.date_range("2024-01-01", periods=days, freq='D')
+    noise = np.random.default_rng(seed).normal(1.0, 0.02, days)
+    volumes = 3000 * WEEKLY_PATTERN[dates.dayofweek] * noise
+    for day, factor in (changes or {}).items():
+        volumes[day] *= factor
+    return pd.DataFrame({'Business Corridor': corridor, 'Date': dates, 'Foot Traffic Volume': volumes.round().astype(int)})
+
+
+def test_steady_traffic_is_not_flagged():
+    assert detect_anomalies(daily_rows()).events_frame().empty
+
+
+def test_spikes_are_flagged_only_after_warmup():
+    rows = daily_rows(changes={WARMUP_DAYS - 8: 3.0, WARMUP_DAYS + 20: 3.0, WARMUP_DAYS + 40: 0.2})
+    events = detect_anomalies(rows).corridor_events("Santana Row")
+    dates = rows['Date']
+    assert list(events['Date']) == [dates[WARMUP_DAYS + 40], dates[WARMUP_DAYS + 20]]
+    assert list(events['Change']) == ["Drop", "Spike"]
+    assert (events['Z-Score'].abs() >= 3.5).all()
+
+    # The early spike is big enough to flag once a corridor has less warmup to get through
+    early = AnomalyDetector(warmup_days=14)
+    early.update(rows)
+    assert dates[WARMUP_DAYS - 8] in set(early.corridor_events("Santana Row")['Date'])
+
+
+def test_an_unusual_day_does_not_become_the_new_baseline():
+    rows = daily_rows(changes={60: 5.0, 61: 1.0})
+    detector = detect_anomalies(rows)
+    events = detector.corridor_events("Santana Row")
+    assert list(events['Date']) == [rows['Date'][60]]
+    # The expected volume for the spike day was the usual one, not the spike
+    assert abs(events['Expected'][0] / rows['Foot Traffic Volume'][60] - 1 / 5) < 0.05
+
+
+def test_incremental_updates_match_one_pass():
+    rows = pd.concat([
+        daily_rows("Santana Row", changes={50: 3.0, 90: 0.3}),
+        daily_rows("Westgate", changes={70: 2.5}, seed=1),
+    ], ignore_index=True)
+    whole = detect_anomalies(rows)
+
+    stepped = AnomalyDetector()
+    flagged = []
+    for _, day in rows.sort_values('Date').groupby('Date'):
+        flagged.append(stepped.update(day))
+    assert stepped.events == whole.events
+    assert len(pd.concat(flagged)) == len(whole.events_frame())
+    np.testing.assert_allclose(stepped.level[stepped.corridors.get_indexer(whole.corridors)], whole.level)
+
+    # Rows at or before a corridor's latest day are ignored
+    assert stepped.update(rows.iloc[:5]).empty
+    assert stepped.events == whole.events
+
+
+def test_state_round_trips_through_its_dict():
+    detector = detect_anomalies(daily_rows(changes={60: 3.0}))
+    restored = AnomalyDetector.from_dict(detector.to_dict())
+    next_day = pd.DataFrame({'Business Corridor': ["Santana Row"], 'Date': [pd.Timestamp("2024-04-30")], 'Foot Traffic Volume': [9000]})
+    pd.testing.assert_frame_equal(restored.update(next_day), detector.update(next_day))
+    assert restored.latest_date("Santana Row") == pd.Timestamp("2024-04-30")
+    assert restored.latest_date("Unknown") is None
+
+
+@pytest.mark.parametrize("max_events", [1, 3])
+def test_only_the_latest_events_are_kept(max_events):
+    detector = AnomalyDetector(max_events=max_events)
+    detector.update(daily_rows(changes={40: 3.0, 60: 3.0, 80: 3.0, 100: 3.0}))
+    assert len(detector.corridor_events("Santana Row")) == max_events
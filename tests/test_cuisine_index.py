@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from cuisineIndex import CuisineIndex, tokenize
+
+CELLS = [
+    "Fast Food, Mexican",
+    "Casual Dining, Italian, Mexican",
+    "Fine Dining, Japanese",
+    "Cafe,Coffee Shop, Dessert Shops",
+    None,
+    "fast food , other",
+    "",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CuisineIndex(CELLS)
+
+
+def brute_force(any_of=(), all_of=()):
+    any_terms = {term.lower() for term in any_of}
+    all_terms = {term.lower() for term in all_of}
+    mask = []
+    for cell in CELLS:
+        terms = set(tokenize(cell))
+        mask.append(bool(any_terms or all_terms) and (not any_terms or bool(terms & any_terms)) and all_terms <= terms)
+    return np.array(mask)
+
+
+def test_tokenize():
+    assert tokenize("Fast Food, Other") == ["fast food", "other"]
+    assert tokenize(" Cafe ,, Coffee Shop ") == ["cafe", "coffee shop"]
+    assert tokenize(None) == []
+
+
+@pytest.mark.parametrize("terms", [
+    ["Fast Food"],
+    ["Mexican", "Italian"],
+    ["Casual Dining", "Mexican"],
+    ["Coffee Shop", "Dessert Shops", "Cafe"],
+    ["Korean"],
+    ["Mexican", "Korean"],
+])
+def test_match_agrees_with_a_scan(index, terms):
+    any_mask = index.match(any_of=terms)
+    all_mask = index.match(all_of=terms)
+    np.testing.assert_array_equal(any_mask, brute_force(any_of=terms))
+    np.testing.assert_array_equal(all_mask, brute_force(all_of=terms))
+    # Everything listing all of the terms lists at least one of them
+    assert not (all_mask & ~any_mask).any()
+
+
+def test_terms_are_matched_whole_and_case_insensitively(index):
+    np.testing.assert_array_equal(index.posting(" FAST FOOD "), [True, False, False, False, False, True, False])
+    # "Food" is part of a term, not a term of its own
+    assert not index.posting("Food").any()
+
+
+def test_combined_and_empty_queries(index):
+    np.testing.assert_array_equal(index.match(any_of=["Fast Food", "Casual Dining"], all_of=["Mexican"]), [True, True, False, False, False, False, False])
+    assert not index.match().any()
+    assert not index.match(any_of=["Korean"], all_of=["Mexican"]).any()
+    assert index.terms() == sorted(set(term for cell in CELLS for term in tokenize(cell)))
@@ -0,0 +1,115 @@
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT, SAMPLE_DAILY_FILE, assert_cubes_equal
+from dailyTraffic import fcntl, load_daily_detector, update_daily_store
+
+
+# The sample rows in date order as CSV bytes (header first, one row per line), so any
+# prefix of the lines is what the file looked like on some earlier day
+def _csv_lines():
+    daily = pd.read_csv(SAMPLE_DAILY_FILE).sort_values('Date', kind='stable')
+    return daily.to_csv(index=False).encode().splitlines(keepends=True)
+
+
+def test_incremental_updates_match_a_full_rebuild(tmp_path):
+    lines = _csv_lines()
+    path, store = tmp_path / "daily.csv", str(tmp_path / "store")
+    cuts = [1 + len(lines) // 2, 1 + 3 * len(lines) // 4, len(lines) - 7, len(lines)]
+    path.write_bytes(b"".join(lines[:cuts[0]]))
+    _, report = update_daily_store(str(path), store)
+    assert report['mode'] == 'full'
+
+    for start, stop in zip(cuts, cuts[1:]):
+        with open(path, 'ab') as f:
+            f.write(b"".join(lines[start:stop]))
+        cube, report = update_daily_store(str(path), store)
+        assert report['mode'] == 'incremental'
+        assert report['appended'] == stop - start
+
+    full_cube, full_report = update_daily_store(str(path), str(tmp_path / "full"), rebuild=True)
+    assert report['rows'] == full_report['rows'] == len(lines) - 1
+    assert_cubes_equal(cube, full_cube)
+
+    incremental = load_daily_detector(str(path), store)
+    rebuilt = load_daily_detector(str(path), str(tmp_path / "full"))
+    assert incremental.events == rebuilt.events
+    assert list(incremental.corridors) == list(rebuilt.corridors)
+    np.testing.assert_allclose(incremental.level, rebuilt.level)
+
+
+def test_rows_already_counted_are_skipped(tmp_path):
+    lines = _csv_lines()
+    path, store = tmp_path / "daily.csv", str(tmp_path / "store")
+    path.write_bytes(b"".join(lines))
+    before, _ = update_daily_store(str(path), store)
+
+    # The last day's rows sent again
+    with open(path, 'ab') as f:
+        f.write(b"".join(lines[-5:]))
+    after, report = update_daily_store(str(path), store)
+    assert report == {'mode': 'incremental', 'appended': 0, 'skipped': 5, 'rows': len(lines) - 1}
+    assert_cubes_equal(after, before)
+
+
+def test_rewritten_rows_trigger_a_full_rebuild(tmp_path):
+    lines = _csv_lines()
+    path, store = tmp_path / "daily.csv", str(tmp_path / "store")
+    path.write_bytes(b"".join(lines))
+    update_daily_store(str(path), store)
+
+    path.write_bytes(b"".join(lines[:-1]).replace(b",2023-12-31,", b",2023-12-30,"))
+    cube, report = update_daily_store(str(path), store)
+    assert report['mode'] == 'full'
+    assert_cubes_equal(cube, update_daily_store(str(path), str(tmp_path / "full"), rebuild=True)[0])
+
+
+def test_rebuild_leaves_a_partial_last_line_for_the_next_update(tmp_path):
+    lines = _csv_lines()
+    complete, partial = lines[:5001], lines[5001]
+    path = tmp_path / "daily.csv"
+    path.write_bytes(b"".join(complete) + partial[:10])
+
+    _, report = update_daily_store(str(path), str(tmp_path / "store"))
+    assert report['mode'] == 'full'
+    assert report['rows'] == len(complete) - 1
+
+    path.write_bytes(b"".join(complete) + partial)
+    cube, report = update_daily_store(str(path), str(tmp_path / "store"))
+    assert report == {'mode': 'incremental', 'appended': 1, 'skipped': 0, 'rows': len(complete)}
+
+    full_cube, _ = update_daily_store(str(path), str(tmp_path / "full"), rebuild=True)
+    assert_cubes_equal(cube, full_cube)
+
+
+@pytest.mark.skipif(fcntl is None, reason="store lock file needs fcntl")
+def test_another_process_holding_the_store_makes_updates_wait(tmp_path):
+    lines = _csv_lines()
+    path, store = tmp_path / "daily.csv", str(tmp_path / "store")
+    path.write_bytes(b"".join(lines[:1001]))
+    update_daily_store(str(path), store)
+    with open(path, 'ab') as f:
+        f.write(b"".join(lines[1001:2001]))
+
+    # Stands in for the ingestion CLI part way through an update
+    holder = subprocess.Popen(
+        [sys.executable, "-c", (
+            "import sys, time; from dailyTraffic import _store_lock\n"
+            "with _store_lock(sys.argv[1]):\n"
+            "    print('locked', flush=True); time.sleep(1.0)"
+        ), store],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        started = time.monotonic()
+        _, report = update_daily_store(str(path), store)
+        assert time.monotonic() - started > 0.5
+    finally:
+        holder.wait(10)
+    assert report == {'mode': 'incremental', 'appended': 1000, 'skipped': 0, 'rows': 2000}
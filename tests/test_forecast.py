@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from forecast import FORECAST_HORIZON, corridor_forecast, fill_gaps, forecast_traffic
+
+WEEKLY_PATTERN = np.array([0, 100, 200, 300, -100, -200, -300])
+
+
+# Daily rows following base + the weekly pattern (+ slope per day) for each corridor
+def daily_rows(bases, days=140, slope=0.0, start="2024-01-01"):
+    dates = pd.date_range(start, periods=days, freq='D')
+    rows = []
+    for corridor, base in bases.items():
+        volumes = base + WEEKLY_PATTERN[np.arange(days) % 7] + slope * np.arange(days)
+        rows.append(pd.DataFrame({'Business Corridor': corridor, 'Date': dates, 'Foot Traffic Volume': volumes.round().astype(int)}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def test_a_pure_weekly_season_is_reproduced():
+    forecasts = forecast_traffic(daily_rows({"Santana Row": 2000, "Westgate": 5000}))
+    assert len(forecasts['dates']) == FORECAST_HORIZON
+    assert forecasts['dates'][0] == pd.Timestamp("2024-05-20")
+    for corridor, base in [("Santana Row", 2000), ("Westgate", 5000)]:
+        projected = forecasts['daily'].loc[corridor].to_numpy()
+        # The history ends on day 139, so the forecast picks the pattern up at day 140
+        expected = base + WEEKLY_PATTERN[(140 + np.arange(FORECAST_HORIZON)) % 7]
+        np.testing.assert_allclose(projected, expected, rtol=0.01)
+
+        result = corridor_forecast(forecasts, corridor)
+        assert result['next_30_days_low'] <= result['next_30_days'] <= result['next_30_days_high']
+        assert abs(result['next_30_days_change']) < 0.02
+
+
+def test_the_interval_widens_with_noise():
+    clean = daily_rows({"Santana Row": 2000})
+    noisy = clean.copy()
+    noisy['Foot Traffic Volume'] += np.random.default_rng(3).normal(0, 150, len(noisy)).round().astype(int)
+    width = {}
+    for name, rows in [("clean", clean), ("noisy", noisy)]:
+        summary = forecast_traffic(rows)['summary'].loc["Santana Row"]
+        width[name] = summary['next_90_days_high'] - summary['next_90_days_low']
+    assert width['clean'] < width['noisy']
+
+
+def test_a_rising_corridor_is_forecast_above_its_recent_traffic():
+    result = corridor_forecast(forecast_traffic(daily_rows({"Santana Row": 2000}, slope=5.0)), "Santana Row")
+    assert result['next_30_days_change'] > 0
+
+
+def test_too_little_history_gives_no_forecast():
+    assert forecast_traffic(daily_rows({"Santana Row": 2000}, days=13)) is None
+    assert corridor_forecast(None, "Santana Row") is None
+
+
+def test_fill_gaps_carries_the_last_known_value():
+    filled = fill_gaps(np.array([[np.nan, 10.0, np.nan, 30.0, np.nan]]))
+    np.testing.assert_array_equal(filled, [[20.0, 10.0, 10.0, 30.0, 30.0]])
+
+
+@pytest.mark.parametrize("missing", [[3], [10, 11, 12]])
+def test_missing_days_do_not_break_the_season(missing):
+    rows = daily_rows({"Santana Row": 2000})
+    rows = rows.drop(index=missing)
+    projected = forecast_traffic(rows)['daily'].loc["Santana Row"].to_numpy()
+    np.testing.assert_allclose(projected, 2000 + WEEKLY_PATTERN[(140 + np.arange(FORECAST_HORIZON)) % 7], rtol=0.05)
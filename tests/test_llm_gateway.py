@@ -0,0 +1,103 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from llmGateway import LLMGateway
+from llmStream import StreamStats
+from stubServer import DEFAULT_REPLY, request_count, start_stub_server
+
+MESSAGES = [{"role": "user", "content": "How busy is the plaza?"}]
+MODEL = "gpt-3.5-turbo"
+MAX_TOKENS = 200
+
+
+def _serve(monkeypatch, first_token_delay):
+    server = start_stub_server(first_token_delay=first_token_delay, token_delay=0.005)
+    monkeypatch.setattr(openai, "api_key", "stub")
+    monkeypatch.setattr(openai, "api_base", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    return server
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    server = _serve(monkeypatch, first_token_delay=0.3)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def slow_stub_server(monkeypatch):
+    server = _serve(monkeypatch, first_token_delay=3.0)
+    yield server
+    server.shutdown()
+
+
+def _complete(gateway):
+    response = gateway.complete(MESSAGES, MODEL, MAX_TOKENS, kind="test")
+    return response['choices'][0]['message']['content']
+
+
+def _stream(gateway):
+    parts = list(gateway.stream(MESSAGES, MODEL, MAX_TOKENS, StreamStats(), kind="test"))
+    assert all(isinstance(part, str) for part in parts)
+    return "".join(parts)
+
+
+# Start `first`, then `second` while the first is still waiting on the server
+def _overlapping(gateway, first, second):
+    results = {}
+    errors = []
+
+    def run(name, call):
+        try:
+            results[name] = call(gateway)
+        except Exception as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=run, args=("first", first))
+    leader.start()
+    deadline = time.monotonic() + 5
+    while gateway.in_flight() == 0 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    follower = threading.Thread(target=run, args=("second", second))
+    follower.start()
+    leader.join(10)
+    follower.join(10)
+    assert not errors, errors
+    return results["first"], results["second"]
+
+
+@pytest.mark.parametrize("first, second", [(_stream, _complete), (_complete, _stream)], ids=["stream-then-complete", "complete-then-stream"])
+def test_streamed_and_complete_requests_do_not_share_a_flight(stub_server, first, second):
+    gateway = LLMGateway(max_concurrency=4)
+    assert _overlapping(gateway, first, second) == (DEFAULT_REPLY, DEFAULT_REPLY)
+    assert request_count(stub_server) == 2
+
+
+@pytest.mark.parametrize("call", [_stream, _complete], ids=["stream", "complete"])
+def test_identical_requests_are_coalesced(stub_server, call):
+    gateway = LLMGateway(max_concurrency=4)
+    assert _overlapping(gateway, call, call) == (DEFAULT_REPLY, DEFAULT_REPLY)
+    assert request_count(stub_server) == 1
+
+
+def test_stuck_requests_time_out_and_are_retried(slow_stub_server):
+    delays = []
+    gateway = LLMGateway(max_concurrency=1, max_retries=1, request_timeout=0.2, sleep=delays.append)
+    started = time.monotonic()
+    with pytest.raises(openai.error.Timeout):
+        _complete(gateway)
+    assert time.monotonic() - started < 2
+    assert len(delays) == 1
+    assert request_count(slow_stub_server) == 2
+    # The slot is free again for the next request
+    assert gateway._slots.acquire(timeout=0.1)
+
+
+def test_gateway_keeps_an_existing_requests_session(monkeypatch):
+    session = object()
+    monkeypatch.setattr(openai, "requestssession", session)
+    LLMGateway()
+    assert openai.requestssession is session
@@ -0,0 +1,60 @@
+import threading
+import time
+
+from prefetch import AnalysisPrefetcher
+
+
+def test_wait_gives_up_on_a_hung_request():
+    release = threading.Event()
+    prefetcher = AnalysisPrefetcher(lambda plaza: release.wait(10), max_workers=1)
+    prefetcher.prefetch("session", ["Willow Plaza"])
+    started = time.monotonic()
+    assert prefetcher.wait("Willow Plaza", timeout=0.1) is None
+    assert time.monotonic() - started < 2
+    assert prefetcher.is_pending("Willow Plaza")
+    release.set()
+    prefetcher.shutdown()
+
+
+def test_failed_and_cancelled_prefetches_count_as_not_prefetched():
+    release = threading.Event()
+
+    def fetch(plaza):
+        release.wait(10)
+        if plaza == "Broken Plaza":
+            raise RuntimeError("upstream error")
+        return f"analysis of {plaza}"
+
+    prefetcher = AnalysisPrefetcher(fetch, max_workers=1)
+    prefetcher.prefetch("session", ["Broken Plaza", "Queued Plaza"])
+    with prefetcher._lock:
+        queued = prefetcher._pending["Queued Plaza"]
+    # A new search drops the queued plaza before it starts
+    prefetcher.prefetch("session", ["Broken Plaza"])
+    assert queued.cancelled()
+    assert prefetcher.wait("Queued Plaza", timeout=1) is None
+
+    release.set()
+    assert prefetcher.wait("Broken Plaza", timeout=5) is None
+    prefetcher.shutdown()
+
+
+def test_wait_returns_the_prefetched_analysis():
+    release = threading.Event()
+    prefetcher = AnalysisPrefetcher(lambda plaza: release.wait(10) and f"analysis of {plaza}", max_workers=2)
+    prefetcher.prefetch("session", ["Willow Plaza"])
+    release.set()
+    assert prefetcher.wait("Willow Plaza", timeout=5) == "analysis of Willow Plaza"
+    prefetcher.shutdown()
+
+
+def test_idle_owners_are_forgotten():
+    release = threading.Event()
+    prefetcher = AnalysisPrefetcher(lambda plaza: release.wait(10), max_workers=1, idle_seconds=0.05)
+    prefetcher.prefetch("closed session", ["Willow Plaza", "Almaden Plaza"])
+    time.sleep(0.1)
+    prefetcher.prefetch("open session", ["Oakridge Mall"])
+    assert set(prefetcher._wanted) == {"open session"}
+    assert not prefetcher.is_pending("Almaden Plaza")
+    release.set()
+    prefetcher.shutdown()
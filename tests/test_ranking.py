@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ranking import RankingEngine, corridor_join_index, normalise_name
+
+BUDGET_ONLY = {'budget_fit': 1.0}
+
+
+# Three listings alike in everything but rent; the dearest one has the most upmarket menus
+def tiny_engine():
+    listings = pd.DataFrame({
+        'Location Name': ["Cheap Plaza", "Middle Plaza", "Dear Plaza"],
+        'Average Lease Rate ($/sq ft)': [2.0, 4.0, 8.0],
+        'Average Store Size (sq ft)': [2000, 2000, 2000],
+        'Vacancy Status': ["1 vacant spot", "1 vacant spot", "1 vacant spot"],
+        'Price Range': ["$", "$$", "$$$$"],
+    })
+    return RankingEngine(listings, {"Cheap": 3000.0, "Middle": 3000.0, "Dear": 3000.0})
+
+
+# Three months of rent on 2,000 sq ft is $12k, $24k and $48k
+@pytest.mark.parametrize("budget, expected", [
+    ("<$10,000", [10 / 12, 10 / 24, 10 / 48]),
+    ("$10,000-$50,000", [1.0, 1.0, 1.0]),
+    ("$100,000+", [1.0, 1.0, 1.0]),
+    ("Not a budget", [1.0, 1.0, 1.0]),
+])
+def test_budget_fit_is_the_share_of_upfront_rent_covered(budget, expected):
+    np.testing.assert_allclose(tiny_engine().criterion_scores(2000, budget)['budget_fit'], expected)
+
+
+def test_a_tight_budget_ranks_cheaper_rent_first():
+    top = tiny_engine().top_k(2000, "<$10,000", k=3, weights=BUDGET_ONLY)
+    assert list(top['Location Name']) == ["Cheap Plaza", "Middle Plaza", "Dear Plaza"]
+
+
+def test_a_large_budget_does_not_reward_upmarket_plazas():
+    engine = tiny_engine()
+    for budget in ["$50,000-$100,000", "$100,000+"]:
+        scores = engine.score(2000, budget, weights=BUDGET_ONLY)
+        assert scores[0] == scores[1] == scores[2]
+    # With every criterion counted, the cheaper rent (more visitors per lease dollar) still leads
+    assert list(engine.top_k(2000, "$100,000+", k=3)['Location Name']) == ["Cheap Plaza", "Middle Plaza", "Dear Plaza"]
+
+
+def test_budget_fit_scales_with_the_space_asked_for():
+    engine = tiny_engine()
+    small = engine.criterion_scores(500, "<$10,000")['budget_fit']
+    large = engine.criterion_scores(5000, "<$10,000")['budget_fit']
+    assert (small >= large).all() and (small > large).any()
+
+
+@pytest.mark.parametrize("name, key", [
+    ("The Plant Shopping Center", "plant"),
+    ("Westgate Center", "westgate"),
+    ("Santana Row", "santana row"),
+    ("Stores & More", "stores and more"),
+    ("The Mall", "the mall"),
+])
+def test_normalise_name(name, key):
+    assert normalise_name(name) == key
+
+
+def test_corridor_join_index():
+    corridors = ["Westgate", "Santana Row", "Oakridge", "East San Jose", "North San Jose"]
+    listings = [
+        "Westgate Center",          # corridor words within the listing's
+        "santana row",              # exact after normalising
+        "Oakridge Mall",            # generic word dropped
+        "San Jose",                 # inside two corridors' names: ambiguous
+        "Almaden Plaza",            # no corridor
+    ]
+    np.testing.assert_array_equal(corridor_join_index(listings, corridors), [0, 1, 2, -1, -1])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from spatial import GridIndex, extract_zip, neighbour_counts
+
+
+# Points scattered over roughly 20 x 20 miles around San Jose, a few of them not placed
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    lat = 37.33 + rng.uniform(-0.15, 0.15, 400)
+    lon = -121.89 + rng.uniform(-0.18, 0.18, 400)
+    lat[[5, 50]] = np.nan
+    return lat, lon
+
+
+def brute_force(index, lat, lon):
+    x, y = index.project(lat, lon)
+    distances = np.hypot(index.x - x, index.y - y)
+    return np.where(np.isfinite(distances), distances, np.inf)
+
+
+@pytest.mark.parametrize("miles", [0.3, 1.0, 2.5])
+def test_within_matches_brute_force(points, miles):
+    index = GridIndex(*points, cell_miles=1.0)
+    for lat, lon in [(37.33, -121.89), (37.20, -121.75), (37.5, -122.1)]:
+        positions, distances = index.within(lat, lon, miles)
+        expected = brute_force(index, lat, lon)
+        assert set(positions) == set(np.flatnonzero(expected <= miles))
+        np.testing.assert_allclose(distances, expected[positions])
+        assert (np.diff(distances) >= 0).all()
+
+
+@pytest.mark.parametrize("k", [1, 5, 40])
+def test_nearest_matches_brute_force(points, k):
+    index = GridIndex(*points, cell_miles=0.5)
+    # Includes a query far outside the grid
+    for lat, lon in [(37.33, -121.89), (37.45, -121.72), (38.0, -121.0)]:
+        positions, distances = index.nearest(lat, lon, k)
+        expected = np.sort(brute_force(index, lat, lon))[:k]
+        np.testing.assert_allclose(distances, expected)
+        assert len(set(positions)) == k
+
+
+def test_nearest_only_considers_flagged_points(points):
+    index = GridIndex(*points)
+    where = np.zeros(len(points[0]), dtype=bool)
+    where[::9] = True
+    positions, distances = index.nearest(37.33, -121.89, 4, where=where)
+    assert where[positions].all()
+    expected = brute_force(index, 37.33, -121.89)
+    np.testing.assert_allclose(distances, np.sort(expected[where])[:4])
+
+
+def test_neighbours_match_brute_force(points):
+    index = GridIndex(*points, cell_miles=0.75)
+    indptr, indices = index.neighbours(1.0)
+    near = np.hypot(index.x[:, None] - index.x, index.y[:, None] - index.y) <= 1.0
+    np.fill_diagonal(near, False)
+    for row in range(len(points[0])):
+        assert set(indices[indptr[row]:indptr[row + 1]]) == set(np.flatnonzero(near[row]))
+
+    mask = np.arange(len(points[0])) % 2 == 0
+    np.testing.assert_array_equal(neighbour_counts(indptr, indices, mask), (near & mask).sum(axis=1))
+
+
+def test_extract_zip():
+    zips = extract_zip(["377 Santana Row, San Jose, CA 95128", "1 Main St, CA 95112-1234", "No zip here", None])
+    assert zips.iloc[:2].tolist() == ["95128", "95112"]
+    assert zips.iloc[2:].isna().all()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLE_DAILY_FILE, assert_cubes_equal, assert_tables_equal
+from trafficCube import CUBE_KEYS, CUBE_STATS, build_traffic_cube, corridor_view, merge_traffic_cubes
+
+
+@pytest.fixture(scope="module")
+def daily():
+    return pd.read_csv(SAMPLE_DAILY_FILE)
+
+
+# The per-view groupbys the insights page used to run on the raw rows
+def baseline_table(daily, key):
+    dates = pd.to_datetime(daily['Date'])
+    keys = {
+        'Day of Week': dates.dt.day_name(),
+        'Week of Month': (dates.dt.day - 1) // 7 + 1,
+        'Month': dates.dt.month,
+        'Year': dates.dt.year,
+    }
+    rows = pd.DataFrame({'Business Corridor': daily['Business Corridor'], key: keys[key], 'Foot Traffic Volume': daily['Foot Traffic Volume']})
+    return rows.groupby(['Business Corridor', key])['Foot Traffic Volume'].agg(CUBE_STATS).sort_index()
+
+
+@pytest.mark.parametrize("key", CUBE_KEYS)
+def test_cube_matches_baseline_groupby(daily, key):
+    cube = build_traffic_cube(daily)
+    assert_tables_equal(cube[key], baseline_table(daily, key))
+
+
+def test_corridor_view_is_the_corridor_slice(daily):
+    cube = build_traffic_cube(daily)
+    corridor = daily['Business Corridor'].iloc[0]
+    expected = baseline_table(daily, 'Month').xs(corridor, level='Business Corridor')
+    pd.testing.assert_frame_equal(corridor_view(cube, 'Month', corridor), expected, check_dtype=False, check_index_type=False, check_names=False)
+    assert corridor_view(cube, 'Month', "No Such Corridor").empty
+
+
+def test_rows_that_cannot_be_placed_are_left_out(daily):
+    broken = daily.copy()
+    broken.loc[0, 'Date'] = None
+    broken['Foot Traffic Volume'] = broken['Foot Traffic Volume'].astype(float)
+    broken.loc[1, 'Foot Traffic Volume'] = np.nan
+    assert_cubes_equal(build_traffic_cube(broken), build_traffic_cube(daily.drop(index=[0, 1])))
+
+
+@pytest.mark.parametrize("parts", [2, 5])
+def test_merged_cubes_match_one_build(daily, parts):
+    shuffled = daily.sample(frac=1, random_state=parts)
+    cube = None
+    for part in np.array_split(np.arange(len(shuffled)), parts):
+        update = build_traffic_cube(shuffled.iloc[part])
+        cube = update if cube is None else merge_traffic_cubes(cube, update)
+    assert_cubes_equal(cube, build_traffic_cube(daily))
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# Full-history foot traffic series for the zoomable chart, decimated on the server.
+# Each corridor's series is kept at several resolutions: the raw points, then min/max pairs
+# over ever larger buckets. A chart request takes the finest level that fits its window in
+# the point budget, so the browser never gets more points than it can show.
+
+# Most points sent for one chart (roughly the pixel width of a wide chart, times two)
+MAX_POINTS = 2000
+
+# Each level folds this many times more raw points into one min/max pair than the one before
+LEVEL_FACTOR = 4
+
+
+# Keep the lowest and highest point of every `bucket` consecutive points, in time order.
+# Peaks and dips survive however far the series is reduced, unlike averaging or striding.
+def minmax_decimate(times, values, bucket):
+    if bucket <= 1 or len(values) <= 2:
+        return times, values
+    count = len(values)
+    padded = np.resize(values, -(-count // bucket) * bucket).reshape(-1, bucket)
+    starts = np.arange(0, count, bucket)
+    # The last bucket is padded with repeats of the start of the series; mask those out
+    if count % bucket:
+        tail = padded[-1]
+        tail[count % bucket:] = tail[0]
+    lowest = starts + padded.argmin(axis=1)
+    highest = starts + padded.argmax(axis=1)
+    # Both points of each bucket in time order; a bucket whose low and high are the same point keeps it once
+    first, second = np.minimum(lowest, highest), np.maximum(lowest, highest)
+    keep = np.column_stack([first, second]).ravel()[np.column_stack([np.ones(len(first), dtype=bool), first != second]).ravel()]
+    return times[keep], values[keep]
+
+
+# One corridor's series at every resolution, coarsest last. `times` must be sorted.
+class SeriesLevels:
+    def __init__(self, times, values, max_points=MAX_POINTS, factor=LEVEL_FACTOR):
+        times = np.asarray(times, dtype='datetime64[ns]')
+        values = np.asarray(values, dtype=np.float32)   # exact for counts up to 16 million
+        known = ~np.isnan(values)
+        self.max_points = max_points
+        self.levels = [(1, times[known], values[known])]   # (raw points per bucket, times, values)
+        bucket = factor
+        while len(self.levels[-1][2]) > max_points:
+            # Each level is decimated from the raw points, so extremes are exact at every level
+            self.levels.append((bucket, *minmax_decimate(self.levels[0][1], self.levels[0][2], bucket)))
+            bucket *= factor
+
+    def __len__(self):
+        return len(self.levels[0][2])
+
+    @property
+    def nbytes(self):
+        return sum(t.nbytes + v.nbytes for _, t, v in self.levels)
+
+    @property
+    def start(self):
+        return pd.Timestamp(self.levels[0][1][0]) if len(self) else None
+
+    @property
+    def end(self):
+        return pd.Timestamp(self.levels[0][1][-1]) if len(self) else None
+
+    # Points to draw between `start` and `end` (whole series if None): the finest level with at
+    # most `max_points` in the window, plus one point either side so the line meets the edges.
+    # Returns (times, values, raw points per bucket).
+    def window(self, start=None, end=None, max_points=None):
+        max_points = max_points or self.max_points
+        low = None if start is None else np.datetime64(pd.Timestamp(start), 'ns')
+        high = None if end is None else np.datetime64(pd.Timestamp(end), 'ns')
+        for bucket, times, values in self.levels:
+            first = 0 if low is None else max(0, np.searchsorted(times, low, side='left') - 1)
+            last = len(times) if high is None else min(len(times), np.searchsorted(times, high, side='right') + 1)
+            if last - first <= max_points + 2 or bucket == self.levels[-1][0]:
+                return times[first:last], values[first:last], bucket
+        return self.levels[-1][1], self.levels[-1][2], self.levels[-1][0]
+
+
+# Daily series of every corridor from the daily rows, in one grouped pass
+def daily_series(daily, max_points=MAX_POINTS):
+    dates = pd.to_datetime(daily['Date'], errors='coerce')
+    frame = pd.DataFrame({
+        'Business Corridor': daily['Business Corridor'].astype(str),
+        'Date': dates,
+        'Foot Traffic Volume': daily['Foot Traffic Volume'],
+    })
+    frame = frame[dates.notna()].sort_values(['Business Corridor', 'Date'], kind='stable')
+    return {
+        corridor: SeriesLevels(rows['Date'].to_numpy(), rows['Foot Traffic Volume'].to_numpy(dtype=float), max_points)
+        for corridor, rows in frame.groupby('Business Corridor', sort=False)
+    }
+
+
+# Hourly series of one corridor from its raw hourly rows (see hourlyTraffic.load_corridor_hourly)
+def hourly_series(rows, max_points=MAX_POINTS):
+    if rows is None or rows.empty:
+        return None
+    valid = rows.dropna(subset=['Date', 'Hour'])
+    times = pd.to_datetime(valid['Date']).dt.normalize() + pd.to_timedelta(valid['Hour'].astype(int), unit='h')
+    order = np.argsort(times.to_numpy(), kind='stable')
+    return SeriesLevels(times.to_numpy()[order], valid['Foot Traffic Volume'].to_numpy(dtype=float)[order], max_points)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from ingest import DAY_ORDER
+
+# Calendar keys the cube is aggregated on (one table per key)
+CUBE_KEYS = ["Day of Week", "Week of Month", "Month", "Year"]
+
+# Statistics kept for every corridor x key cell
+CUBE_STATS = ["sum", "mean", "count", "min", "max"]
+
+MONTH_NAMES = {
+    1: 'January', 2: 'February', 3: 'March', 4: 'April',
+    5: 'May', 6: 'June', 7: 'July', 8: 'August',
+    9: 'September', 10: 'October', 11: 'November', 12: 'December'
+}
+
+
+# Add the calendar keys used by the cube to a daily foot traffic frame
+def add_calendar_keys(foot_traffic_data):
+    dates = pd.to_datetime(foot_traffic_data['Date'], errors='coerce')
+    keyed = pd.DataFrame({
+        'Business Corridor': foot_traffic_data['Business Corridor'],
+        'Foot Traffic Volume': foot_traffic_data['Foot Traffic Volume'],
+        'Day of Week': dates.dt.day_name(),
+        'Week of Month': (dates.dt.day - 1) // 7 + 1,
+        'Month': dates.dt.month,
+        'Year': dates.dt.year,
+    })
+    # Rows with unparseable dates or missing counts can't be placed in any calendar bucket.
+    # Volumes are widened to int64 so sums over long histories can't overflow.
+    valid = dates.notna() & foot_traffic_data['Foot Traffic Volume'].notna()
+    return keyed[valid].astype({'Foot Traffic Volume': 'int64', 'Week of Month': int, 'Month': int, 'Year': int})
+
+
+# Build the corridor x {day of week, week of month, month, year} aggregate cube.
+# Each entry is indexed by (Business Corridor, key) and holds sum/mean/count/min/max
+# of the daily foot traffic volume, so the insight views only need index lookups.
+def build_traffic_cube(foot_traffic_data):
+    keyed = add_calendar_keys(foot_traffic_data)
+    cube = {}
+    for key in CUBE_KEYS:
+        cube[key] = (
+            keyed.groupby(['Business Corridor', key], observed=True)['Foot Traffic Volume']
+            .agg(CUBE_STATS)
+            .sort_index()
+        )
+    return cube
+
+
+# Fold the cube of newly arrived rows into an existing cube. Sums, counts, minima and
+# maxima combine cell by cell, so only the cube itself is touched, never the raw history.
+def merge_traffic_cubes(cube, update):
+    merged = {}
+    for key in CUBE_KEYS:
+        combined = pd.concat([cube[key], update[key]])
+        table = combined.groupby(level=['Business Corridor', key], observed=True).agg(
+            {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+        )
+        table['mean'] = table['sum'] / table['count']
+        merged[key] = table[CUBE_STATS].sort_index()
+    return merged
+
+
+# Return the cube rows for one corridor, indexed by the key values (empty if unknown).
+# The table is sorted by corridor, so this is a binary search for the corridor's row range.
+def corridor_view(cube, key, corridor):
+    table = cube[key]
+    try:
+        rows = table.index.get_loc(corridor)
+    except (KeyError, TypeError):
+        return table.iloc[0:0].droplevel('Business Corridor')
+    return table.iloc[rows].droplevel('Business Corridor')
+
+
+# Combine every corridor into a single city-wide view for one key
+def city_view(cube, key):
+    combined = cube[key].groupby(level=key).agg({'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'})
+    combined['mean'] = combined['sum'] / combined['count']
+    return combined[CUBE_STATS]
+
+
+# Total foot traffic across every corridor and every day in the data
+def city_total(cube):
+    return int(cube['Year']['sum'].sum())
+
+
+# Average daily foot traffic of every corridor over its whole history
+def corridor_daily_average(cube):
+    totals = cube['Year'].groupby(level='Business Corridor', observed=True)[['sum', 'count']].sum()
+    return totals['sum'] / totals['count']
+
+
+# First and past-last row of every corridor in one cube table. Tables are sorted by corridor,
+# so each corridor's rows are contiguous and can be sliced out without scanning the rest.
+def corridor_ranges(table):
+    codes = table.index.codes[0]
+    if len(codes) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    stops = np.r_[starts[1:], len(codes)]
+    names = table.index.levels[0][codes[starts]]
+    return {name: (int(start), int(stop)) for name, start, stop in zip(names, starts, stops)}
+
+
+# Corridor -> row range lookup over every cube table, built once per cube.
+# Views of one or many corridors are positional slices instead of boolean masks.
+class CorridorIndex:
+    def __init__(self, cube):
+        self.tables = {}
+        self.ranges = {}
+        for key in CUBE_KEYS:
+            table = cube[key] if cube[key].index.is_monotonic_increasing else cube[key].sort_index()
+            self.tables[key] = table
+            self.ranges[key] = corridor_ranges(table)
+
+    def __contains__(self, corridor):
+        return corridor in self.ranges['Year']
+
+    # Same as corridor_view(cube, key, corridor)
+    def view(self, key, corridor):
+        start, stop = self.ranges[key].get(corridor, (0, 0))
+        return self.tables[key].iloc[start:stop].droplevel('Business Corridor')
+
+    # One statistic of several corridors side by side: key values x corridors.
+    # Unknown corridors are left out; duplicates are shown once.
+    def compare(self, key, corridors, stat):
+        column = self.tables[key][stat]
+        ranges = self.ranges[key]
+        frame = pd.DataFrame({
+            str(corridor): column.iloc[slice(*ranges[corridor])].droplevel('Business Corridor')
+            for corridor in dict.fromkeys(corridors) if corridor in ranges
+        })
+        return frame.rename_axis(key).sort_index()
@@ -0,0 +1,351 @@
+import json
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from analytics import format_hour, hourly_metrics, monthly_metrics, overall_averages, week_of_month_metrics, weekly_metrics
+from forecast import corridor_forecast
+from hourlyTraffic import SAMPLE_HOURLY_PROFILE, corridor_hourly_profile
+from trafficCube import DAY_ORDER
+
+# The foot traffic views of the Restaurant Insights page as plain data: the HTML cards, the
+# Plotly figure and any notes. No Streamlit dependency, so the page can build a view live and
+# snapshots.py can build every corridor's views ahead of time from the same code.
+# A view is a dict; only the keys that apply are set:
+#   header, insights  - HTML cards above and below the chart
+#   info, error       - notes shown with (or instead of) the chart
+#   figure            - Plotly figure (a go.Figure, or its JSON dict once serialised)
+#   forecast          - the yearly view's forecast column (see forecast_panel)
+
+TRAFFIC_METRICS = ["Average Foot Traffic Per Day", "Average Foot Traffic Per Week", "Average Foot Traffic Per Month", "Total Foot Traffic Per Year"]
+
+# Weekdays the hourly chart of the per-day view can be shown for
+PROFILE_DAYS = ["All Days"] + DAY_ORDER
+
+
+# Name of one view of a corridor, e.g. "Average Foot Traffic Per Day|Monday"
+def view_key(metric, profile_day="All Days"):
+    return f"{metric}|{profile_day}" if metric == TRAFFIC_METRICS[0] else metric
+
+
+# Every view a corridor has: the per-day view once per weekday option, the others once
+def all_view_keys():
+    return [view_key(TRAFFIC_METRICS[0], day) for day in PROFILE_DAYS] + [view_key(metric) for metric in TRAFFIC_METRICS[1:]]
+
+
+def _center_title(fig, text, x_title, y_title):
+    fig.update_layout(
+        title={
+            "text": text,
+            "x": 0.5,  # Center the title
+            "xanchor": "center",  # Ensure proper alignment
+            "yanchor": "top",
+        },
+        title_font_size=20,
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        font=dict(size=14),
+    )
+
+
+def day_view(cube, corridor, hourly_profiles=None, profile_day="All Days"):
+    overall = overall_averages(cube)
+    view = {'header': f"""
+            <div class="insights-card" style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
+                <h4 style="color: #ff4b4b;">Overall Average Foot Traffic Per Day</h4>
+                <p style="font-size: 20px; font-weight: bold; color: #ffffff;">{overall['per_day']:,} people</p>
+                <p style="color: #94a3b8;">This represents the average number of people who pass through or visit the area on a typical day.
+                Use this metric to estimate daily customer potential, plan staffing levels, and determine the best hours
+                for peak operations to maximize customer engagement.</p>
+            </div>
+        """}
+
+    hourly_profile = corridor_hourly_profile(hourly_profiles, corridor, None if profile_day == "All Days" else profile_day)
+    if hourly_profile is None:
+        view['info'] = f"Hourly counts aren't available for {corridor} yet, so a typical day in San Jose is shown instead."
+        hourly_profile = pd.Series(SAMPLE_HOURLY_PROFILE, index=range(24))
+
+    hourly_traffic_data = pd.DataFrame({
+        'Hour': hourly_profile.index,
+        'Foot Traffic': hourly_profile.round().astype(int).values
+    })
+
+    # Add formatted time labels for the x-axis
+    hourly_traffic_data['Formatted Time'] = pd.to_datetime(hourly_traffic_data['Hour'], format='%H').dt.strftime('%I:%M %p')
+
+    # Reduce the number of displayed x-axis labels (e.g., every 3 hours)
+    tick_step = 3
+    tickvals = hourly_traffic_data['Hour'][::tick_step]
+    ticktext = hourly_traffic_data['Formatted Time'][::tick_step]
+
+    fig = px.line(
+        hourly_traffic_data,
+        x="Hour",  # Hour is numeric for sorting
+        y="Foot Traffic",
+        title="",  # The title will be set in update_layout
+        labels={"Hour": "Time of Day", "Foot Traffic": "Average Foot Traffic Volume"},
+        template="plotly_dark",
+    )
+    _center_title(fig, f"Average Hourly Foot Traffic on a Typical Day at {corridor}", "Time of Day", "Average Foot Traffic Volume")
+    fig.update_layout(
+        xaxis=dict(
+            tickmode='array',
+            tickvals=tickvals,
+            ticktext=ticktext,
+            range=[-0.5, 23.5],  # Ensure the graph starts at 0 and ends at 23
+            showgrid=True,
+            zeroline=True,
+            showline=True,
+            linecolor='white',  # Axis line color
+            mirror=True,
+        ),
+    )
+    fig.update_traces(
+        mode="lines+markers",
+        line=dict(color="#ff4b4b", width=3)  # Match the red color
+    )
+    view['figure'] = fig
+
+    # Analyze hourly traffic insights
+    hourly = hourly_metrics(hourly_traffic_data.set_index('Hour')['Foot Traffic'])
+    view['insights'] = f"""
+            <div style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-top: 20px;">
+                <h4 style="color: #ff4b4b; text-align: left;">Graph Insights</h4>
+                <p style="color: white;">
+                    <b>Peak Hour:</b> The busiest time of the day is around <b>{format_hour(hourly['peak_hour'])}</b>, where traffic reaches its peak.<br>
+                    <b>Quietest Hour:</b> The quietest time of the day is <b>{format_hour(hourly['quietest_hour'])}</b>, with minimal activity.<br>
+                    <b>Average Hourly Traffic:</b> On average, there are <b>{hourly['average']} people</b> during each hour of the day.
+                </p>
+                <h4 style="color: #ff4b4b; text-align: left;">Recommendations</h4>
+                <ul style="color: white;">
+                    <li>Plan staffing levels to align with peak hours for better customer service.</li>
+                    <li>Schedule promotions or special offers during busy periods to maximize reach.</li>
+                    <li>Use off-peak hours for maintenance or other operational improvements.</li>
+                </ul>
+            </div>
+        """
+    return view
+
+
+def week_view(cube, corridor):
+    overall = overall_averages(cube)
+    weekly = weekly_metrics(cube)
+    weekly_traffic = weekly['by_day']
+    view = {'header': f"""
+            <div class="insights-card" style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
+                <h4 style="color: #ff4b4b;">Overall Average Foot Traffic Per Week</h4>
+                <p style="font-size: 20px; font-weight: bold; color: #ffffff;">{overall['per_week']:,} people</p>
+                <p style="color: #94a3b8;">
+                    This represents the average number of people who pass through or visit the area during a typical week.
+                    Use this metric to identify busy days, plan operations, and optimize weekly performance.</p>
+            </div>
+        """}
+
+    fig = px.bar(
+        x=weekly_traffic.index,
+        y=weekly_traffic.values,
+        labels={"x": "Day of the Week", "y": "Average Foot Traffic Volume"},
+        title="",  # Title will be added in `update_layout`
+        template="plotly_dark",
+    )
+    _center_title(fig, f"Average Foot Traffic by Day of a Typical Week for {corridor}", "Day of the Week", "Average Foot Traffic Volume")
+    fig.update_traces(marker_color="#ff4b4b")  # Match UI theme color
+    view['figure'] = fig
+
+    busiest_day = weekly['busiest_day']
+    least_busy_day = weekly['least_busy_day']
+    view['insights'] = f"""
+            <div style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-top: 20px;">
+                <h4 style="color: #ff4b4b; text-align: left;">Graph Insights</h4>
+                <p style="color: white;">
+                    <b>Busiest Day:</b> The highest foot traffic occurs on <b>{busiest_day}</b> with an average of <b>{weekly['busiest_traffic']} people</b>. This is the ideal day for special promotions or events.<br>
+                    <b>Least Busy Day:</b> The lowest foot traffic occurs on <b>{least_busy_day}</b> with an average of <b>{weekly['least_busy_traffic']} people</b>. Use this day to perform maintenance or test new strategies.<br>
+                    <b>Average Daily Traffic:</b> On average, the location sees about <b>{weekly['average']} people</b> per day.
+                </p>
+                <h4 style="color: #ff4b4b; text-align: left;">Recommendations</h4>
+                <ul style="color: white;">
+                    <li>Plan promotions or events on <b>{busiest_day}</b> to maximize engagement.</li>
+                    <li>Optimize staffing levels for peak days like <b>{busiest_day}</b>.</li>
+                    <li>Experiment with new offerings or operational changes on <b>{least_busy_day}</b>.</li>
+                </ul>
+            </div>
+        """
+    return view
+
+
+def month_view(cube, corridor):
+    weeks = week_of_month_metrics(cube, corridor)
+    if weeks is None:
+        return {'error': f"No data available for {corridor}. Please select another location."}
+
+    # Average across all months for each week of the month
+    average = weeks['average']
+    view = {'header': f"""
+                <div class="insights-card" style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
+                    <h4 style="color: #ff4b4b;">Average Foot Traffic Per Month</h4>
+                    <p style="font-size: 20px; font-weight: bold; color: #ffffff;">{average:,} people</p>
+                    <p style="color: #94a3b8;">
+                        This represents the average number of people who pass through or visit {corridor} during a typical month.
+                        Use this metric to identify busy weeks, plan operations, and optimize performance for a typical month.
+                    </p>
+                </div>
+            """}
+
+    typical_month_data = weeks['by_week'].reset_index()
+    typical_month_data.columns = ['Week of Month', 'Average Foot Traffic']
+    fig = px.line(
+        typical_month_data,
+        x='Week of Month',
+        y='Average Foot Traffic',
+        labels={"Week of Month": "Week of the Month", "Average Foot Traffic": "Average Foot Traffic Volume"},
+        title="",
+        template="plotly_dark",
+    )
+    _center_title(fig, f"Average Foot Traffic by Week for a Typical Month at {corridor}", "Week of the Month", "Average Foot Traffic Volume")
+    fig.update_traces(
+        line=dict(color="#ff4b4b", width=3),  # Match the red color
+        mode="lines+markers"  # Add markers for better visualization
+    )
+    view['figure'] = fig
+
+    busiest_week = weeks['busiest_week']
+    quietest_week = weeks['quietest_week']
+    view['insights'] = f"""
+                <div style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-top: 20px;">
+                    <h4 style="color: #ff4b4b; text-align: left;">Graph Insights</h4>
+                    <p style="color: white;">
+                        <b>Busiest Week:</b> The highest foot traffic occurs during <b>Week {busiest_week}</b>, with an average of <b>{weeks['busiest_traffic']:,} people</b>.<br>
+                        <b>Quietest Week:</b> The lowest foot traffic occurs during <b>Week {quietest_week}</b>, with an average of <b>{weeks['quietest_traffic']:,} people</b>.<br>
+                        <b>Average Weekly Traffic:</b> On average, each week sees <b>{average:,} people</b>.
+                    </p>
+                    <h4 style="color: #ff4b4b; text-align: left;">Recommendations</h4>
+                    <ul style="color: white;">
+                        <li>Plan promotions or events during <b>Week {busiest_week}</b> to maximize customer engagement.</li>
+                        <li>Use <b>Week {quietest_week}</b> for staff training, maintenance, or testing new offerings.</li>
+                        <li>Monitor trends during quieter weeks to identify patterns and adjust your marketing strategies.</li>
+                    </ul>
+                </div>
+            """
+    return view
+
+
+# Forecast column next to the yearly chart: the metric cards to show, or a note why there are none
+def forecast_panel(forecasts, corridor):
+    projection = corridor_forecast(forecasts, corridor)
+    if projection is None:
+        return {'info': f"There isn't enough history to forecast foot traffic for {corridor} yet."}
+    metrics = []
+    for label, name, days in [("Next 30 days", 'next_30_days', 30), ("Next 90 days", 'next_90_days', 90)]:
+        change = projection[f'{name}_change']
+        metrics.append({
+            'label': label,
+            'value': f"{projection[name]:,} people",
+            'delta': None if change is None else f"{change:+.1%} vs last {days} days",
+            'caption': f"Likely range: {projection[f'{name}_low']:,} to {projection[f'{name}_high']:,}",
+        })
+    return {'start': f"{projection['start']:%B %d, %Y}", 'metrics': metrics}
+
+
+def year_view(cube, corridor, forecasts=None):
+    months = monthly_metrics(cube, corridor)
+    if months is None:
+        return {'error': f"No data available for {corridor}. Please select another location."}
+
+    view = {'header': f"""
+                <div class="insights-card" style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-bottom: 20px;">
+                    <h4 style="color: #ff4b4b;">Total Foot Traffic Per Year</h4>
+                    <p style="font-size: 20px; font-weight: bold; color: #ffffff;">{months['total']:,} people</p>
+                    <p style="color: #94a3b8;">
+                        This represents the estimated total number of people who pass through or visit {corridor} during a typical year.
+                        Use this metric to understand yearly trends, plan long-term operations, and optimize performance based on annual data.
+                    </p>
+                </div>
+            """}
+
+    monthly_traffic = months['by_month'].rename_axis('Month').reset_index()
+    monthly_traffic.columns = ['Month', 'Total Foot Traffic']
+    fig = px.bar(
+        monthly_traffic,
+        x='Month',
+        y='Total Foot Traffic',
+        labels={"Month": "Month", "Total Foot Traffic": "Total Foot Traffic Volume"},
+        title="",
+        template="plotly_dark",
+    )
+    _center_title(fig, f"Monthly Foot Traffic Trends for {corridor}", "Month", "Total Foot Traffic Volume")
+    fig.update_traces(marker_color="#ff4b4b")  # Use consistent red color for the bars
+    view['figure'] = fig
+    view['forecast'] = forecast_panel(forecasts, corridor)
+
+    busiest_month = months['busiest_month']
+    quietest_month = months['quietest_month']
+    view['insights'] = f"""
+                <div style="background-color: #2c2f38; padding: 20px; border-radius: 10px; margin-top: 20px;">
+                    <h4 style="color: #ff4b4b; text-align: left;">Graph Insights</h4>
+                    <p style="color: white;">
+                        <b>Busiest Month:</b> The highest foot traffic occurs in <b>{busiest_month}</b>, with a total of <b>{months['busiest_traffic']:,} people</b>.<br>
+                        <b>Quietest Month:</b> The lowest foot traffic occurs in <b>{quietest_month}</b>, with a total of <b>{months['quietest_traffic']:,} people</b>.<br>
+                        <b>Average Monthly Traffic:</b> On average, each month sees <b>{months['average']:,} people</b>.
+                    </p>
+                    <h4 style="color: #ff4b4b; text-align: left;">Recommendations</h4>
+                    <ul style="color: white;">
+                        <li>Plan marketing campaigns or special promotions during <b>{busiest_month}</b> to capitalize on increased foot traffic.</li>
+                        <li>Use <b>{quietest_month}</b> for internal process improvements, staff training, or maintenance.</li>
+                        <li>Analyze trends during quieter months to identify potential opportunities for growth.</li>
+                    </ul>
+                </div>
+            """
+    return view
+
+
+# Build one view of one corridor from the live data
+def build_traffic_view(metric, corridor, cube, hourly_profiles=None, forecasts=None, profile_day="All Days"):
+    if metric == "Average Foot Traffic Per Day":
+        return day_view(cube, corridor, hourly_profiles, profile_day)
+    if metric == "Average Foot Traffic Per Week":
+        return week_view(cube, corridor)
+    if metric == "Average Foot Traffic Per Month":
+        return month_view(cube, corridor)
+    if metric == "Total Foot Traffic Per Year":
+        return year_view(cube, corridor, forecasts)
+    raise ValueError(f"Unknown foot traffic metric: {metric}")
+
+
+# JSON-ready copy of a view (the figure becomes Plotly's own JSON form)
+def serialise_view(view):
+    if 'figure' not in view or isinstance(view['figure'], dict):
+        return view
+    return {**view, 'figure': json.loads(view['figure'].to_json())}
+
+
+# Figure to draw for a view. Stored figures were validated when they were built, so they are
+# loaded without validating them again (the slow part of turning JSON into a figure).
+def chart_figure(figure):
+    return go.Figure(figure, _validate=False) if isinstance(figure, dict) else figure
+
+
+# Zoomable history chart of one corridor from already decimated points. Drawn with WebGL
+# (Scattergl), which stays smooth with thousands of points where SVG traces slow down.
+def history_figure(times, values, corridor, resolution="Daily", unusual_days=None):
+    fig = go.Figure(go.Scattergl(
+        x=times,
+        y=values,
+        mode="lines",
+        line=dict(color="#ff4b4b", width=2),
+        hovertemplate="%{x}<br>%{y:,.0f} people<extra></extra>",
+    ))
+    # Days the anomaly detector flagged (see anomalies.py), marked over the line
+    if unusual_days is not None and not unusual_days.empty:
+        fig.add_trace(go.Scattergl(
+            x=unusual_days['Date'],
+            y=unusual_days['Foot Traffic Volume'],
+            mode="markers",
+            marker=dict(color="#facc15", size=10, symbol="diamond"),
+            customdata=unusual_days[['Change', 'Expected']],
+            hovertemplate="%{x|%b %d, %Y}: %{customdata[0]}<br>%{y:,.0f} people (expected %{customdata[1]:,.0f})<extra></extra>",
+            name="Unusual day",
+        ))
+    fig.update_layout(template="plotly_dark", showlegend=False)
+    _center_title(fig, f"{resolution} Foot Traffic History at {corridor}", "Date", "Foot Traffic Volume")
+    return fig